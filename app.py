@@ -8,6 +8,13 @@ Usage:
     python app.py --examples         # Run usage examples
     python app.py --test             # Run system tests
     python app.py --version          # Show version
+    python app.py --reconcile FILE   # Show the changes needed to match FILE
+    python app.py --export FILE      # Export the zone (BIND, JSONL or CSV)
+    python app.py --import FILE      # Import a BIND zone file
+    python app.py --find NAME        # Look a record up in every zone
+    python app.py --zone-stats       # Record counts for every zone
+    python app.py --metrics FILE     # Write API request metrics on exit
+    python app.py --batch [FILE]     # Apply JSONL operations from FILE or stdin
 """
 
 import sys
@@ -33,6 +40,18 @@ Examples:
   python app.py --examples # Run code examples
   python app.py --test     # Run system tests
   python app.py --version  # Show version info
+  python app.py --reconcile zone.yaml                  # Dry run: show the plan
+  python app.py --reconcile zone.yaml --apply --prune  # Apply, deleting extras
+  python app.py --export example.com.zone              # Zone file export
+  python app.py --export backup.jsonl.gz               # Compressed JSONL backup
+  python app.py --export records.csv --fields name,type,content
+  python app.py --import example.com.zone              # Zone file import
+  python app.py --zone example.org                     # Manage another zone
+  python app.py --find www --type CNAME                # Search all zones
+  python app.py --zone-stats --zone a.com,b.com        # Stats for some zones
+  python app.py --export backup.jsonl --metrics api.prom  # Request metrics (.json for JSON)
+  python app.py --batch changes.jsonl                  # Apply operations, JSONL results on stdout
+  generate-changes | python app.py --batch > results.jsonl
         """
     )
     
@@ -42,8 +61,42 @@ Examples:
                        help='Run system tests')
     parser.add_argument('--version', '-v', action='store_true', 
                        help='Show version information')
+    parser.add_argument('--reconcile', metavar='FILE',
+                       help='Reconcile the zone with a YAML/JSON desired-state file')
+    parser.add_argument('--apply', action='store_true',
+                       help='With --reconcile, apply the plan instead of a dry run')
+    parser.add_argument('--prune', action='store_true',
+                       help='With --reconcile, delete records missing from the file')
+    parser.add_argument('--export', metavar='FILE', dest='export_path',
+                       help='Export the zone to a file (format from the extension, .gz compresses)')
+    parser.add_argument('--format', choices=('zone', 'jsonl', 'csv'),
+                       help='With --export, output format (default: from the file extension)')
+    parser.add_argument('--fields', metavar='LIST',
+                       help='With --export, comma-separated fields to keep in JSONL/CSV output')
+    parser.add_argument('--gzip', action='store_true', default=None,
+                       help='With --export, gzip the output')
+    parser.add_argument('--import', metavar='FILE', dest='import_path',
+                       help='Import records from a BIND zone file')
+    parser.add_argument('--origin', metavar='ZONE',
+                       help='With --import, zone name for relative names when the file has no $ORIGIN')
+    
+    parser.add_argument('--zone', metavar='ZONE',
+                       help='Zone name or ID to work on (default: ZONE_ID); '
+                            'comma-separated for --find and --zone-stats')
+    parser.add_argument('--find', metavar='NAME',
+                       help='Find a record name (FQDN or label) across zones')
+    parser.add_argument('--type', metavar='TYPE', dest='record_type',
+                       help='With --find, only show records of this type')
+    parser.add_argument('--zone-stats', action='store_true',
+                       help='Show record statistics across zones')
+    parser.add_argument('--batch', metavar='FILE', nargs='?', const='-',
+                       help='Apply add/edit/delete/toggle/ttl operations, one JSON object per line, '
+                            'from FILE or stdin ("-"); results are written to stdout as JSONL')
+    parser.add_argument('--metrics', metavar='FILE',
+                       help='On exit, write API request metrics (Prometheus text, or JSON for .json files)')
     
     args = parser.parse_args()
+    zones = [zone.strip() for zone in args.zone.split(',') if zone.strip()] if args.zone else None
     
     try:
         # Handle version
@@ -59,6 +112,41 @@ Examples:
             examples_main()
             return 0
         
+        # Handle cross-zone queries
+        if args.find:
+            from app.commands import find_in_zones
+            return find_in_zones(args.find, args.record_type and args.record_type.upper(), zones)
+        
+        if args.zone_stats:
+            from app.commands import zone_stats
+            return zone_stats(zones)
+        
+        zone_id = None
+        if zones:
+            from app.commands import resolve_zone
+            zone_id = resolve_zone(zones[0])
+        
+        # Handle scripted operations
+        if args.batch:
+            from app.commands import run_batch
+            return run_batch(args.batch, zone_id=zone_id)
+        
+        # Handle reconcile
+        if args.reconcile:
+            from app.commands import reconcile
+            return reconcile(args.reconcile, apply=args.apply, prune=args.prune, zone_id=zone_id)
+        
+        # Handle zone file export / import
+        if args.export_path:
+            from app.commands import export_zone
+            fields = [field.strip() for field in args.fields.split(',')] if args.fields else None
+            return export_zone(args.export_path, fmt=args.format, fields=fields, compress=args.gzip,
+                               zone_id=zone_id)
+        
+        if args.import_path:
+            from app.commands import import_zone
+            return import_zone(args.import_path, origin=args.origin, zone_id=zone_id)
+        
         # Handle tests
         if args.test:
             print("🔬 Running System Tests...")
@@ -68,19 +156,31 @@ Examples:
         # Default: Run main application
         print("🚀 Starting Cloudflare DNS Manager...")
         from app.main import main as app_main
-        app_main()
+        app_main(zone_id)
         return 0
         
     except ImportError as e:
-        print(f"❌ Import Error: {e}")
-        print("Please ensure all required files are present and dependencies are installed.")
+        print(f"❌ Import Error: {e}", file=sys.stderr)
+        print("Please ensure all required files are present and dependencies are installed.", file=sys.stderr)
         return 1
     except KeyboardInterrupt:
-        print("\n👋 Application terminated by user")
+        print("\n👋 Application terminated by user", file=sys.stderr)
         return 0
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"❌ Error: {e}", file=sys.stderr)
         return 1
+    finally:
+        if args.metrics:
+            _write_metrics(args.metrics)
+
+
+def _write_metrics(path):
+    """Dump the request metrics collected during this run"""
+    try:
+        from app.feature import request_metrics
+        request_metrics.write(path)
+    except Exception as e:
+        print(f"❌ Could not write metrics to {path}: {e}", file=sys.stderr)
 
 
 if __name__ == "__main__":
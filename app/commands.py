@@ -0,0 +1,220 @@
+"""
+Non-interactive commands run from the app.py launcher
+Each command prints its own output and returns a process exit code
+"""
+import json
+import sys
+import time
+from contextlib import nullcontext
+
+from app.feature.base_api import CloudflareAPIError
+from app.feature.export_record import ExportRecord
+from app.feature.import_record import ImportRecord
+from app.feature.cross_zone import MultiZone
+from app.feature.operation_stream import OperationRunner, parse_operations
+from app.feature.reconcile import ZoneReconciler
+from app.feature.zones import zone_directory
+
+
+def resolve_zone(zone):
+    """
+    Resolve a --zone value to a zone ID
+
+    Args:
+        zone (str): Zone name or ID, or None for the configured ZONE_ID
+
+    Returns:
+        str: Zone ID (None when no zone was given)
+
+    Raises:
+        ValueError: If the zone cannot be found
+    """
+    if not zone:
+        return None
+    try:
+        return zone_directory.resolve(zone)
+    except CloudflareAPIError as e:
+        raise ValueError(f"cannot list zones ({e})") from e
+
+
+def reconcile(path, apply=False, prune=False, zone_id=None):
+    """
+    Bring the zone in line with a desired-state file
+
+    Prints the plan; changes are only sent with ``apply``.
+
+    Args:
+        path (str): YAML or JSON desired-state file
+        apply (bool): Apply the plan instead of only showing it
+        prune (bool): Delete live records missing from the file
+        zone_id (str): Zone to reconcile (default: ZONE_ID)
+
+    Returns:
+        int: 0 on success (or nothing to do), 1 on error or failed changes
+    """
+    reconciler = ZoneReconciler(zone_id=zone_id)
+    try:
+        plan = reconciler.plan(path, prune=prune)
+    except (OSError, ValueError, CloudflareAPIError) as e:
+        print(f"❌ Cannot plan reconcile: {e}")
+        return 1
+
+    for line in plan.format():
+        print(line)
+    summary = plan.summary()
+    print(f"\n📋 Plan: {summary['create']} to create, {summary['update']} to update, "
+          f"{summary['delete']} to delete, {summary['unchanged']} unchanged")
+
+    if plan.is_empty:
+        print("✅ Zone already matches the desired state")
+        return 0
+    if not apply:
+        print("ℹ️ Dry run - re-run with --apply to make these changes")
+        return 0
+
+    result = reconciler.apply(plan)
+    summary = result.summary()
+    print(f"✅ Applied {summary['succeeded']} changes, ❌ {summary['failed']} failed "
+          f"in {summary['elapsed']:.2f}s")
+    for label, reason in result.failed[:10]:
+        print(f"   • {label}: {reason}")
+    return 1 if result.failed else 0
+
+
+def export_zone(path, fmt=None, fields=None, compress=None, zone_id=None):
+    """
+    Export the zone to a file
+
+    Args:
+        path (str): File to write; a .gz suffix compresses it
+        fmt (str): "zone", "jsonl" or "csv" (default: from the file extension)
+        fields (list): Fields to keep for JSONL/CSV (optional)
+        compress (bool): Gzip the output (default: when path ends in .gz)
+        zone_id (str): Zone to export (default: ZONE_ID)
+
+    Returns:
+        int: 0 on success, 1 on failure
+    """
+    count = ExportRecord(zone_id=zone_id).export(path, fmt=fmt, fields=fields, compress=compress)
+    if count < 0:
+        print("❌ Failed to export records")
+        return 1
+    print(f"✅ {count} records exported to {path}")
+    return 0
+
+
+def import_zone(path, origin=None, zone_id=None):
+    """
+    Import a BIND zone file into the zone
+
+    Args:
+        path (str): Zone file to read
+        origin (str): Zone apex for relative names when the file has no $ORIGIN (optional)
+        zone_id (str): Zone to import into (default: ZONE_ID)
+
+    Returns:
+        int: 0 on success, 1 on failure or failed records
+    """
+    summary = ImportRecord(zone_id=zone_id).import_zone_file(path, origin=origin)
+    if summary is None:
+        print("❌ Failed to import zone file")
+        return 1
+    print(f"✅ Imported {summary['records']} records ({summary['mode']}): "
+          f"{summary['created']} created, {summary['updated']} updated, "
+          f"{summary['unchanged']} unchanged, {summary['failed']} failed")
+    return 1 if summary['failed'] else 0
+
+
+def find_in_zones(record_name, record_type=None, zones=None):
+    """
+    Look a record name up in many zones at once
+
+    Args:
+        record_name (str): FQDN or label such as "www"
+        record_type (str): Only show records of this type (optional)
+        zones (list): Zone names or IDs (default: every visible zone)
+
+    Returns:
+        int: 0 if any record was found, 1 otherwise
+    """
+    try:
+        results, errors = MultiZone().find_records(record_name, record_type, zones)
+    except (ValueError, CloudflareAPIError) as e:
+        print(f"❌ Cannot search zones: {e}")
+        return 1
+
+    for zone in sorted(results):
+        for record in results[zone]:
+            proxy = "🟠" if record.get('proxied') else "⚪"
+            print(f"{zone:<30} {record.get('type', ''):<6} {record.get('name', '')} -> "
+                  f"{record.get('content', '')} {proxy}")
+    for zone, error in sorted(errors.items()):
+        print(f"❌ {zone}: {error}")
+    print(f"\n🔍 {sum(len(records) for records in results.values())} records in {len(results)} zones")
+    return 0 if results else 1
+
+
+def zone_stats(zones=None):
+    """
+    Print record statistics for many zones
+
+    Args:
+        zones (list): Zone names or IDs (default: every visible zone)
+
+    Returns:
+        int: 0 on success, 1 if any zone failed
+    """
+    try:
+        results, errors = MultiZone().zone_stats(zones)
+    except (ValueError, CloudflareAPIError) as e:
+        print(f"❌ Cannot list zones: {e}")
+        return 1
+
+    for zone in sorted(results):
+        stats = results[zone]
+        types = ", ".join(f"{t}: {n}" for t, n in sorted(stats['types'].items()))
+        print(f"{zone:<30} {stats['total']:>6} records, {stats['proxied']:>5} proxied  ({types})")
+    for zone, error in sorted(errors.items()):
+        print(f"❌ {zone}: {error}")
+    total = sum(stats['total'] for stats in results.values())
+    print(f"\n📊 {total} records across {len(results)} zones")
+    return 1 if errors else 0
+
+
+def run_batch(path="-", zone_id=None, output=None):
+    """
+    Apply JSONL record operations and stream one JSONL result per operation
+
+    Results go to stdout so they can be piped on; the summary and any
+    diagnostics go to stderr. Operations look like
+    {"op": "ttl", "name": "www.example.com", "ttl": 300} (see OperationRunner).
+
+    Args:
+        path (str): File of operations, or "-" for stdin
+        zone_id (str): Zone to change (default: ZONE_ID)
+        output (file): Where results are written (default: stdout)
+
+    Returns:
+        int: 0 if every operation succeeded, 1 otherwise
+    """
+    output = output or sys.stdout
+    counts = {True: 0, False: 0}
+    started = time.perf_counter()
+    try:
+        # stdin belongs to the caller; only close a file opened here
+        source = nullcontext(sys.stdin) if path in (None, "-") else open(path, encoding='utf-8')
+    except OSError as e:
+        print(f"❌ Cannot read operations: {e}", file=sys.stderr)
+        return 1
+
+    with source as lines:
+        for result in OperationRunner(zone_id=zone_id).run(parse_operations(lines)):
+            counts[result['ok']] += 1
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+
+    elapsed = time.perf_counter() - started
+    total = counts[True] + counts[False]
+    print(f"✅ {counts[True]}/{total} operations applied, ❌ {counts[False]} failed in {elapsed:.2f}s "
+          f"({total / elapsed if elapsed else 0:.0f} ops/s)", file=sys.stderr)
+    return 1 if counts[False] else 0
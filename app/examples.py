@@ -10,6 +10,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.feature import (
+    SearchQuery,
     add_record_service,
     delete_record_service,
     edit_record_service,
@@ -103,13 +104,18 @@ def advanced_example():
     
     print(f"Updated TTL for {updated_count} A records")
     
-    # Find and modify records with specific pattern
+    # Find records with a specific pattern; Cloudflare does the filtering
     print("\n🔍 Pattern-based Operations:")
-    all_records = query_record_service.list_all_records()
-    
-    api_records = [r for r in all_records if 'api' in r.get('name', '').lower()]
+    api_records = query_record_service.search(SearchQuery().where("name", "contains", "api").order_by("name"))
     print(f"Found {len(api_records)} records containing 'api'")
     
+    proxied_web = query_record_service.search(
+        SearchQuery().where("type", "exact", "A").where("proxied", "exact", True).where("tag", "present", "web")
+    )
+    print(f"Found {len(proxied_web)} proxied A records tagged 'web'")
+    
+    all_records = query_record_service.list_all_records()
+    
     # Statistics and analysis
     print("\n📊 DNS Statistics:")
     type_counts = {}
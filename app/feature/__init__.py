@@ -3,46 +3,185 @@ Cloudflare DNS Management Feature Module
 Provides modular access to DNS record operations
 """
 
-# Import base classes
-from .base_api import CloudflareAPIClient
+from importlib import import_module
+
+# Public names and the submodules defining them. Submodules are imported on
+# first access, so importing the package stays cheap and services (and their
+# heavier dependencies such as requests and asyncio) are only loaded when used.
+_EXPORTS = {
+    # Base classes
+    'CloudflareAPIClient': 'base_api',
+    'SessionPool': 'sessions',
+    'session_pool': 'sessions',
+    'RequestMetrics': 'metrics',
+    'request_metrics': 'metrics',
+    'RateLimiter': 'rate_limit',
+    'rate_limiter': 'rate_limit',
+    'CircuitBreaker': 'retries',
+    'CircuitOpenError': 'retries',
+    'RetryPolicy': 'retries',
+    'circuit_breaker': 'retries',
+    'retry_policy': 'retries',
+    'DNSRecord': 'dns_record',
+    'ZoneSnapshot': 'zone_snapshot',
+    'SearchQuery': 'search_query',
+    'SnapshotStore': 'snapshots',
+    'snapshot_store': 'snapshots',
+    'ZoneCache': 'cache',
+    'zone_cache': 'cache',
+    'AsyncCloudflareAPIClient': 'async_base_api',
+    'ZoneDirectory': 'zones',
+    'zone_directory': 'zones',
+    
+    # Service classes and instances
+    'AddRecord': 'add_record',
+    'add_record_service': 'add_record',
+    'DeleteRecord': 'delete_record',
+    'delete_record_service': 'delete_record',
+    'EditRecord': 'edit_record',
+    'edit_record_service': 'edit_record',
+    'QueryRecord': 'query_record',
+    'query_record_service': 'query_record',
+    'BatchWriter': 'batch_record',
+    'BulkExecutor': 'bulk',
+    'BulkResult': 'bulk',
+    'bulk_executor': 'bulk',
+    'AsyncAddRecord': 'async_records',
+    'AsyncDeleteRecord': 'async_records',
+    'AsyncEditRecord': 'async_records',
+    'AsyncQueryRecord': 'async_records',
+    'ImportRecord': 'import_record',
+    'import_record_service': 'import_record',
+    'ExportRecord': 'export_record',
+    'export_record_service': 'export_record',
+    'ZoneFileError': 'zone_file',
+    'format_record': 'zone_file',
+    'parse_zone_file': 'zone_file',
+    'write_zone_file': 'zone_file',
+    'MultiZone': 'cross_zone',
+    'multi_zone': 'cross_zone',
+    'UpsertRecord': 'upsert_record',
+    'upsert_record_service': 'upsert_record',
+    'OperationRunner': 'operation_stream',
+    'parse_operations': 'operation_stream',
+    'ReconcilePlan': 'reconcile',
+    'ZoneReconciler': 'reconcile',
+    'compute_plan': 'reconcile',
+    'load_desired_state': 'reconcile',
+}
+
+
+def __getattr__(name):
+    """Import the submodule defining a public name on first access"""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
 
-# Import service instances
-from .add_record import AddRecord, add_record_service
-from .delete_record import DeleteRecord, delete_record_service
-from .edit_record import EditRecord, edit_record_service
-from .query_record import QueryRecord, query_record_service
 
 # Expose all functionality
 __all__ = [
     # Base classes
     'CloudflareAPIClient',
+    'SessionPool',
+    'RateLimiter',
+    'RequestMetrics',
+    'RetryPolicy',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'ZoneCache',
+    'SnapshotStore',
+    'DNSRecord',
+    'ZoneSnapshot',
+    'SearchQuery',
+    'AsyncCloudflareAPIClient',
+    'ZoneDirectory',
     
     # Feature classes
     'AddRecord',
     'DeleteRecord', 
     'EditRecord',
     'QueryRecord',
+    'ImportRecord',
+    'ExportRecord',
+    'AsyncAddRecord',
+    'AsyncDeleteRecord',
+    'AsyncEditRecord',
+    'AsyncQueryRecord',
+    'BatchWriter',
+    'BulkExecutor',
+    'BulkResult',
+    'MultiZone',
+    'UpsertRecord',
+    'OperationRunner',
+    'parse_operations',
+    'ZoneReconciler',
+    'ReconcilePlan',
+    'compute_plan',
+    'load_desired_state',
+    'ZoneFileError',
+    'parse_zone_file',
+    'format_record',
+    'write_zone_file',
     
     # Service instances (for direct use)
     'add_record_service',
     'delete_record_service',
     'edit_record_service',
     'query_record_service',
+    'import_record_service',
+    'export_record_service',
+    'upsert_record_service',
+    'session_pool',
+    'rate_limiter',
+    'request_metrics',
+    'retry_policy',
+    'circuit_breaker',
+    'zone_cache',
+    'snapshot_store',
+    'bulk_executor',
+    'zone_directory',
+    'multi_zone',
 ]
 
 # Convenience functions that mirror the original cloudflare_api.py interface
 def add_subdomain(name, ip_address, ttl=3600, proxied=False):
     """Add a new subdomain (A record) - convenience function"""
+    from .add_record import add_record_service
     return add_record_service.add_subdomain(name, ip_address, ttl, proxied)
 
 def delete_subdomain(subdomain_id):
     """Delete a subdomain by ID - convenience function"""
+    from .delete_record import delete_record_service
     return delete_record_service.delete_subdomain(subdomain_id)
 
 def edit_subdomain(subdomain_id, new_ip_address, ttl=3600, proxied=False):
     """Edit an existing subdomain - convenience function"""
+    from .edit_record import edit_record_service
     return edit_record_service.edit_subdomain(subdomain_id, new_ip_address, ttl, proxied)
 
 def toggle_proxy(subdomain_id, proxied):
     """Toggle proxy status - convenience function"""
-    return edit_record_service.toggle_proxy(subdomain_id, proxied)
\ No newline at end of file
+    from .edit_record import edit_record_service
+    return edit_record_service.toggle_proxy(subdomain_id, proxied)
+
+def upsert_subdomain(name, ip_address, ttl=3600, proxied=False):
+    """Create or update a subdomain (A record) by name - convenience function"""
+    from .upsert_record import upsert_record_service
+    return upsert_record_service.upsert_subdomain(name, ip_address, ttl, proxied)
+
+def upsert_cname_record(name, target, ttl=3600, proxied=False):
+    """Create or update a CNAME record by name - convenience function"""
+    from .upsert_record import upsert_record_service
+    return upsert_record_service.upsert_cname_record(name, target, ttl, proxied)
+
+def upsert_records(records):
+    """Create or update many records with batched writes - convenience function"""
+    from .upsert_record import upsert_record_service
+    return upsert_record_service.upsert_many(records)
\ No newline at end of file
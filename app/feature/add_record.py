@@ -33,7 +33,8 @@ class AddRecord(CloudflareAPIClient):
             response = self._make_request("POST", "", data)
             
             if response.status_code == 201:
-                self._log_success("added subdomain", f"{name} with IP: {ip_address}")
+                self.cache.store(self.zone_id, response.json().get('result'))
+                self._log_success("added subdomain", "%s with IP: %s", name, ip_address)
                 return True
             else:
                 self._log_error("adding subdomain", response)
@@ -68,7 +69,8 @@ class AddRecord(CloudflareAPIClient):
             response = self._make_request("POST", "", data)
             
             if response.status_code == 201:
-                self._log_success("added CNAME record", f"{name} -> {target}")
+                self.cache.store(self.zone_id, response.json().get('result'))
+                self._log_success("added CNAME record", "%s -> %s", name, target)
                 return True
             else:
                 self._log_error("adding CNAME record", response)
@@ -0,0 +1,205 @@
+"""
+Async base API client for Cloudflare DNS operations
+Runs many requests concurrently on one asyncio event loop
+"""
+import asyncio
+import json
+import time
+
+from config import ASYNC_CONCURRENCY, RATE_LIMIT_MAX_RETRIES
+from app.log.logger import logger
+from .base_api import CloudflareAPIClient
+from .rate_limit import retry_after_seconds
+from .retries import CircuitOpenError
+
+
+class AsyncResponse:
+    """Fully read aiohttp response exposing the requests.Response attributes we use"""
+
+    def __init__(self, status_code, text, headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def json(self):
+        """Decode the response body as JSON"""
+        return json.loads(self.text)
+
+
+class AsyncCloudflareAPIClient(CloudflareAPIClient):
+    """Base class for asyncio Cloudflare API operations"""
+
+    def __init__(self, concurrency=None, session=None, semaphore=None, **kwargs):
+        """
+        Args:
+            concurrency (int): Maximum requests in flight (default: ASYNC_CONCURRENCY)
+            session (aiohttp.ClientSession): Session to share with other clients (optional)
+            semaphore (asyncio.Semaphore): Concurrency limit to share with other clients (optional)
+            **kwargs: Zone and shared cache, limiter, retry and breaker (see CloudflareAPIClient)
+        """
+        super().__init__(**kwargs)
+        self.concurrency = concurrency or ASYNC_CONCURRENCY
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore = semaphore
+
+    @property
+    def semaphore(self):
+        """Concurrency limit applied to every request from this client"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def get_session(self):
+        """Return the aiohttp session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            try:
+                import aiohttp
+            except ImportError as e:
+                raise ImportError("The async client requires aiohttp: pip install aiohttp") from e
+
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._owns_session = True
+        return self._session
+
+    async def _make_request(self, method, endpoint, data=None, params=None, idempotent=None, deadline=None):
+        """
+        Make HTTP request to Cloudflare API
+
+        Shares the synchronous clients' rate limiter, retry policy and
+        circuit breaker without blocking the event loop: 429 answers are
+        retried after Retry-After, and connection errors, timeouts and
+        5xx answers are retried with backoff when the request is
+        idempotent, all within the call's deadline.
+
+        Args:
+            method (str): HTTP method (GET, POST, PUT, PATCH, DELETE)
+            endpoint (str): API endpoint
+            data (dict): Request data (optional)
+            params (dict): Query string parameters (optional)
+            idempotent (bool): Whether repeating the request is safe (default: by method)
+            deadline (float): Seconds the whole call may take, retries included (optional)
+
+        Returns:
+            AsyncResponse: Fully read HTTP response
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+        """
+        path = f"/zones/{self.zone_id}/dns_records{endpoint}"
+        url = f"{self.base_url}{path}"
+        method = method.upper()
+        trial = False
+
+        try:
+            if method not in self.SUPPORTED_METHODS:
+                raise ValueError(f"Unsupported HTTP method: {method}")
+
+            body = json.dumps(data) if data is not None else None
+            bytes_sent = len(body) if body else 0
+            session = await self.get_session()
+            import aiohttp
+            deadline_at = time.monotonic() + (deadline or self.deadline)
+            attempt = 0
+            throttled = 0
+            admitted = False
+
+            while True:
+                # Throttle retries reuse the admission; the breaker is asked again after a failure
+                if not admitted:
+                    trial = self.circuit_breaker.before_request()
+                    admitted = True
+                await self._wait_for_slot()
+                timeout = aiohttp.ClientTimeout(total=max(min(self.timeout, deadline_at - time.monotonic()), 1.0))
+                started = time.perf_counter()
+
+                try:
+                    async with self.semaphore:
+                        async with session.request(method, url, headers=self.headers, data=body,
+                                                   params=params, timeout=timeout) as raw:
+                            response = AsyncResponse(raw.status, await raw.text(), dict(raw.headers))
+                except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                    self._observe(method, path, "error", started, bytes_sent)
+                    self.circuit_breaker.record_failure()
+                    trial = admitted = False
+                    delay = self.retry_policy.retry_delay(
+                        attempt, method, idempotent,
+                        safe=isinstance(e, aiohttp.ClientConnectorError),
+                        deadline_at=deadline_at
+                    )
+                    if delay is None:
+                        raise
+                    logger.warning("%s %s failed (%s); retry %d in %.1fs", method, url, e.__class__.__name__,
+                                   attempt + 1, delay, extra=self._event(method, path, attempt=attempt + 1,
+                                                                         delay=delay))
+                    self.metrics.retry(method, path, "network_error")
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+
+                self._observe(method, path, response.status_code, started, bytes_sent,
+                              len(response.text.encode()))
+
+                if response.status_code == 429:
+                    delay = retry_after_seconds(response, self.DEFAULT_RETRY_AFTER * 2 ** throttled)
+                    if throttled >= RATE_LIMIT_MAX_RETRIES or time.monotonic() + delay >= deadline_at:
+                        return response
+                    logger.warning("Rate limited on %s %s; retrying in %.1fs", method, url, delay,
+                                   extra=self._event(method, path, status=429, delay=delay))
+                    self.metrics.retry(method, path, "throttled")
+                    self.rate_limiter.pause(delay)
+                    throttled += 1
+                    continue
+
+                if response.status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                    trial = admitted = False
+                    delay = self.retry_policy.retry_delay(attempt, method, idempotent,
+                                                          status=response.status_code,
+                                                          deadline_at=deadline_at)
+                    if delay is None:
+                        return response
+                    logger.warning("%s %s answered %s; retry %d in %.1fs", method, url, response.status_code,
+                                   attempt + 1, delay, extra=self._event(method, path, status=response.status_code,
+                                                                         attempt=attempt + 1, delay=delay))
+                    self.metrics.retry(method, path, "server_error")
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+
+                self.circuit_breaker.record_success()
+                trial = False
+                return response
+
+        except (ValueError, CircuitOpenError):
+            raise
+        except Exception as e:
+            logger.error("Network error during %s request to %s: %s", method, url, e,
+                         extra=self._event(method, path))
+            raise
+        finally:
+            if trial:
+                # A trial that ended without a success or failure (429, error) must not hold the slot
+                self.circuit_breaker.record_neutral()
+
+    async def _wait_for_slot(self):
+        """Sleep until the shared rate limiter allows another request"""
+        await asyncio.sleep(self.rate_limiter.reserve())
+        remaining = self.rate_limiter.pause_remaining()
+        while remaining > 0:
+            await asyncio.sleep(remaining)
+            remaining = self.rate_limiter.pause_remaining()
+
+    async def close(self):
+        """Close the aiohttp session if this client created it"""
+        if self._session is not None and self._owns_session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        await self.get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -0,0 +1,419 @@
+"""
+Async DNS Record Module
+Asyncio versions of the add, edit, delete and query feature classes
+"""
+import asyncio
+
+from .async_base_api import AsyncCloudflareAPIClient
+from .base_api import CloudflareAPIError
+from .dns_record import DNSRecord
+from .edit_record import changed_fields
+
+
+class AsyncAddRecord(AsyncCloudflareAPIClient):
+    """Handle DNS record addition operations asynchronously"""
+
+    async def add_subdomain(self, name, ip_address, ttl=3600, proxied=False):
+        """
+        Add a new subdomain (A record) to Cloudflare DNS
+
+        Args:
+            name (str): Subdomain name
+            ip_address (str): IP address for the A record
+            ttl (int): Time to live in seconds (default: 3600)
+            proxied (bool): Whether to proxy through Cloudflare (default: False)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        data = {
+            "type": "A",
+            "name": name,
+            "content": ip_address,
+            "ttl": ttl,
+            "proxied": proxied
+        }
+
+        try:
+            response = await self._make_request("POST", "", data)
+
+            if response.status_code == 201:
+                self.cache.store(self.zone_id, response.json().get('result'))
+                self._log_success("added subdomain", "%s with IP: %s", name, ip_address)
+                return True
+            else:
+                self._log_error("adding subdomain", response)
+                return False
+
+        except Exception as e:
+            self._log_error("adding subdomain", error=e)
+            return False
+
+    async def add_cname_record(self, name, target, ttl=3600, proxied=False):
+        """
+        Add a new CNAME record to Cloudflare DNS
+
+        Args:
+            name (str): Record name
+            target (str): Target domain/subdomain
+            ttl (int): Time to live in seconds (default: 3600)
+            proxied (bool): Whether to proxy through Cloudflare (default: False)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        data = {
+            "type": "CNAME",
+            "name": name,
+            "content": target,
+            "ttl": ttl,
+            "proxied": proxied
+        }
+
+        try:
+            response = await self._make_request("POST", "", data)
+
+            if response.status_code == 201:
+                self.cache.store(self.zone_id, response.json().get('result'))
+                self._log_success("added CNAME record", "%s -> %s", name, target)
+                return True
+            else:
+                self._log_error("adding CNAME record", response)
+                return False
+
+        except Exception as e:
+            self._log_error("adding CNAME record", error=e)
+            return False
+
+
+class AsyncEditRecord(AsyncCloudflareAPIClient):
+    """
+    Handle DNS record editing operations asynchronously
+
+    Like EditRecord, sends PATCH requests with only the fields that differ
+    from a fresh cached copy of the record, and none when nothing differs.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writes_skipped = 0
+
+    async def _update(self, record_id, data, operation, success_operation, details):
+        """Send the changed fields of one record and log the outcome"""
+        payload = changed_fields(self.cache.get_record(self.zone_id, record_id), data)
+        if not payload:
+            self.writes_skipped += 1
+            self._log_success(success_operation, f"{details} (already up to date, no request sent)",
+                              record_id=record_id)
+            return True
+
+        try:
+            response = await self._make_request("PATCH", f"/{record_id}", payload, idempotent=True)
+
+            if response.status_code == 200:
+                self.cache.store(self.zone_id, response.json().get('result'))
+                self._log_success(success_operation, details, record_id=record_id)
+                return True
+            else:
+                self._log_error(operation, response, record_id=record_id)
+                return False
+
+        except Exception as e:
+            self._log_error(operation, error=e, record_id=record_id)
+            return False
+
+    async def edit_subdomain(self, subdomain_id, new_ip_address, ttl=3600, proxied=False):
+        """
+        Edit an existing DNS A record
+
+        Args:
+            subdomain_id (str): The DNS record ID to edit
+            new_ip_address (str): New IP address
+            ttl (int): Time to live in seconds (default: 3600)
+            proxied (bool): Whether to proxy through Cloudflare (default: False)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        data = {
+            "type": "A",
+            "content": new_ip_address,
+            "ttl": ttl,
+            "proxied": proxied
+        }
+        return await self._update(subdomain_id, data, "editing subdomain", "edited subdomain",
+                                  f"ID: {subdomain_id} with new IP: {new_ip_address}")
+
+    async def toggle_proxy(self, subdomain_id, proxied):
+        """
+        Toggle proxy status for a DNS record
+
+        Args:
+            subdomain_id (str): The DNS record ID
+            proxied (bool): Whether to enable or disable proxy
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        status = "enabled" if proxied else "disabled"
+        return await self._update(subdomain_id, {"proxied": proxied}, "toggling proxy",
+                                  f"proxy {status}", f"subdomain ID: {subdomain_id}")
+
+    async def update_record_ttl(self, subdomain_id, new_ttl):
+        """
+        Update TTL for a DNS record
+
+        Args:
+            subdomain_id (str): The DNS record ID
+            new_ttl (int): New TTL value in seconds
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return await self._update(subdomain_id, {"ttl": new_ttl}, "updating TTL", "updated TTL",
+                                  f"subdomain ID: {subdomain_id} to {new_ttl} seconds")
+
+    async def edit_cname_record(self, record_id, new_target, ttl=3600, proxied=False):
+        """
+        Edit an existing CNAME record
+
+        Args:
+            record_id (str): The DNS record ID to edit
+            new_target (str): New target domain/subdomain
+            ttl (int): Time to live in seconds (default: 3600)
+            proxied (bool): Whether to proxy through Cloudflare (default: False)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        data = {
+            "type": "CNAME",
+            "content": new_target,
+            "ttl": ttl,
+            "proxied": proxied
+        }
+        return await self._update(record_id, data, "editing CNAME record", "edited CNAME record",
+                                  f"ID: {record_id} with new target: {new_target}")
+
+
+class AsyncDeleteRecord(AsyncCloudflareAPIClient):
+    """Handle DNS record deletion operations asynchronously"""
+
+    async def delete_subdomain(self, subdomain_id):
+        """
+        Delete a DNS record by its ID
+
+        Args:
+            subdomain_id (str): The DNS record ID to delete
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            response = await self._make_request("DELETE", f"/{subdomain_id}")
+
+            if response.status_code == 200:
+                self.cache.remove(self.zone_id, subdomain_id)
+                self._log_success("deleted subdomain", "ID: %s", subdomain_id, record_id=subdomain_id)
+                return True
+            else:
+                self._log_error("deleting subdomain", response, record_id=subdomain_id)
+                return False
+
+        except Exception as e:
+            self._log_error("deleting subdomain", error=e, record_id=subdomain_id)
+            return False
+
+    async def delete_record_by_name(self, record_name):
+        """
+        Delete a DNS record by its name (requires fetching ID first)
+
+        Args:
+            record_name (str): The DNS record name to delete
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            record_id = await self._get_record_id_by_name(record_name)
+
+            if not record_id:
+                self._log_error("deleting record", error=f"Record '{record_name}' not found")
+                return False
+
+            return await self.delete_subdomain(record_id)
+
+        except Exception as e:
+            self._log_error("deleting record by name", error=e)
+            return False
+
+    async def _get_record_id_by_name(self, record_name):
+        """
+        Get DNS record ID by name
+
+        Args:
+            record_name (str): The DNS record name
+
+        Returns:
+            str: Record ID if found, None otherwise
+        """
+        try:
+            response = await self._make_request("GET", "", params={"name": record_name})
+
+            if response.status_code == 200:
+                records = response.json().get('result', [])
+                if records:
+                    return records[0]['id']
+
+            return None
+
+        except Exception as e:
+            self._log_error("fetching record ID", error=e)
+            return None
+
+
+class AsyncQueryRecord(AsyncCloudflareAPIClient):
+    """Handle DNS record query operations asynchronously"""
+
+    # Largest page size accepted by the DNS records list endpoint
+    MAX_PAGE_SIZE = 5000
+
+    async def iter_records(self, record_type=None, per_page=MAX_PAGE_SIZE):
+        """
+        Iterate over every DNS record in the zone
+
+        After the first page reports total_pages, the remaining pages are
+        requested concurrently (bounded by the client's concurrency limit)
+        and yielded back in page order.
+
+        Args:
+            record_type (str): Only yield records of this type (optional)
+            per_page (int): Records requested per page (default: MAX_PAGE_SIZE)
+
+        Yields:
+            dict: DNS record data
+
+        Raises:
+            CloudflareAPIError: If a page cannot be retrieved
+        """
+        params = {"per_page": per_page}
+        if record_type:
+            params["type"] = record_type
+
+        records, info = await self._fetch_page(params, 1)
+        for record in records:
+            yield record
+
+        total_pages = info.get('total_pages') or 1
+        window = max(1, self.concurrency)
+        for first in range(2, total_pages + 1, window):
+            last = min(first + window, total_pages + 1)
+            pages = await asyncio.gather(*(self._fetch_page(params, page) for page in range(first, last)))
+            for records, _ in pages:
+                for record in records:
+                    yield record
+
+    async def _fetch_page(self, params, page):
+        """
+        Fetch a single page of DNS records
+
+        Returns:
+            tuple: (records, result_info)
+        """
+        response = await self._make_request("GET", "", params=dict(params, page=page))
+
+        if response.status_code != 200:
+            self._log_error("listing records", response)
+            raise CloudflareAPIError(f"listing records page {page}", response)
+
+        payload = response.json()
+        return [DNSRecord(record) for record in payload.get('result') or []], payload.get('result_info') or {}
+
+    async def list_all_records(self):
+        """
+        List all DNS records in the zone
+
+        Returns:
+            list: List of DNS records if successful, empty list otherwise
+        """
+        try:
+            records = [record async for record in self.iter_records()]
+            self._log_success("retrieved all records", f"found {len(records)} records")
+            return records
+
+        except Exception as e:
+            self._log_error("listing records", error=e)
+            return []
+
+    async def get_record_by_name(self, record_name):
+        """
+        Get a specific DNS record by name
+
+        Args:
+            record_name (str): The DNS record name to search for
+
+        Returns:
+            dict: Record data if found, None otherwise
+        """
+        try:
+            response = await self._make_request("GET", "", params={"name": record_name})
+
+            if response.status_code == 200:
+                records = response.json().get('result', [])
+                if records:
+                    self._log_success("found record", f"name: {record_name}")
+                    return records[0]
+                else:
+                    self._log_error("finding record", error=f"Record '{record_name}' not found")
+                    return None
+            else:
+                self._log_error("finding record", response)
+                return None
+
+        except Exception as e:
+            self._log_error("finding record", error=e)
+            return None
+
+    async def get_record_by_id(self, record_id):
+        """
+        Get a specific DNS record by ID
+
+        Args:
+            record_id (str): The DNS record ID to search for
+
+        Returns:
+            dict: Record data if found, None otherwise
+        """
+        try:
+            response = await self._make_request("GET", f"/{record_id}")
+
+            if response.status_code == 200:
+                record = response.json().get('result')
+                self._log_success("found record", f"ID: {record_id}")
+                return record
+            else:
+                self._log_error("finding record by ID", response)
+                return None
+
+        except Exception as e:
+            self._log_error("finding record by ID", error=e)
+            return None
+
+    async def list_records_by_type(self, record_type):
+        """
+        List DNS records filtered by type
+
+        Args:
+            record_type (str): DNS record type (A, CNAME, MX, etc.)
+
+        Returns:
+            list: List of DNS records of specified type
+        """
+        try:
+            records = [record async for record in self.iter_records(record_type)]
+            self._log_success("retrieved records by type", f"found {len(records)} {record_type} records")
+            return records
+
+        except Exception as e:
+            self._log_error("listing records by type", error=e)
+            return []
@@ -1,66 +1,336 @@
 """
 Base API client for Cloudflare DNS operations
 """
-import requests
 import json
-from config import API_TOKEN, ZONE_ID
+import logging
+import time
+from config import API_BASE_URL, API_TOKEN, ZONE_ID, RATE_LIMIT_MAX_RETRIES, HTTP_TIMEOUT, REQUEST_DEADLINE
 from app.log.logger import logger
+from .metrics import endpoint_label, request_metrics
+from .rate_limit import rate_limiter, retry_after_seconds
+from .retries import CircuitOpenError, retry_policy, circuit_breaker
+from .sessions import session_pool
+from .cache import zone_cache
+
+
+class CloudflareAPIError(Exception):
+    """Raised when the Cloudflare API answers with an unexpected status"""
+    
+    def __init__(self, operation, response=None):
+        self.operation = operation
+        self.response = response
+        status = response.status_code if response is not None else "no response"
+        super().__init__(f"Error {operation}: HTTP {status}")
+
+
+def _body_size(body, files=None):
+    """Approximate bytes in a request body"""
+    size = 0
+    if isinstance(body, (str, bytes)):
+        size = len(body)
+    elif isinstance(body, dict):
+        size = sum(len(str(key)) + len(str(value)) for key, value in body.items())
+    for upload in (files or {}).values():
+        content = upload[1] if isinstance(upload, tuple) else upload
+        if isinstance(content, (str, bytes)):
+            size += len(content)
+    return size
+
+
+def _response_size(response, stream=False):
+    """Bytes in a response body, without reading streamed bodies"""
+    length = response.headers.get('Content-Length') if response.headers else None
+    if length and length.isdigit():
+        return int(length)
+    if stream:
+        return 0
+    content = getattr(response, 'content', None)
+    return len(content) if isinstance(content, (str, bytes)) else 0
+
+
+_UNPARSED = object()
+
+
+def response_json(response):
+    """
+    JSON body of a response, parsed once and kept on the response
+
+    Returns:
+        The decoded body, or None if it is not JSON
+    """
+    parsed = getattr(response, '_parsed_json', _UNPARSED)
+    if parsed is _UNPARSED:
+        try:
+            parsed = response.json()
+        except ValueError:
+            parsed = None
+        response._parsed_json = parsed
+    return parsed
+
+
+class _ErrorDetails:
+    """Error summary of a failed response, worked out only if the message is formatted"""
+    
+    def __init__(self, response):
+        self.response = response
+    
+    def __str__(self):
+        payload = response_json(self.response)
+        if isinstance(payload, dict) and payload.get('errors'):
+            return "; ".join(f"{error.get('code')}: {error.get('message')}" if isinstance(error, dict) else str(error)
+                             for error in payload['errors'])
+        if payload is not None:
+            return json.dumps(payload)[:500]
+        text = getattr(self.response, 'text', '') or ''
+        return text[:200] or "empty response"
 
 
 class CloudflareAPIClient:
     """Base class for Cloudflare API operations"""
     
-    def __init__(self):
+    # HTTP methods accepted by _make_request
+    SUPPORTED_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+    
+    # Wait used after a 429 response without a usable Retry-After header
+    DEFAULT_RETRY_AFTER = 5.0
+    
+    def __init__(self, pool=None, cache=None, limiter=None, retry=None, breaker=None, zone_id=None,
+                 base_url=None, metrics=None):
+        """
+        Args:
+            pool (SessionPool): Connection pool (default: the shared session_pool)
+            cache (ZoneCache): Record cache (default: the shared zone_cache)
+            limiter (RateLimiter): Request pacing (default: the shared rate_limiter)
+            retry (RetryPolicy): Retry rules (default: the shared retry_policy)
+            breaker (CircuitBreaker): Circuit breaker (default: the shared circuit_breaker)
+            zone_id (str): Zone this client works on (default: ZONE_ID)
+            base_url (str): API endpoint (default: API_BASE_URL)
+            metrics (RequestMetrics): Request metrics registry (default: the shared request_metrics)
+        """
+        self.pool = pool or session_pool
+        self.cache = cache or zone_cache
+        self.rate_limiter = limiter or rate_limiter
+        self.retry_policy = retry or retry_policy
+        self.circuit_breaker = breaker or circuit_breaker
+        self.metrics = metrics or request_metrics
+        self.timeout = HTTP_TIMEOUT
+        self.deadline = REQUEST_DEADLINE
         self.api_token = API_TOKEN
-        self.zone_id = ZONE_ID
-        self.base_url = "https://api.cloudflare.com/client/v4"
+        self.zone_id = zone_id or ZONE_ID
+        self.base_url = (base_url or API_BASE_URL).rstrip('/')
         self.headers = {
             "Authorization": f"Bearer {self.api_token}",
             "Content-Type": "application/json"
         }
     
-    def _make_request(self, method, endpoint, data=None):
+    def shared_options(self):
         """
-        Make HTTP request to Cloudflare API
+        Constructor arguments for another client on the same zone and shared state
+        
+        Returns:
+            dict: pool, cache, limiter, retry, breaker, zone_id, base_url and metrics
+        """
+        return dict(pool=self.pool, cache=self.cache, limiter=self.rate_limiter, retry=self.retry_policy,
+                    breaker=self.circuit_breaker, zone_id=self.zone_id, base_url=self.base_url,
+                    metrics=self.metrics)
+    
+    def _make_request(self, method, endpoint, data=None, params=None, **kwargs):
+        """
+        Make HTTP request to this client's zone DNS records endpoint
         
         Args:
-            method (str): HTTP method (GET, POST, PUT, DELETE)
-            endpoint (str): API endpoint
+            method (str): HTTP method (GET, POST, PUT, PATCH, DELETE)
+            endpoint (str): Path below /zones/{zone_id}/dns_records
             data (dict): Request data (optional)
+            params (dict): Query string parameters (optional)
+            **kwargs: idempotent, deadline, files and stream (see _request)
             
         Returns:
             requests.Response: HTTP response object
         """
-        url = f"{self.base_url}/zones/{self.zone_id}/dns_records{endpoint}"
+        return self._request(method, f"/zones/{self.zone_id}/dns_records{endpoint}", data, params, **kwargs)
+    
+    def _request(self, method, path, data=None, params=None, idempotent=None, deadline=None,
+                 files=None, stream=False):
+        """
+        Make HTTP request to any Cloudflare API path
+        
+        Every attempt waits for a slot from the shared rate limiter and is
+        refused while the circuit breaker is open. A 429 answer pauses all
+        clients for the Retry-After time and is re-sent up to
+        RATE_LIMIT_MAX_RETRIES times. Connection errors, timeouts and 5xx
+        answers are retried with jittered exponential backoff when the
+        request is idempotent, all within the call's deadline.
+        
+        With ``files`` the request is sent as multipart form data and
+        ``data`` holds the plain form fields. With ``stream`` the body is
+        not read up front; the caller iterates and closes the response.
+        
+        Args:
+            method (str): HTTP method (GET, POST, PUT, PATCH, DELETE)
+            path (str): Path below the API base URL, e.g. /zones
+            data (dict): Request data (optional)
+            params (dict): Query string parameters (optional)
+            idempotent (bool): Whether repeating the request is safe (default: by method)
+            deadline (float): Seconds the whole call may take, retries included (optional)
+            files (dict): Multipart uploads as {field: (filename, bytes)} (optional)
+            stream (bool): Leave the response body unread for streaming (default: False)
+            
+        Returns:
+            requests.Response: HTTP response object
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+        """
+        import requests
+        
+        url = f"{self.base_url}{path}"
+        method = method.upper()
+        trial = False
         
         try:
-            if method.upper() == "GET":
-                response = requests.get(url, headers=self.headers)
-            elif method.upper() == "POST":
-                response = requests.post(url, headers=self.headers, data=json.dumps(data))
-            elif method.upper() == "PUT":
-                response = requests.put(url, headers=self.headers, data=json.dumps(data))
-            elif method.upper() == "DELETE":
-                response = requests.delete(url, headers=self.headers)
-            else:
+            if method not in self.SUPPORTED_METHODS:
                 raise ValueError(f"Unsupported HTTP method: {method}")
+            
+            headers = self.headers
+            if files is not None:
+                # Let requests set the multipart boundary
+                headers = {key: value for key, value in headers.items() if key != "Content-Type"}
+                body = data
+            else:
+                body = json.dumps(data) if data is not None else None
+            bytes_sent = _body_size(body, files)
+            deadline_at = time.monotonic() + (deadline or self.deadline)
+            attempt = 0
+            throttled = 0
+            admitted = False
+            
+            while True:
+                # Throttle retries reuse the admission; the breaker is asked again after a failure
+                if not admitted:
+                    trial = self.circuit_breaker.before_request()
+                    admitted = True
+                self.rate_limiter.acquire()
+                timeout = max(min(self.timeout, deadline_at - time.monotonic()), 1.0)
+                started = time.perf_counter()
+                
+                try:
+                    response = self.pool.session.request(method, url, headers=headers, data=body,
+                                                         params=params, files=files, timeout=timeout,
+                                                         stream=stream)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                        requests.exceptions.ChunkedEncodingError) as e:
+                    self._observe(method, path, "error", started, bytes_sent)
+                    self.circuit_breaker.record_failure()
+                    trial = admitted = False
+                    delay = self.retry_policy.retry_delay(
+                        attempt, method, idempotent,
+                        safe=isinstance(e, requests.exceptions.ConnectTimeout),
+                        deadline_at=deadline_at
+                    )
+                    if delay is None:
+                        raise
+                    logger.warning("%s %s failed (%s); retry %d in %.1fs", method, url, e.__class__.__name__,
+                                   attempt + 1, delay, extra=self._event(method, path, attempt=attempt + 1,
+                                                                         delay=delay))
+                    self.metrics.retry(method, path, "network_error")
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
                 
-            return response
+                self._observe(method, path, response.status_code, started, bytes_sent,
+                              _response_size(response, stream))
+                
+                if response.status_code == 429:
+                    delay = retry_after_seconds(response, self.DEFAULT_RETRY_AFTER * 2 ** throttled)
+                    if throttled >= RATE_LIMIT_MAX_RETRIES or time.monotonic() + delay >= deadline_at:
+                        return response
+                    logger.warning("Rate limited on %s %s; retrying in %.1fs", method, url, delay,
+                                   extra=self._event(method, path, status=429, delay=delay))
+                    self.metrics.retry(method, path, "throttled")
+                    if stream:
+                        response.close()
+                    self.rate_limiter.pause(delay)
+                    throttled += 1
+                    continue
+                
+                if response.status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                    trial = admitted = False
+                    delay = self.retry_policy.retry_delay(attempt, method, idempotent,
+                                                          status=response.status_code,
+                                                          deadline_at=deadline_at)
+                    if delay is None:
+                        return response
+                    logger.warning("%s %s answered %s; retry %d in %.1fs", method, url, response.status_code,
+                                   attempt + 1, delay, extra=self._event(method, path, status=response.status_code,
+                                                                         attempt=attempt + 1, delay=delay))
+                    self.metrics.retry(method, path, "server_error")
+                    if stream:
+                        response.close()
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+                
+                self.circuit_breaker.record_success()
+                trial = False
+                return response
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Network error during {method} request to {url}: {str(e)}")
+            logger.error("Network error during %s request to %s: %s", method, url, e,
+                         extra=self._event(method, path))
+            raise
+        except CircuitOpenError:
             raise
         except Exception as e:
-            logger.error(f"Unexpected error during {method} request: {str(e)}")
+            logger.error("Unexpected error during %s request: %s", method, e, extra=self._event(method, path))
             raise
+        finally:
+            if trial:
+                # A trial that ended without a success or failure (429, error) must not hold the slot
+                self.circuit_breaker.record_neutral()
+    
+    def _observe(self, method, path, status, started, bytes_sent=0, bytes_received=0):
+        """Record one HTTP attempt in the metrics and, at DEBUG level, the log"""
+        elapsed = time.perf_counter() - started
+        self.metrics.observe(method, path, status, elapsed, bytes_sent, bytes_received)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s %s -> %s in %.1f ms", method, path, status, elapsed * 1000,
+                         extra=self._event(method, path, status=status, latency_ms=round(elapsed * 1000, 2)))
+    
+    @staticmethod
+    def _event(method, path, **fields):
+        """Structured log fields for a request"""
+        return dict(fields, method=method, endpoint=endpoint_label(path))
+    
+    def get_connection_stats(self):
+        """
+        Get connection reuse statistics for the shared session pool
+        
+        Returns:
+            dict: Request, connection and reuse counters
+        """
+        return self.pool.stats()
     
-    def _log_success(self, operation, details=""):
-        """Log successful operation"""
-        logger.info(f"Successfully {operation}: {details}")
+    def _log_success(self, operation, details="", *args, record_id=None):
+        """
+        Log successful operation
+        
+        ``details`` may be a %-format string for ``args``; it is only
+        formatted if the message is written.
+        """
+        if args:
+            message, args = "Successfully %s: " + details, (operation,) + args
+        else:
+            message, args = "Successfully %s: %s", (operation, details)
+        logger.info(message, *args, extra={"operation": operation, "record_id": record_id})
     
-    def _log_error(self, operation, response=None, error=None):
-        """Log failed operation"""
-        if response:
-            logger.error(f"Error {operation}: {response.json()}")
+    def _log_error(self, operation, response=None, error=None, record_id=None):
+        """Log failed operation, with the API's error messages when it sent any"""
+        fields = {"operation": operation, "record_id": record_id}
+        if response is not None:
+            fields["status"] = response.status_code
+            logger.error("Error %s: HTTP %s %s", operation, response.status_code, _ErrorDetails(response),
+                         extra=fields)
         elif error:
-            logger.error(f"Exception occurred while {operation}: {str(error)}")
+            logger.error("Exception occurred while %s: %s", operation, error, extra=fields)
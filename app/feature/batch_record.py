@@ -0,0 +1,206 @@
+"""
+DNS Record Batch Module
+Coalesces record writes into calls to the Cloudflare batch endpoint
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from config import BATCH_MAX_SIZE, BATCH_MAX_DELAY
+from app.log.logger import logger
+from .base_api import CloudflareAPIClient, CloudflareAPIError
+
+
+class BatchWriter(CloudflareAPIClient):
+    """
+    Collect record mutations and send them as POST /dns_records/batch calls
+
+    Every mutation returns a Future that resolves to the resulting record
+    once its batch has been applied, or raises CloudflareAPIError if the
+    batch was rejected. Cloudflare applies a batch atomically, so one bad
+    item makes it reject the whole call; a rejected batch is resent in
+    halves so that only the bad items fail. Pending mutations are sent when
+    max_batch_size is reached or max_delay seconds after the first one
+    was queued; batches are sent one at a time in submission order.
+    """
+
+    # Order in which Cloudflare applies the operations of one batch
+    OPERATIONS = ("deletes", "patches", "puts", "posts")
+
+    def __init__(self, max_batch_size=None, max_delay=None, **kwargs):
+        """
+        Args:
+            max_batch_size (int): Mutations per batch call (default: BATCH_MAX_SIZE)
+            max_delay (float): Seconds to wait for more mutations (default: BATCH_MAX_DELAY)
+            **kwargs: Zone and shared pool, cache, limiter, retry and breaker (see CloudflareAPIClient)
+        """
+        super().__init__(**kwargs)
+        self.max_batch_size = max_batch_size or BATCH_MAX_SIZE
+        self.max_delay = BATCH_MAX_DELAY if max_delay is None else max_delay
+        self._pending = []
+        self._lock = threading.Lock()
+        self._timer = None
+        self._sender = ThreadPoolExecutor(max_workers=1)
+        self._last_send = None
+        self.batches_sent = 0
+
+    def post(self, record):
+        """
+        Queue creation of a new record
+
+        Args:
+            record (dict): Full record body (type, name, content, ...)
+
+        Returns:
+            Future: Resolves to the created record
+        """
+        return self._enqueue("posts", dict(record))
+
+    def patch(self, record_id, changes):
+        """
+        Queue a partial update of an existing record
+
+        Args:
+            record_id (str): The DNS record ID
+            changes (dict): Fields to change
+
+        Returns:
+            Future: Resolves to the updated record
+        """
+        return self._enqueue("patches", dict(changes, id=record_id))
+
+    def put(self, record_id, record):
+        """
+        Queue a full overwrite of an existing record
+
+        Args:
+            record_id (str): The DNS record ID
+            record (dict): Full record body
+
+        Returns:
+            Future: Resolves to the updated record
+        """
+        return self._enqueue("puts", dict(record, id=record_id))
+
+    def delete(self, record_id):
+        """
+        Queue deletion of a record
+
+        Args:
+            record_id (str): The DNS record ID
+
+        Returns:
+            Future: Resolves to the deleted record reference
+        """
+        return self._enqueue("deletes", {"id": record_id})
+
+    def flush(self, wait=True):
+        """
+        Send every queued mutation now
+
+        Args:
+            wait (bool): Block until all batches have been answered (default: True)
+        """
+        self._dispatch()
+        last_send = self._last_send
+        if wait and last_send is not None:
+            last_send.result()
+
+    def close(self):
+        """Flush pending mutations and stop the sender thread"""
+        self.flush()
+        self._sender.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _enqueue(self, operation, payload):
+        """Queue one mutation and dispatch the batch if a threshold is reached"""
+        future = Future()
+        with self._lock:
+            self._pending.append((operation, payload, future))
+            full = len(self._pending) >= self.max_batch_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self._dispatch)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self._dispatch()
+        return future
+
+    def _dispatch(self):
+        """Hand everything queued to the sender thread in max_batch_size chunks"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, []
+            for start in range(0, len(pending), self.max_batch_size):
+                chunk = pending[start:start + self.max_batch_size]
+                self._last_send = self._sender.submit(self._send, chunk)
+
+    def _update_cache(self, operation, record, payload):
+        """Write an applied change through to the zone cache"""
+        if operation == "deletes":
+            self.cache.remove(self.zone_id, payload['id'])
+        else:
+            self.cache.store(self.zone_id, record)
+
+    def _send(self, items):
+        """Send one batch call and resolve the futures of its items"""
+        try:
+            self._apply(items)
+
+        except Exception as e:
+            if not isinstance(e, CloudflareAPIError):
+                self._log_error("applying batch", error=e)
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _apply(self, items):
+        """
+        Apply items in one batch call, splitting the batch if an item is rejected
+
+        A 4xx answer other than an auth or rate-limit error means some item
+        was refused, and the API rejected the whole call because of it. The
+        items are then sent again in halves until every bad item is alone,
+        so only those fail; k bad items among n cost about 2k·log2(n) calls.
+
+        Raises:
+            CloudflareAPIError: If a single item, or the batch as a whole, is rejected
+        """
+        body = {operation: [] for operation in self.OPERATIONS}
+        futures = {operation: [] for operation in self.OPERATIONS}
+        for operation, payload, future in items:
+            body[operation].append(payload)
+            futures[operation].append(future)
+        body = {operation: payloads for operation, payloads in body.items() if payloads}
+
+        # Only batches without creates or deletes can be replayed safely
+        response = self._make_request("POST", "/batch", body,
+                                      idempotent=not (body.get('posts') or body.get('deletes')))
+        self.batches_sent += 1
+
+        if response.status_code != 200:
+            if len(items) > 1 and 400 <= response.status_code < 500 and response.status_code not in (401, 403, 429):
+                logger.warning("Batch of %d changes rejected (HTTP %d); resending it in halves to isolate the "
+                               "rejected changes", len(items), response.status_code, extra={"count": len(items)})
+                middle = len(items) // 2
+                self._send(items[:middle])
+                self._send(items[middle:])
+                return
+            self._log_error("applying batch", response)
+            raise CloudflareAPIError(f"applying batch of {len(items)} changes", response)
+
+        result = response.json().get('result') or {}
+        for operation in self.OPERATIONS:
+            applied = result.get(operation) or []
+            for index, future in enumerate(futures[operation]):
+                record = applied[index] if index < len(applied) else {}
+                self._update_cache(operation, record, body[operation][index])
+                future.set_result(record)
+
+        self._log_success("applied batch", f"{len(items)} changes")
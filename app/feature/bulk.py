@@ -0,0 +1,204 @@
+"""
+Bulk Execution Module
+Runs a per-record action over many records on a bounded worker pool
+"""
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+from config import BULK_WORKERS
+from app.log.logger import logger, sampled_logging
+
+
+class BulkResult:
+    """Per-record outcome of a bulk run"""
+
+    def __init__(self, total=0):
+        self.total = total
+        self.succeeded = []
+        self.failed = []
+        self.skipped = []
+        self.elapsed = 0.0
+
+    @property
+    def processed(self):
+        """Number of records that have an outcome"""
+        return len(self.succeeded) + len(self.failed) + len(self.skipped)
+
+    @property
+    def throughput(self):
+        """Processed records per second"""
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        """
+        Summarize the run
+
+        Returns:
+            dict: Counts of succeeded, failed and skipped records plus timing
+        """
+        return {
+            "total": self.total,
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "skipped": len(self.skipped),
+            "elapsed": self.elapsed,
+            "throughput": self.throughput
+        }
+
+
+class BulkExecutor:
+    """Execute an action for every item with bounded concurrency and live progress"""
+
+    def __init__(self, workers=None, progress=None, progress_interval=0.5):
+        """
+        Args:
+            workers (int): Concurrent actions (default: BULK_WORKERS)
+            progress (callable): Called as progress(done, total, rate, eta) while running (optional)
+            progress_interval (float): Minimum seconds between progress callbacks
+        """
+        self.workers = max(1, workers or BULK_WORKERS)
+        self.progress = progress
+        self.progress_interval = progress_interval
+
+    @sampled_logging()
+    def run(self, items, action, describe=None, should_skip=None):
+        """
+        Run an action for every item
+
+        Repeated log messages are sampled while the run lasts (see sampled_logging).
+
+        Args:
+            items (list): Items to process, usually DNS record dicts
+            action (callable): action(item) returning True on success; exceptions count as failures
+            describe (callable): describe(item) returning a label for the result summary (optional)
+            should_skip (callable): should_skip(item) returning a skip reason or None (optional)
+
+        Returns:
+            BulkResult: Succeeded, failed and skipped items as (label, reason) tuples
+        """
+        items = list(items)
+        describe = describe or self._describe
+        result = BulkResult(len(items))
+        started = time.perf_counter()
+        last_report = 0.0
+
+        def execute(item):
+            if should_skip:
+                reason = should_skip(item)
+                if reason:
+                    return "skipped", reason
+            try:
+                if action(item):
+                    return "succeeded", None
+                return "failed", "API request failed"
+            except Exception as e:
+                return "failed", str(e)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            iterator = iter(items)
+            exhausted = False
+            pending = {}
+
+            while True:
+                # Keep a bounded number of actions queued so huge runs stay light
+                while not exhausted and len(pending) < self.workers * 2:
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[executor.submit(execute, item)] = item
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    outcome, reason = future.result()
+                    getattr(result, outcome).append((describe(item), reason))
+
+                last_report = self._update_progress(result, started, last_report)
+
+        return self._finish(result, started)
+
+    @sampled_logging()
+    def run_batched(self, items, enqueue, writer, describe=None, should_skip=None):
+        """
+        Queue a batched write for every item and collect per-record outcomes
+
+        Repeated log messages are sampled while the run lasts (see sampled_logging).
+
+        Args:
+            items (list): Items to process, usually DNS record dicts
+            enqueue (callable): enqueue(item) queuing a write on the writer and returning its Future
+            writer (BatchWriter): Batch writer the futures belong to; flushed once everything is queued
+            describe (callable): describe(item) returning a label for the result summary (optional)
+            should_skip (callable): should_skip(item) returning a skip reason or None (optional)
+
+        Returns:
+            BulkResult: Succeeded, failed and skipped items as (label, reason) tuples
+        """
+        items = list(items)
+        describe = describe or self._describe
+        result = BulkResult(len(items))
+        started = time.perf_counter()
+        last_report = 0.0
+        futures = {}
+
+        for item in items:
+            reason = should_skip(item) if should_skip else None
+            if reason:
+                result.skipped.append((describe(item), reason))
+                continue
+            try:
+                futures[enqueue(item)] = item
+            except Exception as e:
+                result.failed.append((describe(item), str(e)))
+        writer.flush(wait=False)
+
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is None:
+                result.succeeded.append((describe(futures[future]), None))
+            else:
+                result.failed.append((describe(futures[future]), str(error)))
+            last_report = self._update_progress(result, started, last_report)
+
+        return self._finish(result, started)
+
+    def _update_progress(self, result, started, last_report):
+        """Refresh elapsed time and report progress if the interval has passed"""
+        result.elapsed = time.perf_counter() - started
+        if self.progress and (result.elapsed - last_report >= self.progress_interval
+                              or result.processed == result.total):
+            self._report(result)
+            return result.elapsed
+        return last_report
+
+    def _finish(self, result, started):
+        """Stamp the final elapsed time and log the outcome"""
+        result.elapsed = time.perf_counter() - started
+        summary = result.summary()
+        logger.info("Bulk run finished: %d succeeded, %d failed, %d skipped in %.2fs", summary['succeeded'],
+                    summary['failed'], summary['skipped'], summary['elapsed'], extra={"count": summary['total']})
+        return result
+
+    @staticmethod
+    def _describe(item):
+        """Default label for an item: record name, then ID"""
+        if isinstance(item, Mapping):
+            return item.get('name') or item.get('id')
+        return str(item)
+
+    def _report(self, result):
+        """Send a progress update with throughput and ETA"""
+        rate = result.throughput
+        remaining = result.total - result.processed
+        eta = remaining / rate if rate else None
+        self.progress(result.processed, result.total, rate, eta)
+
+
+# Create instance for easy importing
+bulk_executor = BulkExecutor()
@@ -0,0 +1,350 @@
+"""
+Zone Cache Module
+Keeps recently listed DNS records in memory, shared by all API clients
+"""
+import threading
+import time
+
+from config import CACHE_TTL
+from app.log.logger import logger
+from .snapshots import snapshot_store
+from .zone_snapshot import ZoneSnapshot
+
+
+class _ZoneEntry:
+    """Cached snapshot of a single zone"""
+
+    def __init__(self, records=()):
+        self.snapshot = ZoneSnapshot(records)
+        self.stored_at = {}
+        self.loaded_at = None
+        self.synced_at = None
+        self.full_synced_at = None
+        self.watermark = None
+
+
+class ZoneCache:
+    """
+    In-process cache of DNS records keyed by zone ID
+
+    A zone is "fresh" for ``ttl`` seconds after a full listing; single
+    records fetched or written since then stay fresh for ``ttl`` seconds
+    on their own. Writes made through the feature services update the
+    cache in place so it never lags behind our own changes.
+
+    With a snapshot store, complete listings and our writes are also
+    persisted, and the last listing of a zone stays available as a
+    stale copy after a restart or while the API is unreachable.
+    """
+
+    def __init__(self, ttl=CACHE_TTL, store=None):
+        """
+        Args:
+            ttl (float): Seconds cached records stay fresh (0 disables caching)
+            store (SnapshotStore): Persistent copy of complete listings (optional)
+        """
+        self.ttl = ttl
+        self.snapshot_store = store if store is not None and store.enabled else None
+        self._zones = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    @property
+    def enabled(self):
+        """Whether records are cached at all"""
+        return self.ttl > 0
+
+    def is_fresh(self, zone_id):
+        """Check whether the zone has a full listing younger than the TTL"""
+        with self._lock:
+            entry = self._zones.get(zone_id)
+            return bool(entry and entry.loaded_at is not None
+                        and time.monotonic() - entry.loaded_at < self.ttl)
+
+    def get_records(self, zone_id, record_type=None):
+        """
+        Get every cached record of a fresh zone
+
+        Args:
+            zone_id (str): Zone ID
+            record_type (str): Only return records of this type (optional)
+
+        Returns:
+            list: Cached records, or None if the zone is not fresh
+        """
+        with self._lock:
+            if not self.is_fresh(zone_id):
+                self.misses += 1
+                return None
+            self.hits += 1
+            snapshot = self._zones[zone_id].snapshot
+            if record_type:
+                return snapshot.find_by_type(record_type)
+            return list(snapshot)
+
+    def get_snapshot(self, zone_id):
+        """
+        Get the indexed snapshot of a fresh zone
+
+        Returns:
+            ZoneSnapshot: Live snapshot (kept current by write-through), or None if not fresh
+        """
+        with self._lock:
+            if not self.is_fresh(zone_id):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._zones[zone_id].snapshot
+
+    def get_record(self, zone_id, record_id):
+        """
+        Get a single cached record by ID
+
+        Returns:
+            dict: Cached record, or None on a miss
+        """
+        with self._lock:
+            entry = self._zones.get(zone_id)
+            record = entry.snapshot.get(record_id) if entry else None
+            if record is not None and (self.is_fresh(zone_id) or time.monotonic()
+                                       - entry.stored_at.get(record_id, float('-inf')) < self.ttl):
+                self.hits += 1
+                return record
+            self.misses += 1
+            return None
+
+    def find_by_name(self, zone_id, name):
+        """
+        Find cached records by name
+
+        Only a fresh full listing can prove that a name has no records, so
+        this answers from the cache only while the zone is fresh.
+
+        Returns:
+            list: Matching records (possibly empty), or None on a miss
+        """
+        with self._lock:
+            if not self.is_fresh(zone_id):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._zones[zone_id].snapshot.find_by_name(name)
+
+    def get_stale_records(self, zone_id, record_type=None):
+        """
+        Get the last complete listing of a zone, however old
+
+        Falls back to the snapshot store when the zone is not in memory.
+
+        Args:
+            zone_id (str): Zone ID
+            record_type (str): Only return records of this type (optional)
+
+        Returns:
+            list: Records of the last listing, or None if the zone was never listed
+        """
+        with self._lock:
+            entry = self._complete_entry(zone_id)
+            if entry is None:
+                return None
+            if record_type:
+                return entry.snapshot.find_by_type(record_type)
+            return list(entry.snapshot)
+
+    def find_stale_by_name(self, zone_id, name):
+        """
+        Find records by name in the last complete listing, however old
+
+        Returns:
+            list: Matching records (possibly empty), or None if the zone was never listed
+        """
+        with self._lock:
+            entry = self._zones.get(zone_id)
+            if entry is not None and entry.synced_at is not None:
+                return entry.snapshot.find_by_name(name)
+        if self.snapshot_store is None:
+            return None
+        try:
+            if self.snapshot_store.synced_at(zone_id) is None:
+                return None
+            return self.snapshot_store.find(zone_id, name=name)
+        except Exception as e:
+            logger.warning("Snapshot store lookup failed: %s", e)
+            return None
+
+    def snapshot_age(self, zone_id):
+        """
+        Seconds since the zone's last complete listing
+
+        Returns:
+            float: Age in seconds, or None if the zone was never listed
+        """
+        with self._lock:
+            entry = self._zones.get(zone_id)
+            synced_at = entry.synced_at if entry else None
+        if synced_at is None and self.snapshot_store is not None:
+            try:
+                synced_at = self.snapshot_store.synced_at(zone_id)
+            except Exception as e:
+                logger.warning("Snapshot store lookup failed: %s", e)
+        return None if synced_at is None else max(time.time() - synced_at, 0.0)
+
+    def _complete_entry(self, zone_id):
+        """In-memory entry holding a complete listing, loading it from the store if needed"""
+        entry = self._zones.get(zone_id)
+        if entry is not None and entry.synced_at is not None:
+            return entry
+        if self.snapshot_store is None:
+            return None
+        try:
+            records = self.snapshot_store.load_zone(zone_id)
+            state = self.snapshot_store.sync_state(zone_id)
+        except Exception as e:
+            logger.warning("Snapshot store load failed: %s", e)
+            return None
+        if records is None or state is None:
+            return None
+        entry = _ZoneEntry(records)
+        entry.synced_at, entry.full_synced_at, entry.watermark = state
+        self._zones[zone_id] = entry
+        return entry
+
+    def sync_state(self, zone_id):
+        """
+        Incremental sync bookkeeping for a zone
+
+        Returns:
+            tuple: (time of the last full listing, newest modified_on seen),
+                or None if the zone has no complete listing
+        """
+        with self._lock:
+            entry = self._complete_entry(zone_id)
+            if entry is None:
+                return None
+            return entry.full_synced_at, entry.watermark
+
+    def apply_changes(self, zone_id, records, watermark):
+        """
+        Merge records changed since the last sync into a complete listing
+
+        The zone counts as freshly listed afterwards. Deleted records are
+        not visible to an incremental sync; a periodic full listing
+        removes them.
+
+        Args:
+            zone_id (str): Zone ID
+            records (list): Records modified since the previous watermark
+            watermark (str): Newest modified_on seen so far
+
+        Returns:
+            bool: False if the zone has no complete listing to merge into
+        """
+        if not self.enabled:
+            return False
+        with self._lock:
+            entry = self._complete_entry(zone_id)
+            if entry is None:
+                return False
+            now = time.monotonic()
+            for record in records:
+                entry.snapshot.add(record)
+                entry.stored_at[record['id']] = now
+            entry.loaded_at = now
+            entry.synced_at = time.time()
+            entry.watermark = watermark
+            self.refreshes += 1
+        self._persist("save_changes", zone_id, records, watermark)
+        return True
+
+    def _persist(self, operation, *args):
+        """Apply a change to the snapshot store without letting storage errors escape"""
+        if self.snapshot_store is None:
+            return
+        try:
+            getattr(self.snapshot_store, operation)(*args)
+        except ValueError as e:
+            logger.error("Snapshot not saved (%s): %s", operation, e)
+        except Exception as e:
+            logger.warning("Snapshot store %s failed: %s", operation, e)
+
+    def replace_all(self, zone_id, records):
+        """Replace a zone's records with a complete, just-listed set"""
+        if not self.enabled:
+            return
+        with self._lock:
+            now = time.monotonic()
+            entry = _ZoneEntry(records)
+            entry.stored_at = dict.fromkeys(entry.snapshot.records, now)
+            entry.loaded_at = now
+            entry.synced_at = entry.full_synced_at = time.time()
+            entry.watermark = max((r.get('modified_on') for r in entry.snapshot if r.get('modified_on')),
+                                  default=None)
+            self._zones[zone_id] = entry
+            self.refreshes += 1
+        self._persist("save_zone", zone_id, list(entry.snapshot), entry.watermark)
+
+    def store(self, zone_id, record):
+        """Insert or update one record after it was fetched or written"""
+        if not self.enabled or not record or not record.get('id'):
+            return
+        with self._lock:
+            entry = self._zones.setdefault(zone_id, _ZoneEntry())
+            entry.snapshot.add(record)
+            entry.stored_at[record['id']] = time.monotonic()
+        self._persist("upsert", zone_id, record)
+
+    def store_many(self, zone_id, records):
+        """Insert or update the records of a lookup, saved in one snapshot transaction"""
+        records = [record for record in records if record and record.get('id')]
+        if not self.enabled or not records:
+            return
+        with self._lock:
+            entry = self._zones.setdefault(zone_id, _ZoneEntry())
+            now = time.monotonic()
+            for record in records:
+                entry.snapshot.add(record)
+                entry.stored_at[record['id']] = now
+        self._persist("upsert_many", zone_id, records)
+
+    def remove(self, zone_id, record_id):
+        """Drop a record after it was deleted"""
+        with self._lock:
+            entry = self._zones.get(zone_id)
+            if entry:
+                entry.snapshot.remove(record_id)
+                entry.stored_at.pop(record_id, None)
+        self._persist("delete", zone_id, record_id)
+
+    def invalidate(self, zone_id=None):
+        """Forget one zone, or every zone when no ID is given, including its saved snapshot"""
+        with self._lock:
+            if zone_id is None:
+                self._zones.clear()
+            else:
+                self._zones.pop(zone_id, None)
+        self._persist("drop_zone", zone_id)
+
+    def stats(self):
+        """
+        Report cache effectiveness
+
+        Returns:
+            dict: Hit, miss and refresh counters plus cached zone/record counts
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "zones": len(self._zones),
+                "records": sum(len(entry.snapshot) for entry in self._zones.values()),
+                "persistent": self.snapshot_store is not None
+            }
+
+
+# Create instance for easy importing
+zone_cache = ZoneCache(store=snapshot_store)
@@ -0,0 +1,125 @@
+"""
+Multi-Zone Module
+Runs record queries across many zones concurrently
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from config import ZONE_FANOUT_WORKERS
+from app.log.logger import logger
+from .query_record import QueryRecord
+from .zones import zone_directory
+from .zone_snapshot import normalize_name
+
+
+class MultiZone:
+    """
+    Fan queries out over many zones
+
+    Zones are queried on a bounded thread pool; every per-zone client
+    shares the session pool, rate limiter, retry policy, circuit breaker
+    and record cache, so fanning out never exceeds the account's request
+    budget.
+    """
+
+    def __init__(self, directory=None, workers=None):
+        """
+        Args:
+            directory (ZoneDirectory): Zone name resolution (default: the shared zone_directory)
+            workers (int): Zones queried at once (default: ZONE_FANOUT_WORKERS)
+        """
+        self.directory = directory or zone_directory
+        self.workers = max(1, workers or ZONE_FANOUT_WORKERS)
+
+    def query_service(self, zone_id):
+        """Query service bound to one zone"""
+        return QueryRecord(zone_id=zone_id)
+
+    def map(self, action, zones=None):
+        """
+        Run an action against every selected zone
+
+        Args:
+            action (callable): action(zone_name, query_service) returning the zone's result
+            zones (list): Zone names or IDs (default: every visible zone)
+
+        Returns:
+            tuple: ({zone name: result}, {zone name: error message})
+        """
+        selected = self.directory.select(zones)
+        results, errors = {}, {}
+
+        def execute(zone):
+            name, zone_id = zone
+            try:
+                return name, action(name, self.query_service(zone_id)), None
+            except Exception as e:
+                return name, None, str(e)
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(len(selected), 1))) as executor:
+            for name, result, error in executor.map(execute, selected):
+                if error is None:
+                    results[name] = result
+                else:
+                    errors[name] = error
+
+        if errors:
+            logger.warning("%d of %d zones failed: %s", len(errors), len(selected), ', '.join(sorted(errors)))
+        return results, errors
+
+    def find_records(self, record_name, record_type=None, zones=None):
+        """
+        Find a record name in every zone
+
+        A fully qualified name is only looked up in the zones it belongs
+        to; a bare label such as ``www`` is looked up as ``www.<zone>`` in
+        every zone.
+
+        Args:
+            record_name (str): FQDN or label to look for
+            record_type (str): Only return records of this type (optional)
+            zones (list): Zone names or IDs (default: every visible zone)
+
+        Returns:
+            tuple: ({zone name: matching records}, {zone name: error message}); zones without
+                matches are left out
+        """
+        name = normalize_name(record_name)
+        selected = zones
+        if not zones:
+            owners = [zone['name'] for zone in self.directory.list_zones()
+                      if name == normalize_name(zone['name']) or name.endswith('.' + normalize_name(zone['name']))]
+            selected = owners or None
+
+        def find(zone_name, service):
+            zone = normalize_name(zone_name)
+            fqdn = name if name == zone or name.endswith('.' + zone) else f"{name}.{zone}"
+            return [record for record in service.fetch_records_by_name(fqdn)
+                    if not record_type or record.get('type') == record_type]
+
+        results, errors = self.map(find, selected)
+        return {zone: records for zone, records in results.items() if records}, errors
+
+    def zone_stats(self, zones=None):
+        """
+        Count records per zone
+
+        Args:
+            zones (list): Zone names or IDs (default: every visible zone)
+
+        Returns:
+            tuple: ({zone name: {"total", "proxied", "types"}}, {zone name: error message})
+        """
+        def count(zone_name, service):
+            stats = {"total": 0, "proxied": 0, "types": {}}
+            # Zones are already fetched in parallel, so list each one sequentially
+            for record in service.iter_records(workers=1):
+                stats["total"] += 1
+                stats["proxied"] += bool(record.get('proxied'))
+                stats["types"][record.get('type')] = stats["types"].get(record.get('type'), 0) + 1
+            return stats
+
+        return self.map(count, zones)
+
+
+# Create instance for easy importing
+multi_zone = MultiZone()
@@ -3,6 +3,7 @@ DNS Record Deletion Module
 Handles deleting DNS records from Cloudflare
 """
 from .base_api import CloudflareAPIClient
+from app.log.logger import logger
 
 
 class DeleteRecord(CloudflareAPIClient):
@@ -22,29 +23,31 @@ class DeleteRecord(CloudflareAPIClient):
             response = self._make_request("DELETE", f"/{subdomain_id}")
             
             if response.status_code == 200:
-                self._log_success("deleted subdomain", f"ID: {subdomain_id}")
+                self.cache.remove(self.zone_id, subdomain_id)
+                self._log_success("deleted subdomain", "ID: %s", subdomain_id, record_id=subdomain_id)
                 return True
             else:
-                self._log_error("deleting subdomain", response)
+                self._log_error("deleting subdomain", response, record_id=subdomain_id)
                 return False
                 
         except Exception as e:
-            self._log_error("deleting subdomain", error=e)
+            self._log_error("deleting subdomain", error=e, record_id=subdomain_id)
             return False
     
-    def delete_record_by_name(self, record_name):
+    def delete_record_by_name(self, record_name, record_type=None):
         """
         Delete a DNS record by its name (requires fetching ID first)
         
         Args:
             record_name (str): The DNS record name to delete
+            record_type (str): Only consider records of this type (optional)
             
         Returns:
             bool: True if successful, False otherwise
         """
         try:
             # First, get the record ID by name
-            record_id = self._get_record_id_by_name(record_name)
+            record_id = self._get_record_id_by_name(record_name, record_type)
             
             if not record_id:
                 self._log_error("deleting record", error=f"Record '{record_name}' not found")
@@ -56,25 +59,40 @@ class DeleteRecord(CloudflareAPIClient):
             self._log_error("deleting record by name", error=e)
             return False
     
-    def _get_record_id_by_name(self, record_name):
+    def _get_record_id_by_name(self, record_name, record_type=None):
         """
         Get DNS record ID by name
         
+        Uses the zone snapshot index while the cache is fresh. If the name
+        holds several records, the first is used and a warning is logged.
+        
         Args:
             record_name (str): The DNS record name
+            record_type (str): Only consider records of this type (optional)
             
         Returns:
             str: Record ID if found, None otherwise
         """
         try:
-            response = self._make_request("GET", f"?name={record_name}")
+            records = self.cache.find_by_name(self.zone_id, record_name)
             
-            if response.status_code == 200:
+            if records is None:
+                params = {"name": record_name}
+                if record_type:
+                    params["type"] = record_type
+                response = self._make_request("GET", "", params=params)
+                
+                if response.status_code != 200:
+                    return None
                 records = response.json().get('result', [])
-                if records:
-                    return records[0]['id']
             
-            return None
+            if record_type:
+                records = [r for r in records if r.get('type') == record_type]
+            
+            if len(records) > 1:
+                logger.warning("Name '%s' has %d records; using ID %s", record_name, len(records), records[0]['id'])
+            
+            return records[0]['id'] if records else None
             
         except Exception as e:
             self._log_error("fetching record ID", error=e)
@@ -0,0 +1,112 @@
+"""
+DNS Record Module
+Compact in-memory representation of Cloudflare DNS records
+"""
+import json
+import sys
+from collections.abc import Mapping
+
+# Fields read on every listing, search and statistic; each gets its own slot
+SLOT_FIELDS = ('id', 'zone_id', 'zone_name', 'name', 'type', 'content', 'proxied', 'proxiable', 'ttl',
+               'priority', 'comment', 'tags', 'modified_on')
+
+# Values shared by many records, stored once per process
+INTERNED_FIELDS = frozenset(('zone_id', 'zone_name', 'type'))
+
+_SLOTS = frozenset(SLOT_FIELDS)
+_EMPTY = {}
+_set = object.__setattr__
+# json.dumps builds a new encoder per call when given options; reuse one
+_encode = json.JSONEncoder(separators=(',', ':')).encode
+
+
+class DNSRecord(Mapping):
+    """
+    Read-only DNS record that behaves like the API's record dict
+
+    The common fields live in ``__slots__`` and can be read as attributes
+    (``record.name``, ``record.ttl``). Everything else the API returns
+    (meta, settings, created_on, SRV data, ...) is kept as a compact JSON
+    string and only decoded when one of those keys is read. Type and zone
+    strings are interned, so 100k records share a handful of copies.
+
+    Records support the read-only dict interface (``record['id']``,
+    ``record.get('comment')``, ``dict(record)``, ``json.dumps(dict(record))``).
+    Null fields are dropped, so a record compares equal to the dict it was
+    built from minus its null entries.
+    """
+
+    __slots__ = SLOT_FIELDS + ('_extra',)
+
+    def __init__(self, data=(), **fields):
+        """
+        Args:
+            data (Mapping): Record fields as returned by the API
+            **fields: Additional or overriding fields
+        """
+        if fields or not isinstance(data, dict):
+            data = dict(data, **fields)
+        get = data.get
+        for key in SLOT_FIELDS:
+            _set(self, key, get(key))
+        for key in INTERNED_FIELDS:
+            value = get(key)
+            if type(value) is str:
+                _set(self, key, sys.intern(value))
+
+        extra = {key: value for key, value in data.items() if key not in _SLOTS and value is not None}
+        _set(self, '_extra', _encode(extra) if extra else None)
+
+    @classmethod
+    def wrap(cls, record):
+        """Return a DNSRecord for a record dict, or the record itself if it already is one"""
+        if record is None or isinstance(record, cls):
+            return record
+        return cls(record)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DNSRecord is read-only; build a new one with DNSRecord(record, field=value)")
+
+    def _extras(self):
+        """Rarely used fields, decoded on first access"""
+        extra = self._extra
+        if extra is None:
+            return _EMPTY
+        if isinstance(extra, str):
+            extra = json.loads(extra)
+            _set(self, '_extra', extra)
+        return extra
+
+    def __getitem__(self, key):
+        if key in _SLOTS:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        return self._extras()[key]
+
+    def get(self, key, default=None):
+        if key in _SLOTS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self._extras().get(key, default)
+
+    def __contains__(self, key):
+        if key in _SLOTS:
+            return getattr(self, key) is not None
+        return key in self._extras()
+
+    def __iter__(self):
+        for key in SLOT_FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+        yield from self._extras()
+
+    def __len__(self):
+        return sum(1 for key in SLOT_FIELDS if getattr(self, key) is not None) + len(self._extras())
+
+    def __repr__(self):
+        return f"DNSRecord({dict(self)!r})"
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
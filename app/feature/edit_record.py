@@ -5,8 +5,35 @@ Handles editing existing DNS records in Cloudflare
 from .base_api import CloudflareAPIClient
 
 
+def changed_fields(record, changes):
+    """
+    Keep only the changes that differ from a record's current values
+
+    Args:
+        record (dict): Current record, or None when unknown
+        changes (dict): Fields to set
+
+    Returns:
+        dict: Fields whose value would change (all of them when the record is unknown)
+    """
+    if record is None:
+        return dict(changes)
+    return {field: value for field, value in changes.items() if record.get(field) != value}
+
+
 class EditRecord(CloudflareAPIClient):
-    """Handle DNS record editing operations"""
+    """
+    Handle DNS record editing operations
+    
+    Changes are sent as PATCH requests carrying only the fields that
+    differ from the record's known state. When the zone cache holds a
+    fresh copy of the record that already has the requested values, no
+    request is sent at all.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writes_skipped = 0
     
     def edit_subdomain(self, subdomain_id, new_ip_address, ttl=3600, proxied=False):
         """
@@ -27,20 +54,8 @@ class EditRecord(CloudflareAPIClient):
             "ttl": ttl,
             "proxied": proxied
         }
-
-        try:
-            response = self._make_request("PUT", f"/{subdomain_id}", data)
-            
-            if response.status_code == 200:
-                self._log_success("edited subdomain", f"ID: {subdomain_id} with new IP: {new_ip_address}")
-                return True
-            else:
-                self._log_error("editing subdomain", response)
-                return False
-                
-        except Exception as e:
-            self._log_error("editing subdomain", error=e)
-            return False
+        return self._patch(subdomain_id, data, "editing subdomain", "edited subdomain",
+                           "ID: %s with new IP: %s", subdomain_id, new_ip_address)
 
     def toggle_proxy(self, subdomain_id, proxied):
         """
@@ -53,24 +68,9 @@ class EditRecord(CloudflareAPIClient):
         Returns:
             bool: True if successful, False otherwise
         """
-        data = {
-            "proxied": proxied
-        }
-        
-        try:
-            response = self._make_request("PUT", f"/{subdomain_id}", data)
-            
-            if response.status_code == 200:
-                status = "enabled" if proxied else "disabled"
-                self._log_success(f"proxy {status}", f"subdomain ID: {subdomain_id}")
-                return True
-            else:
-                self._log_error("toggling proxy", response)
-                return False
-                
-        except Exception as e:
-            self._log_error("toggling proxy", error=e)
-            return False
+        status = "enabled" if proxied else "disabled"
+        return self._patch(subdomain_id, {"proxied": proxied}, "toggling proxy", f"proxy {status}",
+                           "subdomain ID: %s", subdomain_id)
     
     def update_record_ttl(self, subdomain_id, new_ttl):
         """
@@ -83,23 +83,8 @@ class EditRecord(CloudflareAPIClient):
         Returns:
             bool: True if successful, False otherwise
         """
-        data = {
-            "ttl": new_ttl
-        }
-        
-        try:
-            response = self._make_request("PUT", f"/{subdomain_id}", data)
-            
-            if response.status_code == 200:
-                self._log_success("updated TTL", f"subdomain ID: {subdomain_id} to {new_ttl} seconds")
-                return True
-            else:
-                self._log_error("updating TTL", response)
-                return False
-                
-        except Exception as e:
-            self._log_error("updating TTL", error=e)
-            return False
+        return self._patch(subdomain_id, {"ttl": new_ttl}, "updating TTL", "updated TTL",
+                           "subdomain ID: %s to %s seconds", subdomain_id, new_ttl)
     
     def edit_cname_record(self, record_id, new_target, ttl=3600, proxied=False):
         """
@@ -120,21 +105,46 @@ class EditRecord(CloudflareAPIClient):
             "ttl": ttl,
             "proxied": proxied
         }
-
+        return self._patch(record_id, data, "editing CNAME record", "edited CNAME record",
+                           "ID: %s with new target: %s", record_id, new_target)
+    
+    def _patch(self, record_id, changes, operation, success_operation, details, *args):
+        """
+        Send the fields of a change that differ from the cached record
+        
+        Args:
+            record_id (str): The DNS record ID
+            changes (dict): Fields to set
+            operation (str): Operation name for error logs
+            success_operation (str): Operation name for success logs
+            details (str): %-format string for the success log, filled from ``args``
+            
+        Returns:
+            bool: True if the record has the requested values, False otherwise
+        """
+        payload = changed_fields(self.cache.get_record(self.zone_id, record_id), changes)
+        if not payload:
+            self.writes_skipped += 1
+            self._log_success(success_operation, details + " (already up to date, no request sent)", *args,
+                              record_id=record_id)
+            return True
+        
         try:
-            response = self._make_request("PUT", f"/{record_id}", data)
+            # Setting fields to fixed values can be replayed safely
+            response = self._make_request("PATCH", f"/{record_id}", payload, idempotent=True)
             
             if response.status_code == 200:
-                self._log_success("edited CNAME record", f"ID: {record_id} with new target: {new_target}")
+                self.cache.store(self.zone_id, response.json().get('result'))
+                self._log_success(success_operation, details, *args, record_id=record_id)
                 return True
             else:
-                self._log_error("editing CNAME record", response)
+                self._log_error(operation, response, record_id=record_id)
                 return False
                 
         except Exception as e:
-            self._log_error("editing CNAME record", error=e)
+            self._log_error(operation, error=e, record_id=record_id)
             return False
 
 
 # Create instance for easy importing
-edit_record_service = EditRecord()
\ No newline at end of file
+edit_record_service = EditRecord()
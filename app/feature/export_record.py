@@ -0,0 +1,233 @@
+"""
+DNS Record Export Module
+Streams the zone to BIND, JSONL or CSV files
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+
+from config import ZONE_FILE_TIMEOUT
+from .base_api import CloudflareAPIError
+from .query_record import QueryRecord
+from .zone_file import write_zone_file
+
+# Formats understood by export() and the file extensions that select them
+EXPORT_FORMATS = {".zone": "zone", ".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+
+# Columns written to CSV when no field projection is given
+DEFAULT_CSV_FIELDS = ("id", "type", "name", "content", "ttl", "proxied", "priority", "comment")
+
+# Write buffer for export files; records go out in large sequential writes
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def guess_format(path):
+    """
+    Pick an export format from a file name, ignoring a trailing .gz
+
+    Returns:
+        str: "zone", "jsonl" or "csv" (default: "zone")
+    """
+    base = path[:-3] if path.endswith('.gz') else path
+    return EXPORT_FORMATS.get(os.path.splitext(base)[1].lower(), "zone")
+
+
+def _file_mode(path):
+    """Mode of the file being replaced, or the umask default for a new file"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_writer(path, compress=False):
+    """
+    Open a text file that only replaces ``path`` once writing succeeded
+
+    Data goes to a temporary file in the same directory, which is renamed
+    over ``path`` on success and removed on failure, so readers never see
+    a half-written export.
+
+    Args:
+        path (str): Final file path
+        compress (bool): Gzip the file (default: False)
+
+    Yields:
+        file: Text file open for writing
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with open(fd, 'wb', buffering=WRITE_BUFFER_SIZE) as raw:
+            binary = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6) if compress else raw
+            with io.TextIOWrapper(binary, encoding='utf-8', newline='', write_through=False) as f:
+                yield f
+        # mkstemp creates the file 0600; give it the mode a plain open() would have
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _project(record, fields):
+    """Keep only the requested fields of a record"""
+    return {field: record.get(field) for field in fields}
+
+
+def write_jsonl(records, f, fields=None):
+    """
+    Stream records as one JSON object per line
+
+    Args:
+        records (iterable): Cloudflare record dicts
+        f: Text file opened for writing
+        fields (list): Fields to keep (default: all)
+
+    Returns:
+        int: Number of records written
+    """
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    count = 0
+    for record in records:
+        f.write(encode(_project(record, fields) if fields else dict(record)))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def write_csv(records, f, fields=None):
+    """
+    Stream records as CSV with a header row
+
+    Lists and mappings (tags, meta, data) are written as JSON text.
+
+    Args:
+        records (iterable): Cloudflare record dicts
+        f: Text file opened for writing
+        fields (list): Columns to write (default: DEFAULT_CSV_FIELDS)
+
+    Returns:
+        int: Number of records written
+    """
+    fields = list(fields or DEFAULT_CSV_FIELDS)
+    writer = csv.writer(f)
+    writer.writerow(fields)
+    count = 0
+    for record in records:
+        row = []
+        for field in fields:
+            value = record.get(field)
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, separators=(',', ':'))
+            row.append("" if value is None else value)
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+class ExportRecord(QueryRecord):
+    """Handle zone exports"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timeout = self.deadline = max(self.timeout, ZONE_FILE_TIMEOUT)
+
+    def export(self, path, fmt=None, fields=None, compress=None, server_side=None):
+        """
+        Stream every record in the zone to a file
+
+        Records are written one by one as the paginated listing arrives (or
+        from the zone cache while it is fresh) and are not kept, so memory
+        stays flat whatever the zone size. The file is written under a
+        temporary name and renamed into place when complete.
+
+        Args:
+            path (str): File to write
+            fmt (str): "zone", "jsonl" or "csv" (default: from the file extension)
+            fields (list): Fields to keep for JSONL/CSV (optional)
+            compress (bool): Gzip the output (default: when path ends in .gz)
+            server_side (bool): For zone files, force (True) or avoid (False) the
+                /dns_records/export endpoint (default: server-side unless the cache is fresh)
+
+        Returns:
+            int: Number of records written, or -1 if the export failed
+        """
+        fmt = fmt or guess_format(path)
+        compress = path.endswith('.gz') if compress is None else compress
+
+        try:
+            if fmt not in ("zone", "jsonl", "csv"):
+                raise ValueError(f"Unsupported export format: {fmt}")
+            if fmt == "zone" and server_side is None:
+                server_side = not self.cache.is_fresh(self.zone_id)
+
+            with atomic_writer(path, compress) as f:
+                if fmt == "jsonl":
+                    count = write_jsonl(self.iter_records(), f, fields)
+                elif fmt == "csv":
+                    count = write_csv(self.iter_records(), f, fields)
+                elif server_side:
+                    count = self._export_server_side(f)
+                else:
+                    count = write_zone_file(self.iter_records(), f)
+
+            self._log_success("exported records", f"{count} records to {path} ({fmt})")
+            return count
+
+        except Exception as e:
+            self._log_error("exporting records", error=e)
+            return -1
+
+    def export_zone_file(self, path, server_side=None):
+        """
+        Export every record in the zone to a BIND zone file
+
+        While the zone cache is fresh the file is written from memory.
+        Otherwise Cloudflare's /dns_records/export endpoint renders the
+        whole zone in one call and its body is streamed straight to disk.
+
+        Args:
+            path (str): File to write
+            server_side (bool): Force (True) or avoid (False) the server-side export
+                (default: server-side unless the cache is fresh)
+
+        Returns:
+            int: Number of records written, or -1 if the export failed
+        """
+        return self.export(path, fmt="zone", server_side=server_side)
+
+    def _export_server_side(self, f):
+        """Stream the /export response body into an open file"""
+        response = self._make_request("GET", "/export", stream=True)
+        try:
+            if response.status_code != 200:
+                # The log record is formatted after close(), so read the short error body first
+                response.content
+                self._log_error("exporting zone file", response)
+                raise CloudflareAPIError("exporting zone file", response)
+
+            response.encoding = response.encoding or 'utf-8'
+            count = 0
+            for line in response.iter_lines(decode_unicode=True):
+                f.write(line)
+                f.write("\n")
+                stripped = line.strip()
+                if stripped and not stripped.startswith((';', '$')) and '\tSOA\t' not in line:
+                    count += 1
+            return count
+        finally:
+            response.close()
+
+
+# Create instance for easy importing
+export_record_service = ExportRecord()
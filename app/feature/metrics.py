@@ -0,0 +1,239 @@
+"""
+Request Metrics Module
+Counts, sizes and latency histograms of every Cloudflare API call
+"""
+import json
+import threading
+from bisect import bisect_left
+from collections import Counter
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Path segments after dns_records that name an endpoint rather than a record
+RECORD_SUBRESOURCES = {"batch", "import", "export", "scan"}
+
+
+def endpoint_label(path):
+    """
+    Collapse IDs in an API path so requests group by endpoint
+
+    Example:
+        /zones/023e.../dns_records/372e... -> /zones/{zone_id}/dns_records/{record_id}
+    """
+    parts = path.split('?', 1)[0].split('/')
+    for index in range(1, len(parts)):
+        if not parts[index]:
+            continue
+        if parts[index - 1] == "zones":
+            parts[index] = "{zone_id}"
+        elif parts[index - 1] == "dns_records" and parts[index] not in RECORD_SUBRESOURCES:
+            parts[index] = "{record_id}"
+    return '/'.join(parts)
+
+
+def _escape(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _EndpointStats:
+    """Counters for one (method, endpoint) pair"""
+
+    def __init__(self):
+        self.statuses = Counter()
+        self.retries = Counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+
+    @property
+    def requests(self):
+        return sum(self.statuses.values())
+
+    def quantile(self, q):
+        """Estimate a latency quantile from the histogram (bucket upper bound)"""
+        total = sum(self.buckets)
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else float('inf')
+        return float('inf')
+
+    def to_dict(self):
+        return {
+            "requests": self.requests,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items(), key=str)},
+            "retries": dict(self.retries),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency": {
+                "count": sum(self.buckets),
+                "sum": round(self.latency_sum, 6),
+                "buckets": {str(bound): count for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), self.buckets)},
+                "p50": self.quantile(0.5),
+                "p99": self.quantile(0.99),
+            },
+        }
+
+
+class RequestMetrics:
+    """
+    Thread-safe registry of API request metrics
+
+    Every HTTP attempt is recorded by method and endpoint (IDs collapsed,
+    see ``endpoint_label``): status code (or "error" when no answer came
+    back), bytes sent and received, and latency in a histogram with
+    Prometheus' default buckets. Retries are counted by reason. Metrics
+    can be rendered as Prometheus text, dumped as JSON, or summarized
+    for the requests made since an earlier snapshot.
+    """
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, method, path):
+        key = (method, endpoint_label(path))
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = _EndpointStats()
+        return stats
+
+    def observe(self, method, path, status, elapsed, bytes_sent=0, bytes_received=0):
+        """
+        Record one HTTP attempt
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path below the API base URL
+            status (int|str): Status code, or "error" if no response arrived
+            elapsed (float): Seconds the attempt took
+            bytes_sent (int): Request body size
+            bytes_received (int): Response body size
+        """
+        with self._lock:
+            stats = self._stats(method, path)
+            stats.statuses[status] += 1
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            stats.buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+            stats.latency_sum += elapsed
+
+    def retry(self, method, path, reason):
+        """
+        Record a retry
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path below the API base URL
+            reason (str): "throttled", "server_error" or "network_error"
+        """
+        with self._lock:
+            self._stats(method, path).retries[reason] += 1
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self):
+        """
+        Current metrics as plain data
+
+        Returns:
+            dict: {"METHOD endpoint": counters, statuses, retries, bytes and latency histogram}
+        """
+        with self._lock:
+            return {f"{method} {endpoint}": stats.to_dict()
+                    for (method, endpoint), stats in sorted(self._endpoints.items())}
+
+    def to_json(self, indent=2):
+        """Metrics as a JSON document"""
+        return json.dumps({"endpoints": self.snapshot()}, indent=indent)
+
+    def to_prometheus(self):
+        """Metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            items = sorted(self._endpoints.items())
+
+            def family(name, kind, help_text):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+            family("cloudflare_api_requests_total", "counter", "HTTP attempts by status code")
+            for (method, endpoint), stats in items:
+                for status, count in sorted(stats.statuses.items(), key=str):
+                    lines.append(f'cloudflare_api_requests_total{{method="{method}",endpoint="{_escape(endpoint)}",'
+                                 f'status="{status}"}} {count}')
+
+            family("cloudflare_api_retries_total", "counter", "Retried attempts by reason")
+            for (method, endpoint), stats in items:
+                for reason, count in sorted(stats.retries.items()):
+                    lines.append(f'cloudflare_api_retries_total{{method="{method}",endpoint="{_escape(endpoint)}",'
+                                 f'reason="{reason}"}} {count}')
+
+            for name, attribute, help_text in (
+                ("cloudflare_api_request_bytes_total", "bytes_sent", "Request body bytes sent"),
+                ("cloudflare_api_response_bytes_total", "bytes_received", "Response body bytes received"),
+            ):
+                family(name, "counter", help_text)
+                for (method, endpoint), stats in items:
+                    lines.append(f'{name}{{method="{method}",endpoint="{_escape(endpoint)}"}} '
+                                 f'{getattr(stats, attribute)}')
+
+            name = "cloudflare_api_request_duration_seconds"
+            family(name, "histogram", "Latency of HTTP attempts")
+            for (method, endpoint), stats in items:
+                labels = f'method="{method}",endpoint="{_escape(endpoint)}"'
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats.buckets):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{labels}}} {stats.latency_sum:.6f}')
+                lines.append(f'{name}_count{{{labels}}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write the metrics to a file: JSON for .json paths, Prometheus text otherwise"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json() if path.endswith('.json') else self.to_prometheus())
+
+    def summary(self, since=None):
+        """
+        Human-readable per-endpoint summary
+
+        Args:
+            since (dict): Earlier ``snapshot()``; only requests made after it are counted (optional)
+
+        Returns:
+            list: One line per endpoint with traffic, busiest first
+        """
+        since = since or {}
+        rows = []
+        for key, current in self.snapshot().items():
+            before = since.get(key)
+            requests = current["requests"] - (before["requests"] if before else 0)
+            if requests <= 0:
+                continue
+            retries = sum(current["retries"].values()) - (sum(before["retries"].values()) if before else 0)
+            latency_sum = current["latency"]["sum"] - (before["latency"]["sum"] if before else 0)
+            sent = current["bytes_sent"] - (before["bytes_sent"] if before else 0)
+            received = current["bytes_received"] - (before["bytes_received"] if before else 0)
+            failed = sum(count for status, count in current["statuses"].items() if not status.startswith('2'))
+            if before:
+                failed -= sum(count for status, count in before["statuses"].items() if not status.startswith('2'))
+            rows.append((requests, f"{key}: {requests} requests, {failed} failed, {retries} retries, "
+                                   f"avg {latency_sum / requests * 1000:.0f} ms, "
+                                   f"{sent / 1024:.1f} KiB out, {received / 1024:.1f} KiB in"))
+        return [line for _, line in sorted(rows, key=lambda row: -row[0])]
+
+
+# Create instance for easy importing
+request_metrics = RequestMetrics()
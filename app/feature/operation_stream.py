@@ -0,0 +1,303 @@
+"""
+Operation Stream Module
+Applies a stream of record operations, one JSON object per line, through the batch endpoint
+"""
+import json
+from collections import deque
+from concurrent.futures import Future
+
+from config import BATCH_MAX_SIZE
+from app.log.logger import sampled_logging
+from .batch_record import BatchWriter
+from .edit_record import changed_fields
+from .query_record import QueryRecord
+
+# Fields an operation may set on a record
+RECORD_FIELDS = ("type", "name", "content", "ttl", "proxied", "comment", "tags", "priority")
+
+# Operations and the fields each one requires
+OPERATIONS = {
+    "add": ("type", "name", "content"),
+    "edit": (),
+    "delete": (),
+    "toggle": (),
+    "ttl": ("ttl",),
+}
+
+
+class OperationError(ValueError):
+    """Raised for an operation that cannot be sent"""
+
+
+def parse_operations(lines):
+    """
+    Decode operation lines
+
+    Blank lines and lines starting with '#' are skipped.
+
+    Args:
+        lines (iterable): Lines of text, e.g. an open file or sys.stdin
+
+    Yields:
+        tuple: (line number, operation dict or OperationError)
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            operation = json.loads(line)
+        except ValueError as e:
+            yield number, OperationError(f"invalid JSON: {e}")
+            continue
+        if not isinstance(operation, dict):
+            yield number, OperationError("operation must be a JSON object")
+            continue
+        yield number, operation
+
+
+def validate_operation(operation):
+    """
+    Check an operation before it is queued
+
+    A batch is applied atomically, so a malformed change would fail every
+    change sent with it; anything the API would reject for its shape is
+    caught here instead.
+
+    Raises:
+        OperationError: If the operation is incomplete or malformed
+    """
+    op = operation.get('op')
+    if op not in OPERATIONS:
+        raise OperationError(f"unknown op {op!r} (expected one of: {', '.join(OPERATIONS)})")
+    missing = [field for field in OPERATIONS[op] if operation.get(field) in (None, "")]
+    if missing:
+        raise OperationError(f"{op} needs {', '.join(missing)}")
+    if op != "add" and not operation.get('id') and not operation.get('name'):
+        raise OperationError(f"{op} needs an id or a name")
+    ttl = operation.get('ttl')
+    if ttl is not None and (not isinstance(ttl, int) or isinstance(ttl, bool) or not (ttl == 1 or 60 <= ttl <= 86400)):
+        raise OperationError("ttl must be 1 (automatic) or 60-86400 seconds")
+    proxied = operation.get('proxied')
+    if proxied is not None and not isinstance(proxied, bool):
+        raise OperationError("proxied must be true or false")
+    if op == "edit" and not _changes(operation):
+        raise OperationError("edit changes nothing")
+
+
+def _changes(operation):
+    """Record fields an edit sets; name and type only change when the record is given by id"""
+    fields = RECORD_FIELDS if operation.get('id') else RECORD_FIELDS[2:]
+    return {field: operation[field] for field in fields if field in operation}
+
+
+class OperationRunner:
+    """
+    Apply add/edit/delete/toggle/ttl operations through a BatchWriter
+
+    Operations are validated and queued as they are read, so batches go
+    out while the input is still arriving; at most ``window`` operations
+    are in flight. Results come back in input order. Records can be given
+    by ``id`` or by ``name`` (plus ``type`` when the name is shared) and
+    are looked up in one zone listing, loaded on first need, so a line
+    naming a missing record fails alone instead of failing its batch.
+    Changes carry only the fields that differ from the record, and ones
+    that change nothing are answered without a request. An operation on
+    a record with an earlier change still in flight waits for that
+    change, since a batch applies deletes before patches.
+    """
+
+    def __init__(self, zone_id=None, window=None, max_batch_size=None, max_delay=None, **kwargs):
+        """
+        Args:
+            zone_id (str): Zone the operations apply to (default: ZONE_ID)
+            window (int): Operations in flight at once (default: four batches)
+            max_batch_size (int): Changes per batch call (default: BATCH_MAX_SIZE)
+            max_delay (float): Seconds to wait for more changes before sending a batch (optional)
+            **kwargs: Shared pool, cache, limiter, retry and breaker (see CloudflareAPIClient)
+        """
+        self.client_options = dict(kwargs, zone_id=zone_id)
+        self.max_batch_size = max_batch_size or BATCH_MAX_SIZE
+        self.max_delay = max_delay
+        self.window = window or self.max_batch_size * 4
+        self.query_service = QueryRecord(**self.client_options)
+        self._snapshot = None
+        self._latest = {}
+        self._created = {}
+        self._unchanged = set()
+
+    def run(self, operations):
+        """
+        Apply operations and yield their results
+
+        Args:
+            operations (iterable): (line number, operation) pairs from parse_operations,
+                or plain operation dicts
+
+        Yields:
+            dict: {"line", "op", "ok", "id", "name"} or {"line", "op", "ok": False, "error"} per operation
+        """
+        in_flight = deque()
+        with sampled_logging(), BatchWriter(max_batch_size=self.max_batch_size, max_delay=self.max_delay,
+                                            **self.client_options) as writer:
+            for line, operation in self._numbered(operations):
+                in_flight.append(self._submit(writer, line, operation))
+                while in_flight and (len(in_flight) > self.window or in_flight[0][2].done()):
+                    yield self._result(*in_flight.popleft())
+            writer.flush(wait=False)
+            while in_flight:
+                yield self._result(*in_flight.popleft())
+
+    @staticmethod
+    def _numbered(operations):
+        for number, item in enumerate(operations, 1):
+            yield item if isinstance(item, tuple) else (number, item)
+
+    def _submit(self, writer, line, operation):
+        """Queue one operation; returns (line, operation, future, target record ID)"""
+        if isinstance(operation, Exception):
+            return line, {}, _failed(operation), None
+        try:
+            validate_operation(operation)
+            return (line, operation) + self._enqueue(writer, operation)
+        except Exception as e:
+            return line, operation, _failed(e), None
+
+    def _enqueue(self, writer, operation):
+        op = operation['op']
+        if op == "add":
+            record = {field: operation[field] for field in RECORD_FIELDS if field in operation}
+            future = writer.post(record)
+            self._created.setdefault(_name_key(record['name']), []).append(future)
+            return future, None
+
+        record_id, current = self._resolve(writer, operation)
+        if op == "delete":
+            future = writer.delete(record_id)
+        else:
+            if op == "edit":
+                changes = _changes(operation)
+            elif op == "ttl":
+                changes = {"ttl": operation['ttl']}
+            else:
+                proxied = operation.get('proxied')
+                if proxied is None:
+                    if current is None:
+                        raise OperationError(f"record {record_id} not found")
+                    proxied = not current.get('proxied')
+                changes = {"proxied": proxied}
+            changes = changed_fields(current, changes)
+            if not changes:
+                # Nothing to change: answer from the known state without a request
+                future = Future()
+                future.set_result(current)
+                self._unchanged.add(future)
+                return future, None
+            future = writer.patch(record_id, changes)
+        self._latest[record_id] = (op, future)
+        return future, record_id
+
+    def _resolve(self, writer, operation):
+        """
+        Find the record an operation targets
+
+        Returns:
+            tuple: (record ID, current record or None when unknown)
+        """
+        record_id = operation.get('id')
+        if record_id:
+            if record_id in self._latest:
+                return record_id, self._settle(writer, record_id)
+            # Checked here: one unknown ID would make the API reject its whole batch
+            current = self._zone().get(record_id)
+            if current is None:
+                raise OperationError(f"record {record_id} not found")
+            return record_id, current
+
+        name = _name_key(operation['name'])
+        record_type = (operation.get('type') or '').upper()
+        for future in self._created.pop(name, ()):
+            # Names added earlier in the stream resolve once their batch is applied
+            writer.flush(wait=False)
+            self._apply("add", None, future)
+        matches = [record for record in self._zone().find_by_name(name)
+                   if not record_type or record.get('type') == record_type]
+        if not matches:
+            raise OperationError(f"no {record_type + ' ' if record_type else ''}record named {operation['name']}")
+        if len(matches) > 1:
+            raise OperationError(f"{len(matches)} records named {operation['name']}; give a type or an id")
+        current = matches[0]
+        if current['id'] in self._latest:
+            current = self._settle(writer, current['id']) or current
+        return current['id'], current
+
+    def _settle(self, writer, record_id):
+        """Send what is queued and wait for the change in flight on a record; returns the record after it"""
+        op, future = self._latest.pop(record_id)
+        writer.flush(wait=False)
+        return self._apply(op, record_id, future)
+
+    def _apply(self, op, record_id, future):
+        """
+        Wait for a change and bring the zone listing up to date with it
+
+        Returns:
+            dict: Record after the change, or None if it failed or deleted the record
+        """
+        try:
+            record = future.result() or None
+        except Exception:
+            return None
+        if op == "delete":
+            if self._snapshot is not None:
+                self._snapshot.remove(record_id)
+            return None
+        if record and record.get('id') and self._snapshot is not None:
+            self._snapshot.add(record)
+        return record
+
+    def _zone(self):
+        """Indexed zone listing, loaded on first use"""
+        if self._snapshot is None:
+            self._snapshot = self.query_service.get_zone_snapshot()
+            if self._snapshot is None:
+                raise OperationError("cannot list the zone to look records up")
+        return self._snapshot
+
+    def _result(self, line, operation, future, record_id):
+        """Wait for one operation and describe its outcome"""
+        op = operation.get('op')
+        if record_id is not None and self._latest.get(record_id, (None, None))[1] is future:
+            del self._latest[record_id]
+        if op == "add" and operation.get('name'):
+            key = _name_key(operation['name'])
+            pending = [other for other in self._created.get(key, ()) if other is not future]
+            if pending:
+                self._created[key] = pending
+            else:
+                self._created.pop(key, None)
+
+        result = {"line": line, "op": op}
+        try:
+            record = future.result() or {}
+        except Exception as e:
+            result.update(ok=False, error=str(e))
+            return result
+        self._apply(op, record_id, future)
+        result.update(ok=True, id=record.get('id') or record_id, name=record.get('name') or operation.get('name'))
+        if future in self._unchanged:
+            self._unchanged.discard(future)
+            result['unchanged'] = True
+        return result
+
+
+def _name_key(name):
+    """Normalized record name for lookups"""
+    return name.lower().rstrip('.')
+
+
+def _failed(error):
+    """A finished future holding an error"""
+    future = Future()
+    future.set_exception(error)
+    return future
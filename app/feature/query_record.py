@@ -2,29 +2,315 @@
 DNS Record Query Module
 Handles querying and listing DNS records from Cloudflare
 """
-from .base_api import CloudflareAPIClient
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from config import PAGE_FETCH_WORKERS, SYNC_FULL_INTERVAL, SYNC_PAGE_SIZE
+from app.log.logger import logger
+from .base_api import CloudflareAPIClient, CloudflareAPIError
+from .dns_record import DNSRecord
+from .zone_snapshot import ZoneSnapshot
 
 
 class QueryRecord(CloudflareAPIClient):
     """Handle DNS record query operations"""
     
-    def list_all_records(self):
+    # Largest page size accepted by the DNS records list endpoint
+    MAX_PAGE_SIZE = 5000
+    
+    # Zones with a background refresh in progress, shared by every instance
+    _refreshing = set()
+    _refreshing_lock = threading.Lock()
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_listing_stats = None
+    
+    def iter_records(self, record_type=None, per_page=MAX_PAGE_SIZE, workers=None, use_cache=True,
+                     allow_stale=False):
+        """
+        Iterate over every DNS record in the zone
+        
+        While the zone cache is fresh, records are served from memory.
+        With ``allow_stale``, an older listing (from memory or the on-disk
+        snapshot) is served right away instead and a background refresh
+        is started; this keeps working while the API is unreachable.
+        Otherwise the zone is listed page by page: the first page reports
+        how many pages exist, and with more than one worker the remaining
+        pages are fetched concurrently and yielded back in page order.
+        At most two pages per worker are buffered in flight, and listed
+        records are not kept, so memory stays bounded whatever the zone
+        size; list_all_records and get_zone_snapshot fill the zone cache.
+        Page counts and timings are kept in ``last_listing_stats``.
+        
+        Args:
+            record_type (str): Only yield records of this type (optional)
+            per_page (int): Records requested per page (default: MAX_PAGE_SIZE)
+            workers (int): Concurrent page fetches (default: PAGE_FETCH_WORKERS)
+            use_cache (bool): Serve from the zone cache while it is fresh (default: True)
+            allow_stale (bool): Serve the last listing, however old, and refresh in the background
+            
+        Yields:
+            dict: DNS record data
+            
+        Raises:
+            CloudflareAPIError: If a page cannot be retrieved
+        """
+        cached = self._cached_records(record_type, allow_stale) if use_cache else None
+        if cached is not None:
+            yield from cached
+            return
+        
+        yield from self._iter_remote_records(record_type, per_page, workers)
+    
+    def _cached_records(self, record_type, allow_stale):
+        """Records from the zone cache, or None when it cannot answer (see iter_records)"""
+        cached = self.cache.get_records(self.zone_id, record_type)
+        if cached is None and allow_stale:
+            cached = self.cache.get_stale_records(self.zone_id, record_type)
+            if cached is not None:
+                self.refresh_in_background()
+        return cached
+    
+    def _list_records(self, record_type=None, use_cache=True, allow_stale=False):
+        """
+        List records into memory, caching what a remote listing returns
+        
+        A complete unfiltered listing replaces the zone cache; a listing
+        filtered by type refreshes the records it returned.
+        
+        Returns:
+            list: DNS records
+            
+        Raises:
+            CloudflareAPIError: If a page cannot be retrieved
+        """
+        cached = self._cached_records(record_type, allow_stale) if use_cache else None
+        if cached is not None:
+            return list(cached)
+        
+        records = list(self._iter_remote_records(record_type, self.MAX_PAGE_SIZE, None))
+        if not record_type:
+            self.cache.replace_all(self.zone_id, records)
+        else:
+            self.cache.store_many(self.zone_id, records)
+        return records
+    
+    def refresh(self):
+        """
+        Re-list the whole zone from the API and replace the cached copy
+        
+        Returns:
+            int: Number of records in the zone, or -1 if the listing failed
+        """
+        try:
+            count = len(self._list_records(use_cache=False))
+            self._log_success("refreshed zone cache", f"{count} records")
+            return count
+        except Exception as e:
+            self._log_error("refreshing zone cache", error=e)
+            return -1
+    
+    def sync(self, full_interval=None):
+        """
+        Bring the cached zone up to date, fetching only what changed
+        
+        Records are listed newest first by ``modified_on`` and paging
+        stops at the newest modification seen by the previous sync, so an
+        unchanged zone costs a single small request. Deletions leave no
+        trace in that listing; they are picked up by a full re-list once
+        the last one is ``full_interval`` seconds old. A full re-list is
+        also used when there is no complete listing to build on, and
+        whenever the API does not return records in modification order.
+        
+        Args:
+            full_interval (float): Seconds between full re-lists (default: SYNC_FULL_INTERVAL)
+            
+        Returns:
+            dict: Sync mode ("incremental" or "full"), zone record count, records changed and
+                requests made, or None if the zone could not be listed
+        """
+        full_interval = SYNC_FULL_INTERVAL if full_interval is None else full_interval
+        state = self.cache.sync_state(self.zone_id)
+        if state is not None:
+            full_synced_at, watermark = state
+            if watermark and full_synced_at and time.time() - full_synced_at < full_interval:
+                try:
+                    changes = self._list_changed_since(watermark)
+                except Exception as e:
+                    self._log_error("listing changed records", error=e)
+                    changes = None
+                
+                if changes is not None:
+                    changed, newest, requests = changes
+                    if self.cache.apply_changes(self.zone_id, changed, newest):
+                        records = len(self.cache.get_snapshot(self.zone_id) or ())
+                        self._log_success("synced zone", f"{len(changed)} changed records in {requests} requests")
+                        return {"mode": "incremental", "records": records, "changed": len(changed),
+                                "requests": requests}
+        
+        count = self.refresh()
+        if count < 0:
+            return None
+        stats = self.last_listing_stats or {}
+        return {"mode": "full", "records": count, "changed": count, "requests": stats.get("pages", 0)}
+    
+    def _list_changed_since(self, watermark):
+        """
+        List records modified at or after a watermark, newest first
+        
+        Cloudflare does not document ``modified_on`` as an order key, so
+        every page is checked to be in descending modification order as a
+        whole before paging is allowed to stop at the watermark; a single
+        out-of-order record means the order is not honoured.
+        
+        Returns:
+            tuple: (changed records, newest modified_on, requests made), or None if the
+                listing is not in modification order and cannot be trusted
+        """
+        params = {"order": "modified_on", "direction": "desc", "per_page": SYNC_PAGE_SIZE}
+        changed = []
+        newest = previous = None
+        page = 0
+        
+        while True:
+            page += 1
+            records, info, _ = self._fetch_page(params, page)
+            # Timestamps are ISO 8601 in UTC, so they compare as strings
+            stamps = [record.get('modified_on') for record in records]
+            ordered = stamps if previous is None else [previous] + stamps
+            if not all(stamps) or any(later > earlier for earlier, later in zip(ordered, ordered[1:])):
+                logger.warning("Records not listed in modification order; falling back to a full listing")
+                return None
+            
+            for record, modified_on in zip(records, stamps):
+                newest = newest or modified_on
+                if modified_on < watermark:
+                    return changed, max(newest, watermark), page
+                changed.append(record)
+            previous = stamps[-1] if stamps else previous
+            
+            total_pages = info.get('total_pages')
+            last_page = page >= total_pages if total_pages else len(records) < (info.get('per_page') or SYNC_PAGE_SIZE)
+            if not records or last_page:
+                return changed, max(newest or watermark, watermark), page
+    
+    def refresh_in_background(self):
+        """
+        Sync the zone on a daemon thread unless a sync is already running
+        
+        Returns:
+            threading.Thread: The sync thread, or None if one was already running
+        """
+        with self._refreshing_lock:
+            if self.zone_id in self._refreshing:
+                return None
+            self._refreshing.add(self.zone_id)
+        
+        def run():
+            try:
+                self.sync()
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(self.zone_id)
+        
+        thread = threading.Thread(target=run, name=f"zone-refresh-{self.zone_id}", daemon=True)
+        thread.start()
+        return thread
+    
+    def _iter_remote_records(self, record_type, per_page, workers, filters=None):
+        """Stream the zone listing from the API (see iter_records), optionally filtered server-side"""
+        workers = max(1, workers or PAGE_FETCH_WORKERS)
+        params = dict(filters or {}, per_page=per_page)
+        if record_type:
+            params["type"] = record_type
+        
+        stats = {"pages": 0, "records": 0, "page_times": [], "workers": workers, "elapsed": 0.0}
+        self.last_listing_stats = stats
+        started = time.perf_counter()
+        
+        def consume(result):
+            records, info, elapsed = result
+            stats["pages"] += 1
+            stats["records"] += len(records)
+            stats["page_times"].append(elapsed)
+            stats["elapsed"] = time.perf_counter() - started
+            return records, info
+        
+        records, info = consume(self._fetch_page(params, 1))
+        yield from records
+        total_pages = info.get('total_pages')
+        
+        if total_pages is None:
+            # No page count reported: keep going until a short page arrives
+            page = 1
+            while records and len(records) >= (info.get('per_page') or per_page):
+                page += 1
+                records, info = consume(self._fetch_page(params, page))
+                yield from records
+        elif workers == 1 or total_pages <= 2:
+            for page in range(2, total_pages + 1):
+                records, info = consume(self._fetch_page(params, page))
+                yield from records
+        else:
+            yield from self._iter_pages_concurrently(params, total_pages, workers, consume)
+        
+        self._log_success("listed zone", f"{stats['records']} records in {stats['pages']} pages "
+                                         f"({stats['elapsed']:.2f}s, {workers} workers)")
+    
+    def _iter_pages_concurrently(self, params, total_pages, workers, consume):
+        """Fetch pages 2..total_pages on a bounded pool, yielding records in page order"""
+        pending = deque()
+        next_page = 2
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                while next_page <= total_pages or pending:
+                    while next_page <= total_pages and len(pending) < workers * 2:
+                        pending.append(executor.submit(self._fetch_page, params, next_page))
+                        next_page += 1
+                    
+                    records, _ = consume(pending.popleft().result())
+                    yield from records
+            finally:
+                for future in pending:
+                    future.cancel()
+    
+    def _fetch_page(self, params, page):
+        """
+        Fetch a single page of DNS records
+        
+        Returns:
+            tuple: (records, result_info, elapsed seconds)
+        """
+        started = time.perf_counter()
+        response = self._make_request("GET", "", params=dict(params, page=page))
+        elapsed = time.perf_counter() - started
+        
+        if response.status_code != 200:
+            self._log_error("listing records", response)
+            raise CloudflareAPIError(f"listing records page {page}", response)
+        
+        payload = response.json()
+        records = [DNSRecord(record) for record in payload.get('result') or []]
+        return records, payload.get('result_info') or {}, elapsed
+    
+    def list_all_records(self, allow_stale=False):
         """
         List all DNS records in the zone
         
+        Args:
+            allow_stale (bool): Accept the last saved listing and refresh it in the background
+            
         Returns:
             list: List of DNS records if successful, empty list otherwise
         """
         try:
-            response = self._make_request("GET", "")
-            
-            if response.status_code == 200:
-                records = response.json().get('result', [])
-                self._log_success("retrieved all records", f"found {len(records)} records")
-                return records
-            else:
-                self._log_error("listing records", response)
-                return []
+            records = self._list_records(allow_stale=allow_stale)
+            self._log_success("retrieved all records", f"found {len(records)} records")
+            return records
                 
         except Exception as e:
             self._log_error("listing records", error=e)
@@ -34,29 +320,98 @@ class QueryRecord(CloudflareAPIClient):
         """
         Get a specific DNS record by name
         
+        Names can hold several records (e.g. round-robin A records); this
+        returns the first one. Use get_records_by_name to see all of them.
+        
         Args:
             record_name (str): The DNS record name to search for
             
         Returns:
             dict: Record data if found, None otherwise
         """
-        try:
-            response = self._make_request("GET", f"?name={record_name}")
+        records = self.get_records_by_name(record_name)
+        
+        if records:
+            self._log_success("found record", f"name: {record_name}")
+            return records[0]
+        
+        self._log_error("finding record", error=f"Record '{record_name}' not found")
+        return None
+    
+    def get_records_by_name(self, record_name):
+        """
+        Get every DNS record with the given name
+        
+        Answered from the zone snapshot index while the cache is fresh,
+        otherwise with a single filtered API request. If the API cannot be
+        reached, the last saved listing is searched instead.
+        
+        Args:
+            record_name (str): The DNS record name to search for
             
-            if response.status_code == 200:
-                records = response.json().get('result', [])
-                if records:
-                    self._log_success("found record", f"name: {record_name}")
-                    return records[0]
-                else:
-                    self._log_error("finding record", error=f"Record '{record_name}' not found")
-                    return None
-            else:
-                self._log_error("finding record", response)
-                return None
-                
+        Returns:
+            list: Matching records (empty if none found or on error)
+        """
+        try:
+            return self.fetch_records_by_name(record_name)
+        
+        except CloudflareAPIError:
+            return []
         except Exception as e:
             self._log_error("finding record", error=e)
+            stale = self.cache.find_stale_by_name(self.zone_id, record_name)
+            if stale is not None:
+                logger.warning("API unreachable; answering '%s' from the saved snapshot", record_name)
+                return stale
+            return []
+    
+    def fetch_records_by_name(self, record_name):
+        """
+        Get every DNS record with the given name, raising on failure
+        
+        Unlike get_records_by_name an error is never answered with an empty
+        list, for callers that must tell a missing name from a failed lookup.
+        
+        Args:
+            record_name (str): The DNS record name to search for
+            
+        Returns:
+            list: Matching records, from the fresh cache or one filtered request
+            
+        Raises:
+            CloudflareAPIError: If the lookup is answered with an error
+        """
+        records = self.cache.find_by_name(self.zone_id, record_name)
+        if records is not None:
+            return records
+        
+        response = self._make_request("GET", "", params={"name": record_name})
+        if response.status_code != 200:
+            self._log_error("finding record", response)
+            raise CloudflareAPIError(f"looking up {record_name}", response)
+        records = [DNSRecord(record) for record in response.json().get('result') or []]
+        self.cache.store_many(self.zone_id, records)
+        return records
+    
+    def get_zone_snapshot(self):
+        """
+        Get an indexed snapshot of the whole zone
+        
+        The cached snapshot is reused while fresh and kept current by our
+        own writes; otherwise the zone is listed once to rebuild it.
+        
+        Returns:
+            ZoneSnapshot: Indexed zone records, or None if listing failed
+        """
+        try:
+            snapshot = self.cache.get_snapshot(self.zone_id)
+            if snapshot is None:
+                records = self._list_records(use_cache=False)
+                snapshot = self.cache.get_snapshot(self.zone_id) or ZoneSnapshot(records)
+            return snapshot
+            
+        except Exception as e:
+            self._log_error("building zone snapshot", error=e)
             return None
     
     def get_record_by_id(self, record_id):
@@ -70,10 +425,15 @@ class QueryRecord(CloudflareAPIClient):
             dict: Record data if found, None otherwise
         """
         try:
+            record = self.cache.get_record(self.zone_id, record_id)
+            if record is not None:
+                return record
+            
             response = self._make_request("GET", f"/{record_id}")
             
             if response.status_code == 200:
-                record = response.json().get('result')
+                record = DNSRecord.wrap(response.json().get('result'))
+                self.cache.store(self.zone_id, record)
                 self._log_success("found record", f"ID: {record_id}")
                 return record
             else:
@@ -84,26 +444,58 @@ class QueryRecord(CloudflareAPIClient):
             self._log_error("finding record by ID", error=e)
             return None
     
-    def list_records_by_type(self, record_type):
+    def search(self, query, use_cache=True, workers=None):
+        """
+        Find the records matching a search query
+        
+        While the zone cache is fresh the query runs entirely in memory.
+        Otherwise every predicate Cloudflare supports is sent as a filter
+        parameter, so only matching records cross the network, and the
+        remaining predicates are checked on what comes back.
+        
+        Args:
+            query (SearchQuery): Filters, match mode and ordering
+            use_cache (bool): Answer from the zone cache while it is fresh (default: True)
+            workers (int): Concurrent page fetches (default: PAGE_FETCH_WORKERS)
+            
+        Returns:
+            list: Matching records in the requested order (empty on error)
+        """
+        try:
+            cached = self.cache.get_records(self.zone_id) if use_cache else None
+            if cached is not None:
+                return query.sort([record for record in cached if query.matches(record)])
+            
+            params, local = query.plan()
+            fetched = list(self._iter_remote_records(None, self.MAX_PAGE_SIZE, workers, params))
+            self.cache.store_many(self.zone_id, fetched)
+            records = [record for record in fetched if query.matches(record, local)]
+            
+            if query.order and "order" not in params:
+                records = query.sort(records)
+            self._log_success("searched records", f"{len(records)} matches, {len(fetched)} records fetched, "
+                                                  f"{len(local)} predicates checked locally")
+            return records
+            
+        except Exception as e:
+            self._log_error("searching records", error=e)
+            return []
+    
+    def list_records_by_type(self, record_type, allow_stale=False):
         """
         List DNS records filtered by type
         
         Args:
             record_type (str): DNS record type (A, CNAME, MX, etc.)
+            allow_stale (bool): Accept the last saved listing and refresh it in the background
             
         Returns:
             list: List of DNS records of specified type
         """
         try:
-            response = self._make_request("GET", f"?type={record_type}")
-            
-            if response.status_code == 200:
-                records = response.json().get('result', [])
-                self._log_success("retrieved records by type", f"found {len(records)} {record_type} records")
-                return records
-            else:
-                self._log_error("listing records by type", response)
-                return []
+            records = self._list_records(record_type, allow_stale=allow_stale)
+            self._log_success("retrieved records by type", f"found {len(records)} {record_type} records")
+            return records
                 
         except Exception as e:
             self._log_error("listing records by type", error=e)
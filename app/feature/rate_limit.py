@@ -0,0 +1,123 @@
+"""
+Rate Limiter Module
+Token-bucket pacing shared by every Cloudflare API client
+"""
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from config import RATE_LIMIT_REQUESTS, RATE_LIMIT_PERIOD, RATE_LIMIT_BURST
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket
+
+    Up to ``burst`` requests may go out back to back; after that requests
+    are paced so that no window of ``period`` seconds ever carries more
+    than ``max_requests`` requests. Callers reserve a slot and sleep for
+    the returned delay, so waiting threads are served in arrival order.
+    When Cloudflare answers 429, ``pause`` holds every caller until the
+    Retry-After time has passed.
+    """
+
+    def __init__(self, max_requests=RATE_LIMIT_REQUESTS, period=RATE_LIMIT_PERIOD, burst=RATE_LIMIT_BURST):
+        """
+        Args:
+            max_requests (int): Request budget per period
+            period (float): Budget window in seconds
+            burst (int): Requests allowed back to back before pacing starts
+        """
+        self.capacity = max(1, min(burst, max_requests))
+        self.rate = max(max_requests - self.capacity, 1) / period
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def reserve(self):
+        """
+        Take one request slot
+
+        Returns:
+            float: Seconds the caller must wait before sending
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            self.requests += 1
+
+            delay = max(-self._tokens / self.rate, self._paused_until - now, 0.0)
+            self.waited += delay
+            return delay
+
+    def pause_remaining(self):
+        """Seconds left in the current Retry-After pause"""
+        return max(self._paused_until - time.monotonic(), 0.0)
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        time.sleep(self.reserve())
+        remaining = self.pause_remaining()
+        while remaining > 0:
+            time.sleep(remaining)
+            remaining = self.pause_remaining()
+
+    def pause(self, seconds):
+        """
+        Hold every caller for the given time after a 429 response
+
+        Args:
+            seconds (float): Delay requested by the server
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+            self.throttled += 1
+
+    def stats(self):
+        """
+        Report pacing activity
+
+        Returns:
+            dict: Requests paced, 429 pauses and total seconds spent waiting
+        """
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "waited": self.waited,
+            "rate_per_second": self.rate
+        }
+
+
+def retry_after_seconds(response, default):
+    """
+    Read the Retry-After header of a response
+
+    Args:
+        response: HTTP response with a ``headers`` mapping
+        default (float): Delay to use when the header is missing or invalid
+
+    Returns:
+        float: Seconds to wait
+    """
+    value = (response.headers or {}).get('Retry-After')
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+# Create instance for easy importing
+rate_limiter = RateLimiter()
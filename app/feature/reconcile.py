@@ -0,0 +1,291 @@
+"""
+Zone Reconcile Module
+Compares a desired-state file with the live zone and applies the minimal diff
+"""
+import ipaddress
+import json
+import os
+
+from .batch_record import BatchWriter
+from .bulk import BulkExecutor
+from .query_record import QueryRecord
+from .zone_snapshot import normalize_name
+
+# Fields that are compared and updated when present in the desired state
+MANAGED_FIELDS = ("content", "ttl", "proxied", "priority", "comment")
+
+# Record types whose content is a hostname and compares case-insensitively
+HOSTNAME_TYPES = ("CNAME", "NS", "MX", "PTR")
+
+
+def load_desired_state(path):
+    """
+    Load desired records from a YAML or JSON file
+
+    The file holds either a list of records or a mapping with a
+    ``records`` list and an optional ``zone`` name. With a zone name,
+    relative record names (``www``) and ``@`` are expanded to FQDNs;
+    without one, compute_plan qualifies them against the live zone.
+
+    Args:
+        path (str): Path to a .yaml/.yml or .json file
+
+    Returns:
+        list: Desired record dicts with at least type, name and content
+
+    Raises:
+        ValueError: If the file is malformed
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("YAML desired-state files require PyYAML: pip install pyyaml") from e
+            document = yaml.safe_load(f)
+        else:
+            document = json.load(f)
+
+    zone = None
+    if isinstance(document, dict):
+        zone = normalize_name(document.get('zone')) or None
+        document = document.get('records')
+    if not isinstance(document, list):
+        raise ValueError(f"{path}: expected a list of records or a mapping with 'records'")
+
+    records = []
+    for index, entry in enumerate(document):
+        if not isinstance(entry, dict) or not all(entry.get(key) for key in ('type', 'name', 'content')):
+            raise ValueError(f"{path}: record #{index + 1} needs type, name and content")
+        record = {key: value for key, value in entry.items() if key in MANAGED_FIELDS}
+        record['type'] = str(entry['type']).upper()
+        record['name'] = _qualify(entry['name'], zone)
+        records.append(record)
+    return records
+
+
+def _qualify(name, zone):
+    """Expand a relative name against the zone apex"""
+    name = normalize_name(name)
+    if not zone:
+        return name
+    if name in ('@', ''):
+        return zone
+    if name == zone or name.endswith('.' + zone):
+        return name
+    return f"{name}.{zone}"
+
+
+def normalize_content(record_type, content):
+    """Normalize record content so equivalent values compare equal"""
+    content = str(content).strip()
+    if record_type in ('A', 'AAAA'):
+        try:
+            return str(ipaddress.ip_address(content))
+        except ValueError:
+            return content
+    if record_type in HOSTNAME_TYPES:
+        return content.lower().rstrip('.')
+    return content
+
+
+class ReconcilePlan:
+    """Creates, updates and deletes needed to reach the desired state"""
+
+    def __init__(self):
+        self.creates = []
+        self.updates = []
+        self.deletes = []
+        self.unchanged = 0
+
+    @property
+    def is_empty(self):
+        """Whether the live zone already matches the desired state"""
+        return not (self.creates or self.updates or self.deletes)
+
+    def summary(self):
+        """
+        Summarize the plan
+
+        Returns:
+            dict: Number of creates, updates, deletes and unchanged records
+        """
+        return {
+            "create": len(self.creates),
+            "update": len(self.updates),
+            "delete": len(self.deletes),
+            "unchanged": self.unchanged
+        }
+
+    def format(self):
+        """
+        Render the plan as human-readable lines
+
+        Returns:
+            list: One line per change, prefixed with +, ~ or -
+        """
+        lines = []
+        for record in self.creates:
+            lines.append(f"+ {record['type']:<6} {record['name']} -> {record['content']}"
+                         f"{_describe_options(record)}")
+        for live, changes in self.updates:
+            diff = ", ".join(f"{field}: {live.get(field)!r} -> {value!r}" for field, value in changes.items())
+            lines.append(f"~ {live['type']:<6} {live['name']} ({live['id']}) {diff}")
+        for live in self.deletes:
+            lines.append(f"- {live['type']:<6} {live['name']} -> {live.get('content')} ({live['id']})")
+        return lines
+
+
+def _describe_options(record):
+    """Optional fields of a record to be created, for plan output"""
+    options = [f"{field}={record[field]!r}" for field in MANAGED_FIELDS
+               if field != 'content' and field in record]
+    return f" ({', '.join(options)})" if options else ""
+
+
+def compute_plan(desired, live, prune=False):
+    """
+    Compute the minimal set of changes from live records to desired records
+
+    Desired names that are relative (``www``, ``@``) are qualified with
+    the zone apex named by the live records, as the API itself would do.
+    Records are grouped by (type, name). Within a group, records with the
+    same content are paired first and only differing fields are updated;
+    leftover desired and live records are then paired as content updates,
+    and whatever remains is created or (with prune) deleted. Every step
+    is a hash lookup, so the diff is linear in the number of records.
+
+    Args:
+        desired (iterable): Desired record dicts
+        live (iterable): Live record dicts from the API
+        prune (bool): Delete live records that are not in the desired state
+
+    Returns:
+        ReconcilePlan: Changes to apply
+    """
+    plan = ReconcilePlan()
+    live_groups = {}
+    zone = None
+    for record in live:
+        zone = zone or normalize_name(record.get('zone_name')) or None
+        key = (record.get('type'), normalize_name(record.get('name')))
+        content = normalize_content(record.get('type'), record.get('content'))
+        live_groups.setdefault(key, {}).setdefault(content, []).append(record)
+
+    leftovers = {}
+    for record in desired:
+        if zone and _qualify(record['name'], zone) != normalize_name(record['name']):
+            record = dict(record, name=_qualify(record['name'], zone))
+        key = (record['type'], normalize_name(record['name']))
+        content = normalize_content(record['type'], record['content'])
+        candidates = live_groups.get(key, {}).get(content)
+
+        if candidates:
+            _plan_update(plan, candidates.pop(), record, compare_content=False)
+        else:
+            leftovers.setdefault(key, []).append(record)
+
+    for key, records in leftovers.items():
+        groups = live_groups.get(key, {})
+        remaining_live = iter([r for records_by_content in groups.values() for r in records_by_content])
+        for record in records:
+            live_record = next(remaining_live, None)
+            if live_record is None:
+                plan.creates.append(record)
+                continue
+            _plan_update(plan, live_record, record, compare_content=True)
+            groups[normalize_content(live_record.get('type'), live_record.get('content'))].remove(live_record)
+
+    if prune:
+        for groups in live_groups.values():
+            for records in groups.values():
+                plan.deletes.extend(records)
+
+    return plan
+
+
+def _plan_update(plan, live_record, desired_record, compare_content):
+    """Record an update for the differing managed fields, or count the record unchanged"""
+    changes = {}
+    for field in MANAGED_FIELDS:
+        if field not in desired_record or (field == 'content' and not compare_content):
+            continue
+        if live_record.get(field) != desired_record[field]:
+            changes[field] = desired_record[field]
+
+    if changes:
+        plan.updates.append((live_record, changes))
+    else:
+        plan.unchanged += 1
+
+
+class ZoneReconciler:
+    """Plan and apply desired-state changes against the live zone"""
+
+    def __init__(self, query_service=None, executor=None, zone_id=None):
+        """
+        Args:
+            query_service (QueryRecord): Service used to load the live zone (optional)
+            executor (BulkExecutor): Executor used to apply changes (optional)
+            zone_id (str): Zone to reconcile when no query_service is given (default: ZONE_ID)
+        """
+        self.query_service = query_service or QueryRecord(zone_id=zone_id)
+        self.executor = executor or BulkExecutor()
+
+    def plan(self, desired, prune=False):
+        """
+        Compare desired records with the live zone
+
+        Args:
+            desired (str or list): Path to a desired-state file, or desired record dicts
+            prune (bool): Delete live records that are not in the desired state
+
+        Returns:
+            ReconcilePlan: Changes to apply
+
+        Raises:
+            CloudflareAPIError: If the live zone cannot be listed
+        """
+        if isinstance(desired, str):
+            desired = load_desired_state(desired)
+        return compute_plan(desired, self.query_service.iter_records(), prune=prune)
+
+    def apply(self, plan):
+        """
+        Apply a plan through the batch endpoint
+
+        Args:
+            plan (ReconcilePlan): Changes from plan()
+
+        Returns:
+            BulkResult: Outcome of every change
+        """
+        changes = ([("delete", record) for record in plan.deletes]
+                   + [("update", (record, fields)) for record, fields in plan.updates]
+                   + [("create", record) for record in plan.creates])
+
+        with BatchWriter(**self.query_service.shared_options()) as writer:
+            return self.executor.run_batched(
+                changes,
+                lambda change: self._enqueue(writer, change),
+                writer,
+                describe=self._describe_change
+            )
+
+    @staticmethod
+    def _enqueue(writer, change):
+        """Queue one planned change on the batch writer"""
+        action, payload = change
+        if action == "delete":
+            return writer.delete(payload['id'])
+        if action == "update":
+            record, fields = payload
+            return writer.patch(record['id'], fields)
+        return writer.post(payload)
+
+    @staticmethod
+    def _describe_change(change):
+        """Label a planned change for the result summary"""
+        action, payload = change
+        record = payload[0] if action == "update" else payload
+        return f"{action} {record['type']} {record['name']}"
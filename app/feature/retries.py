@@ -0,0 +1,172 @@
+"""
+Retry Policy Module
+Backoff, retry eligibility and circuit breaking for Cloudflare API calls
+"""
+import random
+import threading
+import time
+
+from config import (
+    RETRY_MAX_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+)
+from app.log.logger import logger
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit breaker is open"""
+
+
+class RetryPolicy:
+    """
+    Decide whether and when a failed request is sent again
+
+    Transient failures (connection errors, timeouts and 5xx answers) are
+    retried with exponential backoff and full jitter. Only idempotent
+    requests are retried unless the failure happened before anything
+    reached the server. Retries never extend past the call's deadline.
+    """
+
+    # Methods that can be repeated without changing the outcome
+    IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+    # Server answers worth another attempt
+    RETRY_STATUSES = (500, 502, 503, 504, 520, 521, 522, 523, 524)
+
+    def __init__(self, max_attempts=RETRY_MAX_ATTEMPTS, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY):
+        """
+        Args:
+            max_attempts (int): Total attempts per request, including the first
+            base_delay (float): Backoff before the first retry, doubled each time
+            max_delay (float): Upper bound for a single backoff
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_idempotent(self, method, idempotent=None):
+        """Whether a request may be repeated; an explicit flag overrides the method default"""
+        if idempotent is not None:
+            return idempotent
+        return method.upper() in self.IDEMPOTENT_METHODS
+
+    def backoff(self, attempt):
+        """Jittered delay before retry number ``attempt + 1``"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def retry_delay(self, attempt, method, idempotent=None, status=None, safe=False, deadline_at=None):
+        """
+        Decide how long to wait before retrying a failed attempt
+
+        Args:
+            attempt (int): Zero-based number of the attempt that failed
+            method (str): HTTP method of the request
+            idempotent (bool): Override for the method's idempotency (optional)
+            status (int): HTTP status of the failed attempt, None for a network error
+            safe (bool): The request never reached the server, so any method may be retried
+            deadline_at (float): time.monotonic() value the call must finish by (optional)
+
+        Returns:
+            float: Seconds to wait, or None if the request must not be retried
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        if status is not None and status not in self.RETRY_STATUSES:
+            return None
+        if not safe and not self.is_idempotent(method, idempotent):
+            return None
+
+        delay = self.backoff(attempt)
+        if deadline_at is not None and time.monotonic() + delay >= deadline_at:
+            return None
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the API keeps failing
+
+    After ``failure_threshold`` consecutive transient failures the circuit
+    opens and requests raise CircuitOpenError without being sent. Once
+    ``reset_timeout`` seconds have passed a single trial request is let
+    through; its success closes the circuit, its failure re-opens it, and
+    an answer that is neither (a 429) frees the slot for another trial.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_TIMEOUT):
+        """
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds to stay open before a trial request
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """
+        Check that a request may be sent
+
+        Returns:
+            bool: True if the request is the half-open trial; its caller must
+                then report an outcome, or call record_neutral() when there is none
+
+        Raises:
+            CircuitOpenError: While the circuit is open
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if self.state == self.OPEN and remaining <= 0:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+
+            raise CircuitOpenError(f"Cloudflare API circuit is open; retry in {max(remaining, 0):.0f}s")
+
+    def record_success(self):
+        """Close the circuit after a successful answer"""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Cloudflare API recovered; circuit closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_neutral(self):
+        """Release the trial slot after an answer that says nothing about health (e.g. a 429)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Count a transient failure and open the circuit when the threshold is reached"""
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.error("Cloudflare API failing (%d consecutive errors); circuit open for %.0fs",
+                                 self.failures, self.reset_timeout)
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+# Create instances for easy importing
+retry_policy = RetryPolicy()
+circuit_breaker = CircuitBreaker()
@@ -0,0 +1,211 @@
+"""
+Search Query Module
+Builds DNS record searches that Cloudflare filters server-side where it can
+"""
+from .zone_snapshot import normalize_name
+
+# (field, operator) pairs the DNS records list endpoint filters on, mapped to
+# the query parameter that expresses them
+SERVER_FILTERS = {
+    ("name", "exact"): "name.exact",
+    ("name", "contains"): "name.contains",
+    ("name", "startswith"): "name.startswith",
+    ("name", "endswith"): "name.endswith",
+    ("type", "exact"): "type",
+    ("content", "exact"): "content.exact",
+    ("content", "contains"): "content.contains",
+    ("content", "startswith"): "content.startswith",
+    ("content", "endswith"): "content.endswith",
+    ("proxied", "exact"): "proxied",
+    ("comment", "exact"): "comment.exact",
+    ("comment", "contains"): "comment.contains",
+    ("comment", "startswith"): "comment.startswith",
+    ("comment", "endswith"): "comment.endswith",
+    ("comment", "present"): "comment.present",
+    ("comment", "absent"): "comment.absent",
+    ("tag", "exact"): "tag",
+    ("tag", "contains"): "tag.contains",
+    ("tag", "present"): "tag.present",
+    ("tag", "absent"): "tag.absent",
+}
+
+# Fields the list endpoint can sort by
+SERVER_ORDER_FIELDS = {"type", "name", "content", "ttl", "proxied"}
+
+OPERATORS = {"exact", "contains", "startswith", "endswith", "present", "absent"}
+
+
+def _tag_parts(tag):
+    """Split a ``name:value`` tag into its name and value"""
+    name, _, value = tag.partition(':')
+    return name, value
+
+
+def _compare(actual, operator, expected):
+    """Apply a string operator to one record value"""
+    if operator == "present":
+        return actual not in (None, "")
+    if operator == "absent":
+        return actual in (None, "")
+    if actual is None:
+        return False
+    if operator == "exact":
+        return actual == expected
+    if operator == "contains":
+        return expected in actual
+    if operator == "startswith":
+        return actual.startswith(expected)
+    return actual.endswith(expected)
+
+
+class SearchQuery:
+    """
+    Filters, match mode and ordering for a DNS record search
+
+    Predicates are added with ``where``; each one Cloudflare can evaluate
+    becomes a query parameter, the rest are checked locally on the
+    records that come back. With ``match="any"`` the server can only OR
+    its own parameters, so if any predicate has to run locally the whole
+    search is filtered locally instead.
+
+    Example:
+        SearchQuery(match="any").where("name", "endswith", ".dev.example.com")
+                                .where("tag", "exact", "team:web").order_by("name")
+    """
+
+    def __init__(self, match="all"):
+        """
+        Args:
+            match (str): "all" to require every predicate, "any" for at least one
+        """
+        if match not in ("all", "any"):
+            raise ValueError(f"match must be 'all' or 'any', not '{match}'")
+        self.match = match
+        self.predicates = []
+        self.order = None
+        self.direction = "asc"
+
+    def where(self, field, operator="exact", value=None):
+        """
+        Add a predicate
+
+        Args:
+            field (str|callable): Record field (name, type, content, proxied, ttl, comment,
+                tag, ...) or a function taking the record and returning a bool
+            operator (str): exact, contains, startswith, endswith, present or absent
+            value: Value to compare with (for tags: ``name:value``, or the tag name with
+                present/absent)
+
+        Returns:
+            SearchQuery: self, for chaining
+        """
+        if callable(field):
+            self.predicates.append((field, None, None))
+            return self
+        if operator not in OPERATORS:
+            raise ValueError(f"Unknown operator '{operator}'")
+        if value is None and operator not in ("present", "absent"):
+            raise ValueError(f"Operator '{operator}' needs a value")
+        if field == "name" and value is not None:
+            value = normalize_name(value) if operator in ("exact", "endswith") else value.lower()
+        self.predicates.append((field, operator, value))
+        return self
+
+    def order_by(self, field, direction="asc"):
+        """
+        Sort the results
+
+        Args:
+            field (str): Record field to sort by
+            direction (str): "asc" or "desc"
+
+        Returns:
+            SearchQuery: self, for chaining
+        """
+        if direction not in ("asc", "desc"):
+            raise ValueError(f"direction must be 'asc' or 'desc', not '{direction}'")
+        self.order, self.direction = field, direction
+        return self
+
+    def plan(self):
+        """
+        Split the query into API parameters and locally checked predicates
+
+        Returns:
+            tuple: (query parameters, predicates left to check locally)
+        """
+        params, local = {}, []
+        for predicate in self.predicates:
+            field, operator, value = predicate
+            param = SERVER_FILTERS.get((field, operator)) if operator else None
+            # A parameter can only be sent once; repeated filters run locally
+            if param is None or param in params:
+                local.append(predicate)
+                continue
+            if field == "proxied":
+                value = "true" if value else "false"
+            elif operator in ("present", "absent"):
+                value = value if field == "tag" else ""
+            params[param] = value
+
+        if self.match == "any" and local:
+            params, local = {}, list(self.predicates)
+        elif params:
+            params["match"] = self.match
+            if any(key.startswith("tag") for key in params):
+                params["tag_match"] = self.match
+
+        if self.order in SERVER_ORDER_FIELDS:
+            params["order"] = self.order
+            params["direction"] = self.direction
+        return params, local
+
+    def matches(self, record, predicates=None):
+        """
+        Check a record against the query's predicates
+
+        Args:
+            record (dict): DNS record
+            predicates (list): Predicates to check (default: all of them)
+
+        Returns:
+            bool: Whether the record satisfies the query
+        """
+        predicates = self.predicates if predicates is None else predicates
+        if not predicates:
+            return True
+        results = (self._check(record, predicate) for predicate in predicates)
+        return any(results) if self.match == "any" else all(results)
+
+    @staticmethod
+    def _check(record, predicate):
+        """Evaluate one predicate against a record"""
+        field, operator, value = predicate
+        if operator is None:
+            return bool(field(record))
+        if field == "tag":
+            tags = [_tag_parts(tag) for tag in record.get('tags') or []]
+            if operator in ("present", "absent"):
+                present = any(name == value for name, _ in tags)
+                return present if operator == "present" else not present
+            tag_name, tag_value = _tag_parts(value)
+            return any(name == tag_name and _compare(actual, operator, tag_value) for name, actual in tags)
+
+        actual = record.get(field)
+        if field == "name" and actual is not None:
+            actual = normalize_name(actual)
+        if operator in ("present", "absent"):
+            return _compare(actual, operator, None)
+        if isinstance(value, str):
+            return _compare(None if actual is None else str(actual), operator, value)
+        return actual == value
+
+    def sort(self, records):
+        """Order records locally the way the API would"""
+        if not self.order:
+            return records
+        def key(record):
+            value = record.get(self.order)
+            return (value is None, 0 if value is None else value)
+
+        return sorted(records, key=key, reverse=self.direction == "desc")
@@ -0,0 +1,94 @@
+"""
+HTTP Session Pool Module
+Provides a shared, keep-alive connection pool for all Cloudflare API clients
+"""
+import threading
+
+from config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_POOL_BLOCK, HTTP_KEEP_ALIVE
+
+
+class SessionPool:
+    """Lazily built requests.Session shared by every API client"""
+
+    def __init__(self, pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE,
+                 pool_block=HTTP_POOL_BLOCK, keep_alive=HTTP_KEEP_ALIVE):
+        """
+        Args:
+            pool_connections (int): Number of per-host connection pools to keep
+            pool_maxsize (int): Maximum open connections kept per host
+            pool_block (bool): Wait for a free connection instead of opening extra ones
+            keep_alive (bool): Reuse connections between requests
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self._session = None
+        self._adapter = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Return the shared session, creating it on first use"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    def _build_session(self):
+        """Create a session with a sized adapter mounted for HTTPS and HTTP"""
+        # Imported here so loading the package does not pay for requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        self._adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+        session.mount("https://", self._adapter)
+        session.mount("http://", self._adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def stats(self):
+        """
+        Report connection reuse across all host pools
+
+        Returns:
+            dict: requests, connections opened, reused connections and reuse ratio
+        """
+        total_requests = 0
+        total_connections = 0
+
+        if self._adapter is not None:
+            pools = self._adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                total_requests += pool.num_requests
+                total_connections += pool.num_connections
+
+        reused = max(total_requests - total_connections, 0)
+        return {
+            "requests": total_requests,
+            "connections": total_connections,
+            "reused": reused,
+            "reuse_ratio": (reused / total_requests) if total_requests else 0.0
+        }
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            self._adapter = None
+
+
+# Create instance for easy importing
+session_pool = SessionPool()
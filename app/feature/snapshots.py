@@ -0,0 +1,274 @@
+"""
+Snapshot Store Module
+Persists zone records in SQLite so they survive restarts and outages
+"""
+import json
+import os
+import threading
+import time
+
+from config import SNAPSHOT_DB
+from .dns_record import DNSRecord
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS zones (
+    zone_id         TEXT PRIMARY KEY,
+    synced_at       REAL NOT NULL,
+    records         INTEGER NOT NULL,
+    full_synced_at  REAL,
+    watermark       TEXT
+);
+CREATE TABLE IF NOT EXISTS records (
+    zone_id     TEXT NOT NULL,
+    id          TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    type        TEXT NOT NULL,
+    content     TEXT,
+    proxied     INTEGER NOT NULL DEFAULT 0,
+    modified_on TEXT,
+    data        TEXT NOT NULL,
+    PRIMARY KEY (zone_id, id)
+);
+CREATE INDEX IF NOT EXISTS records_name ON records (zone_id, name);
+CREATE INDEX IF NOT EXISTS records_type ON records (zone_id, type);
+CREATE INDEX IF NOT EXISTS records_content ON records (zone_id, content);
+"""
+
+# Columns added to the zones table after its first release
+ZONE_COLUMNS = (("full_synced_at", "REAL"), ("watermark", "TEXT"))
+
+
+def _row(zone_id, record):
+    """Flatten a record into a records table row"""
+    return (
+        zone_id,
+        record['id'],
+        (record.get('name') or '').lower().rstrip('.'),
+        record.get('type') or '',
+        record.get('content'),
+        1 if record.get('proxied') else 0,
+        record.get('modified_on'),
+        json.dumps(dict(record), separators=(',', ':'))
+    )
+
+
+def _require_zone(zone_id):
+    """Refuse to write rows that could never be read back under a zone"""
+    if not zone_id:
+        raise ValueError("no zone ID given (set ZONE_ID or pass zone_id)")
+
+
+class SnapshotStore:
+    """
+    SQLite copy of each zone's last complete listing
+
+    A full listing replaces the zone's rows in one transaction; our own
+    writes are applied row by row. Lookups by name, type and content use
+    indexes, so they stay fast on zones with tens of thousands of records.
+    The database is opened on first use.
+    """
+
+    def __init__(self, path=SNAPSHOT_DB):
+        """
+        Args:
+            path (str): Database file, "~" expanded (empty disables persistence)
+        """
+        self.path = os.path.expanduser(path) if path else path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """Whether snapshots are persisted at all"""
+        return bool(self.path)
+
+    def _connection(self):
+        """Open the database and create the schema on first use"""
+        if self._conn is None:
+            import sqlite3
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(zones)")}
+            for column, column_type in ZONE_COLUMNS:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE zones ADD COLUMN {column} {column_type}")
+            self._conn = conn
+        return self._conn
+
+    def save_zone(self, zone_id, records, watermark=None):
+        """
+        Replace a zone's snapshot with a complete listing
+
+        Args:
+            zone_id (str): Zone ID
+            records (iterable): Every record in the zone
+            watermark (str): Newest modified_on among the records (optional)
+
+        Raises:
+            ValueError: If no zone ID is given
+        """
+        _require_zone(zone_id)
+        rows = [_row(zone_id, record) for record in records if record.get('id')]
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM records WHERE zone_id = ?", (zone_id,))
+                conn.executemany("INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.execute("INSERT OR REPLACE INTO zones (zone_id, synced_at, records, full_synced_at, watermark) "
+                             "VALUES (?, ?, ?, ?, ?)", (zone_id, now, len(rows), now, watermark))
+
+    def save_changes(self, zone_id, records, watermark):
+        """
+        Apply an incremental sync to a saved zone
+
+        Args:
+            zone_id (str): Zone ID
+            records (list): Records modified since the previous watermark
+            watermark (str): Newest modified_on seen so far
+
+        Raises:
+            ValueError: If no zone ID is given
+        """
+        _require_zone(zone_id)
+        rows = [_row(zone_id, record) for record in records if record.get('id')]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.execute("UPDATE zones SET synced_at = ?, watermark = ?, "
+                             "records = (SELECT COUNT(*) FROM records WHERE zone_id = ?) WHERE zone_id = ?",
+                             (time.time(), watermark, zone_id, zone_id))
+
+    def sync_state(self, zone_id):
+        """
+        Incremental sync bookkeeping of a saved zone
+
+        Returns:
+            tuple: (synced_at, full_synced_at, watermark), or None if the zone was never saved
+        """
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT synced_at, full_synced_at, watermark FROM zones WHERE zone_id = ?", (zone_id,)).fetchone()
+        return tuple(row) if row else None
+
+    def upsert(self, zone_id, record):
+        """Insert or update one record of a saved zone"""
+        _require_zone(zone_id)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                if conn.execute("SELECT 1 FROM zones WHERE zone_id = ?", (zone_id,)).fetchone():
+                    conn.execute("INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                 _row(zone_id, record))
+
+    def upsert_many(self, zone_id, records):
+        """Insert or update several records of a saved zone in one transaction"""
+        _require_zone(zone_id)
+        rows = [_row(zone_id, record) for record in records if record.get('id')]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                if conn.execute("SELECT 1 FROM zones WHERE zone_id = ?", (zone_id,)).fetchone():
+                    conn.executemany("INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def delete(self, zone_id, record_id):
+        """Remove one record of a saved zone"""
+        _require_zone(zone_id)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM records WHERE zone_id = ? AND id = ?", (zone_id, record_id))
+
+    def drop_zone(self, zone_id=None):
+        """Delete one zone's snapshot, or every snapshot when no ID is given"""
+        where, args = ("WHERE zone_id = ?", (zone_id,)) if zone_id else ("", ())
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(f"DELETE FROM records {where}", args)
+                conn.execute(f"DELETE FROM zones {where}", args)
+
+    def synced_at(self, zone_id):
+        """
+        Time the zone's snapshot was last brought up to date
+
+        Returns:
+            float: Unix timestamp, or None if the zone was never saved
+        """
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT synced_at FROM zones WHERE zone_id = ?", (zone_id,)).fetchone()
+        return row[0] if row else None
+
+    def load_zone(self, zone_id):
+        """
+        Load a zone's saved records
+
+        Returns:
+            list: DNSRecord objects, or None if the zone was never saved
+        """
+        with self._lock:
+            conn = self._connection()
+            if not conn.execute("SELECT 1 FROM zones WHERE zone_id = ?", (zone_id,)).fetchone():
+                return None
+            rows = conn.execute("SELECT data FROM records WHERE zone_id = ?", (zone_id,)).fetchall()
+        return [DNSRecord(json.loads(data)) for data, in rows]
+
+    def find(self, zone_id, name=None, record_type=None, content=None):
+        """
+        Look records up through the indexes
+
+        Args:
+            zone_id (str): Zone ID
+            name (str): Record name (optional)
+            record_type (str): Record type (optional)
+            content (str): Record content (optional)
+
+        Returns:
+            list: Matching DNSRecord objects
+        """
+        clauses, params = ["zone_id = ?"], [zone_id]
+        if name is not None:
+            clauses.append("name = ?")
+            params.append(name.lower().rstrip('.'))
+        if record_type is not None:
+            clauses.append("type = ?")
+            params.append(record_type)
+        if content is not None:
+            clauses.append("content = ?")
+            params.append(content)
+
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT data FROM records WHERE {' AND '.join(clauses)}", params).fetchall()
+        return [DNSRecord(json.loads(data)) for data, in rows]
+
+    def count_by_type(self, zone_id):
+        """
+        Count a zone's saved records per type
+
+        Returns:
+            dict: {record type: count}
+        """
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT type, COUNT(*) FROM records WHERE zone_id = ? GROUP BY type", (zone_id,)).fetchall()
+        return dict(rows)
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Create instance for easy importing
+snapshot_store = SnapshotStore()
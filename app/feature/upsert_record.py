@@ -0,0 +1,297 @@
+"""
+DNS Record Upsert Module
+Creates A/AAAA/CNAME records or brings existing ones up to date, idempotently
+"""
+from .base_api import CloudflareAPIError
+from .batch_record import BatchWriter
+from .bulk import BulkExecutor, BulkResult
+from .operation_stream import OperationError, validate_operation
+from .query_record import QueryRecord
+from .reconcile import MANAGED_FIELDS, _qualify, compute_plan, normalize_content
+from .zone_snapshot import normalize_name
+
+# Record types that can be upserted
+UPSERT_TYPES = ("A", "AAAA", "CNAME")
+
+
+def _desired(record, zone=None):
+    """
+    Validate a record to upsert and keep the fields that are compared
+
+    Args:
+        record (dict): Record with type, name and content, plus optional fields
+        zone (str): Zone apex that a relative name is qualified against (optional)
+
+    Raises:
+        OperationError: If the record is incomplete or malformed
+    """
+    record_type = str(record.get('type') or '').upper()
+    if record_type not in UPSERT_TYPES:
+        raise OperationError(f"cannot upsert {record_type or 'untyped'} records (expected one of: "
+                             f"{', '.join(UPSERT_TYPES)})")
+    validate_operation(dict(record, op="add"))
+    desired = {field: record[field] for field in MANAGED_FIELDS if record.get(field) is not None}
+    desired.update(type=record_type, name=_qualify(record['name'], zone))
+    return desired
+
+
+def _conflict(desired, types):
+    """
+    Why a record cannot be created next to the record types already at its name
+
+    A CNAME cannot share its name with any other record, so the API would
+    reject the write (and, in a batch, every write sent with it).
+
+    Returns:
+        str: Reason, or None when there is no conflict
+    """
+    if desired['type'] == "CNAME":
+        others = sorted(set(types) - {"CNAME"})
+        if others:
+            return f"{desired['name']} already has {', '.join(others)} records"
+    elif "CNAME" in types:
+        return f"{desired['name']} is a CNAME record"
+    return None
+
+
+def _matches(desired, record):
+    """Whether a live record already holds every value of a desired record"""
+    return (record.get('type') == desired['type']
+            and normalize_content(desired['type'], record.get('content'))
+            == normalize_content(desired['type'], desired['content'])
+            and all(record.get(field) == value for field, value in desired.items() if field not in
+                    ('type', 'name', 'content')))
+
+
+def _label(desired):
+    """Label a record for result summaries"""
+    return f"{desired['type']} {desired['name']}"
+
+
+class UpsertRecord(QueryRecord):
+    """
+    Create records that are missing and update the fields that differ
+
+    Records are matched by name and type. A record already holding the
+    requested content is kept and only its other fields are compared;
+    otherwise the single record of that type at the name is updated in
+    place, and a new record is created when there is none (or when the
+    name holds a round-robin set none of which matches). Fields left out
+    of a request are never changed. Running the same upsert twice sends
+    no write the second time. Relative names ("www", "@") are qualified
+    against the zone apex before they are looked up.
+    """
+
+    def __init__(self, *args, executor=None, **kwargs):
+        """
+        Args:
+            executor (BulkExecutor): Executor collecting bulk outcomes (optional)
+            *args, **kwargs: Zone and shared pool, cache, limiter, retry and breaker (see CloudflareAPIClient)
+        """
+        super().__init__(*args, **kwargs)
+        self.executor = executor or BulkExecutor()
+        self._apexes = {}
+
+    def upsert(self, record_type, name, content, ttl=None, proxied=None, comment=None):
+        """
+        Make sure a record exists with the given values
+
+        The name is looked up in the zone cache while it is fresh, otherwise
+        with one filtered request; at most one write follows.
+
+        Args:
+            record_type (str): A, AAAA or CNAME
+            name (str): Fully qualified record name, or one relative to the zone apex
+            content (str): IP address or CNAME target
+            ttl (int): Time to live in seconds, 1 for automatic (optional)
+            proxied (bool): Whether to proxy through Cloudflare (optional)
+            comment (str): Record comment (optional)
+
+        Returns:
+            str: "created", "updated" or "unchanged"; None if the upsert failed
+        """
+        try:
+            desired = _desired({"type": record_type, "name": name, "content": content, "ttl": ttl,
+                                "proxied": proxied, "comment": comment}, self._zone_apex())
+            # An empty answer to a failed lookup would lead to a duplicate create
+            live = self.fetch_records_by_name(desired['name'])
+            conflict = _conflict(desired, {record.get('type') for record in live})
+            if conflict:
+                raise OperationError(conflict)
+
+            plan = compute_plan([desired], [record for record in live if record.get('type') == desired['type']])
+            if plan.creates:
+                return self._create(desired)
+            if plan.updates:
+                return self._update(*plan.updates[0])
+            self._log_success("checked record", "%s is up to date", _label(desired))
+            return "unchanged"
+
+        except Exception as e:
+            if not isinstance(e, CloudflareAPIError):
+                self._log_error("upserting record", error=e)
+            return None
+
+    def upsert_subdomain(self, name, ip_address, ttl=3600, proxied=False):
+        """
+        Create or update an A record, mirroring AddRecord.add_subdomain
+
+        Returns:
+            str: "created", "updated" or "unchanged"; None if the upsert failed
+        """
+        return self.upsert("A", name, ip_address, ttl=ttl, proxied=proxied)
+
+    def upsert_cname_record(self, name, target, ttl=3600, proxied=False):
+        """
+        Create or update a CNAME record, mirroring AddRecord.add_cname_record
+
+        Returns:
+            str: "created", "updated" or "unchanged"; None if the upsert failed
+        """
+        return self.upsert("CNAME", name, target, ttl=ttl, proxied=proxied)
+
+    def upsert_many(self, records, max_batch_size=None):
+        """
+        Upsert many records with one zone listing and batched writes
+
+        The zone snapshot is listed once (or reused while the cache is
+        fresh) and every record is matched against it locally. Only the
+        creates and updates that remain are sent, through the batch
+        endpoint; records that already match are skipped without a request.
+        Records that are malformed, repeat an earlier one or would clash
+        with a CNAME fail on their own before anything is queued.
+
+        Args:
+            records (iterable): Record dicts with type, name and content, plus optional ttl, proxied and comment
+            max_batch_size (int): Changes per batch call (default: BATCH_MAX_SIZE)
+
+        Returns:
+            BulkResult: Succeeded ("create ..."/"update ..."), failed and skipped records
+        """
+        records = list(records)
+        result = BulkResult(len(records))
+        valid = []
+        for record in records:
+            try:
+                valid.append(_desired(record))
+            except Exception as e:
+                result.failed.append((f"{record.get('type')} {record.get('name')}", str(e)))
+        if not valid:
+            return result
+
+        try:
+            snapshot = self.get_zone_snapshot()
+            zone = self._zone_apex(snapshot) if snapshot is not None else None
+        except CloudflareAPIError:
+            snapshot = None
+        if snapshot is None:
+            result.failed.extend((_label(desired), "cannot list the zone to look records up") for desired in valid)
+            return result
+
+        groups = {}
+        for desired in valid:
+            desired['name'] = _qualify(desired['name'], zone)
+            group = groups.setdefault(desired['name'], [])
+            if desired in group:
+                result.skipped.append((_label(desired), "duplicate of an earlier record"))
+            else:
+                group.append(desired)
+
+        changes = []
+        for name, group in groups.items():
+            live = snapshot.find_by_name(name)
+            types = {record.get('type') for record in live}
+            accepted = []
+            for desired in group:
+                conflict = _conflict(desired, types) or self._repeated_cname(desired, accepted)
+                if conflict:
+                    result.failed.append((_label(desired), conflict))
+                    continue
+                types.add(desired['type'])
+                accepted.append(desired)
+
+            plan = compute_plan(accepted, [record for record in live if record.get('type') in UPSERT_TYPES])
+            changes.extend(("update", change) for change in plan.updates)
+            changes.extend(("create", desired) for desired in plan.creates)
+            if plan.unchanged:
+                result.skipped.extend((_label(desired), "already up to date")
+                                      for desired in accepted if any(_matches(desired, record) for record in live))
+
+        if changes:
+            with BatchWriter(max_batch_size=max_batch_size, **self.shared_options()) as writer:
+                applied = self.executor.run_batched(changes, lambda change: self._enqueue(writer, change), writer,
+                                                    describe=self._describe_change)
+            result.succeeded.extend(applied.succeeded)
+            result.failed.extend(applied.failed)
+            result.elapsed = applied.elapsed
+        return result
+
+    def _zone_apex(self, records=()):
+        """
+        Zone apex that relative record names are qualified against
+
+        Taken from the zone_name of a listed record when there is one,
+        otherwise from one zone details request, and remembered per zone.
+
+        Raises:
+            CloudflareAPIError: If the zone details cannot be retrieved
+        """
+        apex = self._apexes.get(self.zone_id)
+        if apex is None:
+            apex = next((record.get('zone_name') for record in records if record.get('zone_name')), None)
+            if apex is None:
+                response = self._request("GET", f"/zones/{self.zone_id}")
+                if response.status_code != 200:
+                    self._log_error("looking up zone", response)
+                    raise CloudflareAPIError("looking up zone", response)
+                apex = (response.json().get('result') or {}).get('name')
+            apex = self._apexes[self.zone_id] = normalize_name(apex)
+        return apex
+
+    def _create(self, desired):
+        """POST a missing record"""
+        response = self._make_request("POST", "", desired)
+        if response.status_code not in (200, 201):
+            self._log_error("upserting record", response)
+            raise CloudflareAPIError("creating record", response)
+        self.cache.store(self.zone_id, response.json().get('result'))
+        self._log_success("created record", "%s -> %s", _label(desired), desired['content'],
+                          record_id=(response.json().get('result') or {}).get('id'))
+        return "created"
+
+    def _update(self, live, changes):
+        """PATCH only the fields of a record that differ"""
+        response = self._make_request("PATCH", f"/{live['id']}", changes, idempotent=True)
+        if response.status_code != 200:
+            self._log_error("upserting record", response, record_id=live['id'])
+            raise CloudflareAPIError("updating record", response)
+        self.cache.store(self.zone_id, response.json().get('result'))
+        self._log_success("updated record", "%s (%s)", live['name'], ", ".join(changes), record_id=live['id'])
+        return "updated"
+
+    @staticmethod
+    def _repeated_cname(desired, accepted):
+        """A name holds one CNAME, so a second CNAME for it in the same run is refused"""
+        if desired['type'] == "CNAME" and any(other['type'] == "CNAME" for other in accepted):
+            return f"{desired['name']} is given more than one CNAME target"
+        return None
+
+    @staticmethod
+    def _enqueue(writer, change):
+        """Queue one planned change on the batch writer"""
+        action, payload = change
+        if action == "update":
+            record, fields = payload
+            return writer.patch(record['id'], fields)
+        return writer.post(payload)
+
+    @staticmethod
+    def _describe_change(change):
+        """Label a planned change for the result summary"""
+        action, payload = change
+        record = payload[0] if action == "update" else payload
+        return f"{action} {record['type']} {normalize_name(record['name'])}"
+
+
+# Create instance for easy importing
+upsert_record_service = UpsertRecord()
@@ -0,0 +1,297 @@
+"""
+Zone File Module
+Streaming BIND zone-file parser and formatter for DNS record dicts
+"""
+from .zone_snapshot import normalize_name
+
+# Record types whose content (or target) is a hostname
+HOSTNAME_TYPES = ("CNAME", "NS", "PTR", "MX", "SRV")
+
+# Record types Cloudflare can proxy
+PROXIABLE_TYPES = ("A", "AAAA", "CNAME")
+
+# Classes accepted in the class column
+CLASSES = ("IN", "CH", "HS")
+
+# Multipliers for BIND TTL units such as 1h30m
+TTL_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+# Longest character-string allowed in one TXT chunk
+TXT_CHUNK_SIZE = 255
+
+
+class ZoneFileError(ValueError):
+    """Raised when a zone file line cannot be parsed"""
+
+    def __init__(self, line_number, message):
+        self.line_number = line_number
+        super().__init__(f"line {line_number}: {message}")
+
+
+def parse_ttl(value):
+    """
+    Parse a BIND TTL such as 300, 1h or 1h30m
+
+    Returns:
+        int: TTL in seconds, or None if the value is not a TTL
+    """
+    if value.isdigit():
+        return int(value)
+    total = 0
+    number = ""
+    for char in value.lower():
+        if char.isdigit():
+            number += char
+        elif char in TTL_UNITS and number:
+            total += int(number) * TTL_UNITS[char]
+            number = ""
+        else:
+            return None
+    return None if number else total
+
+
+def _tokenize(line):
+    """
+    Split a line into tokens, dropping its comment
+
+    Returns:
+        tuple: (tokens as (text, quoted) pairs, comment text, parenthesis depth change)
+    """
+    # Fast path for the common line with nothing to unquote
+    if '"' not in line and ';' not in line and '(' not in line and ')' not in line:
+        return [(token, False) for token in line.split()], "", 0
+
+    tokens = []
+    depth = 0
+    current = []
+    quoted = False
+    in_quotes = False
+    escaped = False
+    for index, char in enumerate(line):
+        if in_quotes:
+            if escaped:
+                current.append(char)
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_quotes = False
+            else:
+                current.append(char)
+            continue
+        if char == ';':
+            if current or quoted:
+                tokens.append(("".join(current), quoted))
+            return tokens, line[index + 1:].strip(), depth
+        if char == '"':
+            in_quotes = True
+            quoted = True
+        elif char in '()' or char.isspace():
+            if current or quoted:
+                tokens.append(("".join(current), quoted))
+                current, quoted = [], False
+            depth += 1 if char == '(' else -1 if char == ')' else 0
+        else:
+            current.append(char)
+    if current or quoted:
+        tokens.append(("".join(current), quoted))
+    return tokens, "", depth
+
+
+def _qualify(name, origin):
+    """Turn a zone-file name into a lowercase FQDN without the trailing dot"""
+    if name == '@':
+        if not origin:
+            raise ValueError("'@' used without an $ORIGIN")
+        return origin
+    if name.endswith('.'):
+        return normalize_name(name)
+    if not origin:
+        raise ValueError(f"relative name '{name}' used without an $ORIGIN")
+    return normalize_name(f"{name}.{origin}")
+
+
+def _logical_lines(lines):
+    """Join parenthesised continuation lines, yielding (line number, starts indented, tokens, comment)"""
+    pending = None
+    for number, line in enumerate(lines, 1):
+        tokens, comment, depth = _tokenize(line.rstrip('\r\n'))
+        if pending is not None:
+            pending[2].extend(tokens)
+            pending[3] = comment or pending[3]
+            pending[4] += depth
+            if pending[4] <= 0:
+                yield tuple(pending[:4])
+                pending = None
+            continue
+        if not tokens:
+            continue
+        entry = [number, line[:1].isspace(), tokens, comment, depth]
+        if depth > 0:
+            pending = entry
+        else:
+            yield tuple(entry[:4])
+    if pending is not None:
+        raise ZoneFileError(pending[0], "unbalanced parentheses")
+
+
+def parse_zone_file(lines, origin=None, default_ttl=None):
+    """
+    Parse a BIND zone file into Cloudflare record dicts
+
+    Handles $ORIGIN and $TTL, comments, parenthesised continuations,
+    quoted strings, omitted owners, TTLs with units and the class column
+    in either position. SOA records are skipped since Cloudflare manages
+    them. Proxy state is read from Cloudflare's ``cf_tags=cf-proxied:``
+    comments. Records are yielded as they are parsed.
+
+    Args:
+        lines (iterable): Lines of the zone file, e.g. an open file
+        origin (str): Zone apex used for relative names (optional)
+        default_ttl (int): TTL for records without one (optional)
+
+    Yields:
+        dict: Record data with type, name, content and, when known, ttl, priority and proxied
+
+    Raises:
+        ZoneFileError: If a line cannot be parsed
+    """
+    origin = normalize_name(origin) or None
+    owner = None
+    last_ttl = default_ttl
+
+    for number, indented, tokens, comment in _logical_lines(lines):
+        try:
+            texts = [text for text, _ in tokens]
+            directive = texts[0].upper()
+            if directive == '$ORIGIN':
+                origin = normalize_name(texts[1])
+                continue
+            if directive == '$TTL':
+                last_ttl = default_ttl = parse_ttl(texts[1])
+                continue
+            if directive.startswith('$'):
+                raise ValueError(f"unsupported directive {texts[0]}")
+
+            if not indented:
+                owner = _qualify(texts[0], origin)
+                tokens = tokens[1:]
+            elif owner is None:
+                raise ValueError("record without an owner name")
+
+            ttl = None
+            while tokens:
+                text = tokens[0][0]
+                if text.upper() in CLASSES:
+                    tokens = tokens[1:]
+                elif ttl is None and parse_ttl(text) is not None:
+                    ttl = parse_ttl(text)
+                    tokens = tokens[1:]
+                else:
+                    break
+            if len(tokens) < 2:
+                raise ValueError("missing record type or data")
+
+            record_type = tokens[0][0].upper()
+            if record_type == 'SOA':
+                continue
+            record = _build_record(record_type, owner, tokens[1:], origin)
+            ttl = ttl if ttl is not None else last_ttl
+            if ttl is not None:
+                record['ttl'] = ttl
+                last_ttl = ttl if default_ttl is None else default_ttl
+            if 'cf-proxied:' in comment and record_type in PROXIABLE_TYPES:
+                record['proxied'] = 'cf-proxied:true' in comment
+            yield record
+
+        except (IndexError, ValueError) as e:
+            raise ZoneFileError(number, str(e) or "malformed record") from e
+
+
+def _build_record(record_type, name, rdata, origin):
+    """Map the data tokens of one record onto a Cloudflare record dict"""
+    texts = [text for text, _ in rdata]
+    record = {"type": record_type, "name": name}
+
+    if record_type == 'MX':
+        record['priority'] = int(texts[0])
+        record['content'] = _qualify(texts[1], origin)
+    elif record_type == 'SRV':
+        record['priority'] = int(texts[0])
+        record['content'] = f"{texts[1]} {texts[2]} {_qualify(texts[3], origin)}"
+    elif record_type in HOSTNAME_TYPES:
+        record['content'] = _qualify(texts[0], origin)
+    elif record_type in ('TXT', 'SPF'):
+        record['content'] = "".join(texts)
+    else:
+        record['content'] = " ".join(f'"{text}"' if quoted else text for text, quoted in rdata)
+    return record
+
+
+def _absolute(hostname):
+    """Hostname with the trailing dot zone files use for FQDNs"""
+    return hostname if hostname.endswith('.') else f"{hostname}."
+
+
+def _quote_txt(content):
+    """Quote TXT content, splitting it into 255-character strings"""
+    if content.startswith('"') and content.endswith('"') and len(content) > 1:
+        return content
+    escaped = content.replace('\\', '\\\\').replace('"', '\\"')
+    chunks = [escaped[start:start + TXT_CHUNK_SIZE] for start in range(0, len(escaped), TXT_CHUNK_SIZE)]
+    return " ".join(f'"{chunk}"' for chunk in chunks or [""])
+
+
+def format_record(record):
+    """
+    Render one record as a zone-file line
+
+    Args:
+        record (dict): Cloudflare record data
+
+    Returns:
+        str: Zone-file line without the trailing newline
+    """
+    record_type = record.get('type')
+    content = str(record.get('content', ''))
+
+    if record_type == 'MX':
+        rdata = f"{record.get('priority', 0)} {_absolute(content)}"
+    elif record_type == 'SRV' and len(content.split()) == 3:
+        weight, port, target = content.split()
+        rdata = f"{record.get('priority', 0)} {weight} {port} {_absolute(target)}"
+    elif record_type in HOSTNAME_TYPES:
+        rdata = _absolute(content)
+    elif record_type in ('TXT', 'SPF'):
+        rdata = _quote_txt(content)
+    else:
+        rdata = content
+
+    line = f"{_absolute(record.get('name', ''))}\t{record.get('ttl', 1)}\tIN\t{record_type}\t{rdata}"
+    if record_type in PROXIABLE_TYPES and 'proxied' in record:
+        line += f" ; cf_tags=cf-proxied:{'true' if record['proxied'] else 'false'}"
+    return line
+
+
+def write_zone_file(records, f, origin=None):
+    """
+    Stream records to an open file in zone-file format
+
+    Args:
+        records (iterable): Cloudflare record dicts
+        f: Text file opened for writing
+        origin (str): Zone apex written as $ORIGIN (optional)
+
+    Returns:
+        int: Number of records written
+    """
+    f.write(";; Exported by Cloudflare DNS Manager\n")
+    if origin:
+        f.write(f"$ORIGIN {_absolute(normalize_name(origin))}\n")
+
+    count = 0
+    for record in records:
+        f.write(format_record(record))
+        f.write("\n")
+        count += 1
+    return count
@@ -0,0 +1,137 @@
+"""
+Zone Snapshot Module
+Indexed in-memory view of a zone's DNS records
+"""
+from collections import defaultdict
+
+from .dns_record import DNSRecord
+
+
+def normalize_name(name):
+    """Normalize a DNS name for lookups: lowercase, no trailing dot"""
+    return (name or '').strip().lower().rstrip('.')
+
+
+class ZoneSnapshot:
+    """
+    DNS records of one zone with hash indexes
+
+    Records are kept as compact DNSRecord objects and indexed by FQDN,
+    type, content and proxied flag. Every index maps a key to the IDs of
+    all matching records (kept as dict keys so results come back in
+    insertion order), so names with several records (round-robin A
+    records, MX sets, ...) are fully represented. Index lookups are
+    O(1); ``find`` scans the smallest matching set.
+    """
+
+    def __init__(self, records=()):
+        self.records = {}
+        self._by_name = defaultdict(dict)
+        self._by_type = defaultdict(dict)
+        self._by_content = defaultdict(dict)
+        self._by_proxied = defaultdict(dict)
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(list(self.records.values()))
+
+    def __contains__(self, record_id):
+        return record_id in self.records
+
+    def get(self, record_id):
+        """Get a record by ID, or None"""
+        return self.records.get(record_id)
+
+    def add(self, record):
+        """Insert a record, replacing and re-indexing any previous version"""
+        record = DNSRecord.wrap(record)
+        record_id = record['id']
+        if record_id in self.records:
+            self.remove(record_id)
+
+        self.records[record_id] = record
+        for index, key in self._index_keys(record):
+            index[key][record_id] = None
+
+    def remove(self, record_id):
+        """
+        Remove a record and its index entries
+
+        Returns:
+            dict: The removed record, or None if it was not present
+        """
+        record = self.records.pop(record_id, None)
+        if record is None:
+            return None
+
+        for index, key in self._index_keys(record):
+            ids = index.get(key)
+            if ids is not None:
+                ids.pop(record_id, None)
+                if not ids:
+                    del index[key]
+        return record
+
+    def find_by_name(self, name):
+        """Get every record with the given FQDN"""
+        return self._records_for(self._by_name.get(normalize_name(name)))
+
+    def find_by_type(self, record_type):
+        """Get every record of the given type"""
+        return self._records_for(self._by_type.get((record_type or '').upper()))
+
+    def find_by_content(self, content):
+        """Get every record whose content (IP, target, text) matches exactly"""
+        return self._records_for(self._by_content.get(content))
+
+    def find_by_proxied(self, proxied):
+        """Get every record with the given proxy status"""
+        return self._records_for(self._by_proxied.get(bool(proxied)))
+
+    def find(self, name=None, record_type=None, content=None, proxied=None):
+        """
+        Get records matching every given criterion
+
+        Args:
+            name (str): FQDN (optional)
+            record_type (str): Record type (optional)
+            content (str): Exact content (optional)
+            proxied (bool): Proxy status (optional)
+
+        Returns:
+            list: Matching records
+        """
+        candidates = []
+        if name is not None:
+            candidates.append(self._by_name.get(normalize_name(name), {}))
+        if record_type is not None:
+            candidates.append(self._by_type.get(record_type.upper(), {}))
+        if content is not None:
+            candidates.append(self._by_content.get(content, {}))
+        if proxied is not None:
+            candidates.append(self._by_proxied.get(bool(proxied), {}))
+
+        if not candidates:
+            return list(self.records.values())
+
+        candidates.sort(key=len)
+        smallest, others = candidates[0], candidates[1:]
+        return self._records_for([record_id for record_id in smallest
+                                  if all(record_id in ids for ids in others)])
+
+    def _records_for(self, ids):
+        """Resolve a set of IDs to records"""
+        if not ids:
+            return []
+        return [self.records[record_id] for record_id in ids]
+
+    def _index_keys(self, record):
+        """Yield (index, key) pairs under which a record is indexed"""
+        yield self._by_name, normalize_name(record.get('name'))
+        yield self._by_type, (record.get('type') or '').upper()
+        yield self._by_content, record.get('content')
+        yield self._by_proxied, bool(record.get('proxied'))
@@ -0,0 +1,138 @@
+"""
+Zone Directory Module
+Lists the account's zones and resolves zone names to IDs
+"""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import PAGE_FETCH_WORKERS, ZONE_LIST_TTL
+from .base_api import CloudflareAPIClient, CloudflareAPIError
+from .zone_snapshot import normalize_name
+
+# Zone IDs are 32 lowercase hex characters
+ZONE_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+class ZoneDirectory(CloudflareAPIClient):
+    """
+    Cached view of the zones the API token can see
+
+    The /zones listing is loaded once and kept for ``ttl`` seconds, so
+    resolving many zone names costs a handful of requests in total.
+    """
+
+    # Largest page size accepted by the zones list endpoint
+    MAX_PAGE_SIZE = 50
+
+    def __init__(self, ttl=None, **kwargs):
+        """
+        Args:
+            ttl (float): Seconds the zone listing is reused (default: ZONE_LIST_TTL)
+            **kwargs: Shared pool, limiter, retry and breaker (see CloudflareAPIClient)
+        """
+        super().__init__(**kwargs)
+        self.ttl = ZONE_LIST_TTL if ttl is None else ttl
+        self._by_name = {}
+        self._by_id = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def list_zones(self, refresh=False):
+        """
+        List every zone visible to the API token
+
+        Args:
+            refresh (bool): Reload even if the cached listing is fresh
+
+        Returns:
+            list: Zone dicts (id, name, status, ...)
+
+        Raises:
+            CloudflareAPIError: If a page cannot be retrieved
+        """
+        with self._lock:
+            fresh = self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+            if fresh and not refresh:
+                return list(self._by_id.values())
+
+            zones, info = self._fetch_page(1)
+            total_pages = info.get('total_pages') or 1
+            if total_pages > 1:
+                workers = max(1, min(PAGE_FETCH_WORKERS, total_pages - 1))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for page_zones, _ in executor.map(self._fetch_page, range(2, total_pages + 1)):
+                        zones.extend(page_zones)
+
+            self._by_id = {zone['id']: zone for zone in zones}
+            self._by_name = {normalize_name(zone['name']): zone for zone in zones}
+            self._loaded_at = time.monotonic()
+            self._log_success("listed zones", f"{len(zones)} zones in {total_pages} pages")
+            return zones
+
+    def _fetch_page(self, page):
+        """Fetch one page of the zones listing"""
+        response = self._request("GET", "/zones", params={"page": page, "per_page": self.MAX_PAGE_SIZE})
+        if response.status_code != 200:
+            self._log_error("listing zones", response)
+            raise CloudflareAPIError(f"listing zones page {page}", response)
+
+        payload = response.json()
+        return payload.get('result') or [], payload.get('result_info') or {}
+
+    def resolve(self, zone):
+        """
+        Turn a zone name or ID into a zone ID
+
+        Args:
+            zone (str): Zone name (example.com) or 32-character zone ID
+
+        Returns:
+            str: Zone ID
+
+        Raises:
+            ValueError: If no visible zone has that name
+            CloudflareAPIError: If the zones listing fails
+        """
+        if ZONE_ID_PATTERN.fullmatch(zone):
+            return zone
+
+        name = normalize_name(zone)
+        self.list_zones()
+        match = self._by_name.get(name)
+        if match is None:
+            # The zone may have been added since the listing was cached
+            self.list_zones(refresh=True)
+            match = self._by_name.get(name)
+        if match is None:
+            raise ValueError(f"Zone '{zone}' not found")
+        return match['id']
+
+    def zone_name(self, zone_id):
+        """Zone name for an ID from the cached listing, or the ID itself if unknown"""
+        zone = self._by_id.get(zone_id)
+        return zone['name'] if zone else zone_id
+
+    def select(self, zones=None):
+        """
+        Resolve a selection of zones
+
+        Args:
+            zones (list): Zone names or IDs (default: every visible zone)
+
+        Returns:
+            list: (zone name, zone ID) tuples
+        """
+        if not zones:
+            return [(zone['name'], zone['id']) for zone in self.list_zones()]
+
+        selected = []
+        for zone in zones:
+            zone_id = self.resolve(zone)
+            selected.append((self.zone_name(zone_id) if zone_id == zone else normalize_name(zone), zone_id))
+        return selected
+
+
+# Create instance for easy importing
+zone_directory = ZoneDirectory()
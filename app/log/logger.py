@@ -1,13 +1,184 @@
+"""
+Application Logger
+Queue-backed logging: callers only enqueue records, a listener thread formats and writes them
+
+Messages use lazy %-formatting (``logger.info("Updated %s", name)``) so
+nothing is formatted for disabled levels, and enabled ones are formatted
+on the listener thread. Structured fields are attached with
+``extra={"operation": ..., "record_id": ...}`` and appear as keys in the
+JSON output (LOG_FORMAT=json).
+"""
+import atexit
+import json
 import logging
+import queue
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from config import LOG_FORMAT, LOG_LEVEL, LOG_SAMPLE_EVERY, LOG_SAMPLE_FIRST
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Structured fields callers attach with extra={...}
+EVENT_FIELDS = ("operation", "record_id", "method", "endpoint", "status", "latency_ms", "attempt", "delay",
+                "count")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the message and any structured fields"""
+
+    def format(self, record):
+        event = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in EVENT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                event[field] = value
+        if record.exc_info:
+            event["exception"] = self.formatException(record.exc_info)
+        return json.dumps(event, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread"""
+
+    listener = None
+
+    def prepare(self, record):
+        # Records stay in this process, so they need no pickling; the stock
+        # prepare() would format the message on the caller's thread
+        return record
+
+
+class RepeatSampler(logging.Filter):
+    """
+    Let the first few of each repeated message through, then one in every N
+
+    Messages are grouped by level, format string and operation, so lazily
+    formatted per-record messages ("Successfully %s: %s") count as repeats
+    whatever their arguments. ``suppressed()`` reports what was dropped.
+    """
+
+    def __init__(self, first=None, every=None):
+        """
+        Args:
+            first (int): Messages of each kind always logged (default: LOG_SAMPLE_FIRST)
+            every (int): Afterwards, log one in this many; 0 logs no more (default: LOG_SAMPLE_EVERY)
+        """
+        super().__init__()
+        self.first = LOG_SAMPLE_FIRST if first is None else first
+        self.every = LOG_SAMPLE_EVERY if every is None else every
+        self.counts = Counter()
+        self.examples = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.CRITICAL:
+            return True
+        key = (record.levelno, str(record.msg), getattr(record, 'operation', None))
+        with self._lock:
+            self.counts[key] += 1
+            count = self.counts[key]
+            if count == 1:
+                self.examples[key] = record
+        if count <= self.first:
+            return True
+        return bool(self.every) and (count - self.first) % self.every == 0
+
+    def suppressed(self):
+        """
+        Messages that were dropped
+
+        Returns:
+            list: (level, example message, operation, total seen, dropped) per kind of message
+        """
+        rows = []
+        with self._lock:
+            for key, count in self.counts.items():
+                logged = min(count, self.first)
+                if self.every:
+                    logged += max(count - self.first, 0) // self.every
+                if count > logged:
+                    level, _, operation = key
+                    rows.append((level, self.examples[key].getMessage(), operation, count, count - logged))
+        return rows
+
+
+@contextmanager
+def sampled_logging(first=None, every=None, target=None):
+    """
+    Sample repeated messages while the block runs, then log what was dropped
+
+    Meant for bulk jobs that log once per record. Also works as a decorator.
+
+    Args:
+        first (int): Messages of each kind always logged (default: LOG_SAMPLE_FIRST)
+        every (int): Afterwards, log one in this many (default: LOG_SAMPLE_EVERY)
+        target (logging.Logger): Logger to sample (default: the application logger)
+    """
+    target = target or logger
+    sampler = RepeatSampler(first, every)
+    target.addFilter(sampler)
+    try:
+        yield sampler
+    finally:
+        target.removeFilter(sampler)
+        for level, example, operation, total, dropped in sampler.suppressed():
+            target.log(level, "Suppressed %d of %d similar messages, e.g. %s", dropped, total, example,
+                       extra={"operation": operation, "count": total})
+
+
+def _stop_listener(handler):
+    """Drain the queue and stop the handler's listener thread"""
+    if handler.listener is not None:
+        handler.listener.stop()
+        handler.listener = None
+
+
+def flush_logs(target=None):
+    """Block until every queued record has been written"""
+    for handler in (target or logger).handlers:
+        if isinstance(handler, _DeferredQueueHandler) and handler.listener is not None:
+            handler.queue.join()
+
 
 # پیکربندی لاگر
-def setup_logger():
-    logger = logging.getLogger("CloudflareLogger")
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-    logger.setLevel(logging.INFO)
-    return logger
+def setup_logger(name="CloudflareLogger", level=None, fmt=None, stream=None):
+    """
+    Configure a logger that hands records to a background writer thread
+
+    Args:
+        name (str): Logger name
+        level (str): Level name (default: LOG_LEVEL)
+        fmt (str): "text" or "json" (default: LOG_FORMAT)
+        stream (file): Output stream (default: stderr)
+
+    Returns:
+        logging.Logger: Configured logger
+    """
+    target = logging.getLogger(name)
+    for handler in list(target.handlers):
+        if isinstance(handler, _DeferredQueueHandler):
+            _stop_listener(handler)
+        target.removeHandler(handler)
+
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter() if (fmt or LOG_FORMAT) == "json" else logging.Formatter(TEXT_FORMAT))
+    handler = _DeferredQueueHandler(queue.Queue())
+    handler.listener = QueueListener(handler.queue, output)
+    handler.listener.start()
+    atexit.register(_stop_listener, handler)
+
+    target.addHandler(handler)
+    target.setLevel((level or LOG_LEVEL).upper())
+    return target
+
 
 logger = setup_logger()
@@ -10,12 +10,27 @@ from typing import Optional, List, Dict, Any
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from config import BATCH_WRITES
 from app.feature import (
+    AddRecord,
+    BatchWriter,
+    BulkExecutor,
+    DNSRecord,
+    DeleteRecord,
+    EditRecord,
+    ExportRecord,
+    ImportRecord,
+    QueryRecord,
+    SearchQuery,
     add_record_service,
     delete_record_service,
     edit_record_service,
-    query_record_service
+    export_record_service,
+    import_record_service,
+    query_record_service,
+    request_metrics
 )
+from app.feature.edit_record import changed_fields
 from app.log.logger import logger
 
 
@@ -24,11 +39,28 @@ class CloudflareDNSManager:
     Main DNS management class that orchestrates all DNS operations
     """
     
-    def __init__(self):
-        self.add_service = add_record_service
-        self.delete_service = delete_record_service
-        self.edit_service = edit_record_service
-        self.query_service = query_record_service
+    def __init__(self, zone_id=None):
+        """
+        Args:
+            zone_id (str): Zone to manage (default: ZONE_ID from the environment)
+        """
+        if zone_id:
+            self.add_service = AddRecord(zone_id=zone_id)
+            self.delete_service = DeleteRecord(zone_id=zone_id)
+            self.edit_service = EditRecord(zone_id=zone_id)
+            self.query_service = QueryRecord(zone_id=zone_id)
+            self.export_service = ExportRecord(zone_id=zone_id)
+            self.import_service = ImportRecord(zone_id=zone_id)
+        else:
+            self.add_service = add_record_service
+            self.delete_service = delete_record_service
+            self.edit_service = edit_record_service
+            self.query_service = query_record_service
+            self.export_service = export_record_service
+            self.import_service = import_record_service
+        self.zone_id = self.query_service.zone_id
+        self.bulk_executor = BulkExecutor(progress=self._print_progress)
+        self._bulk_metrics_start = None
         logger.info("Cloudflare DNS Manager initialized")
     
     def display_menu(self):
@@ -50,19 +82,22 @@ class CloudflareDNSManager:
         print("12. ❌ Delete record by name")
         print("13. 📈 Show DNS statistics")
         print("14. 🔧 Bulk operations")
+        print("15. 🔁 Refresh record cache")
+        print("16. 🧭 Advanced search")
         print("0.  🚪 Exit")
         print("="*50)
     
     def list_all_records(self):
         """List all DNS records with formatted output"""
         print("\n📋 Fetching all DNS records...")
-        records = self.query_service.list_all_records()
+        records = self.query_service.list_all_records(allow_stale=True)
         
         if not records:
             print("❌ No records found or error occurred")
             return
         
         self._display_records_table(records)
+        self._print_snapshot_age()
     
     def search_record_by_name(self):
         """Search for a specific record by name"""
@@ -72,13 +107,69 @@ class CloudflareDNSManager:
             return
         
         print(f"🔍 Searching for record: {name}")
-        record = self.query_service.get_record_by_name(name)
+        records = self.query_service.get_records_by_name(name)
         
-        if record:
-            self._display_single_record(record)
+        if len(records) == 1:
+            self._display_single_record(records[0])
+        elif records:
+            self._display_records_table(records)
         else:
             print(f"❌ Record '{name}' not found")
     
+    def advanced_search(self):
+        """Search records by several fields, filtered by Cloudflare where possible"""
+        print("\n🧭 Advanced search (leave a field empty to skip it)")
+        print("   Use * as a wildcard in names and content, e.g. api*, *.dev.example.com, *10.0.*")
+        match = "any" if input("Match any filter instead of all? (y/N): ").strip().lower() in ['y', 'yes'] else "all"
+        query = SearchQuery(match=match)
+        
+        for field in ("name", "content"):
+            pattern = input(f"{field.capitalize()}: ").strip()
+            if pattern:
+                query.where(field, *self._wildcard_predicate(pattern))
+        
+        record_type = input("Type (A, CNAME, TXT, ...): ").strip().upper()
+        if record_type:
+            query.where("type", "exact", record_type)
+        
+        proxied = input("Proxied (y/n): ").strip().lower()
+        if proxied:
+            query.where("proxied", "exact", proxied in ['y', 'yes'])
+        
+        comment = input("Comment contains: ").strip()
+        if comment:
+            query.where("comment", "contains", comment)
+        
+        tag = input("Tag (name:value, or name for any value): ").strip()
+        if tag:
+            query.where("tag", "exact" if ':' in tag else "present", tag)
+        
+        if not query.predicates:
+            print("❌ Enter at least one filter")
+            return
+        
+        order = input("Sort by (name/type/content/ttl/proxied): ").strip().lower()
+        if order:
+            query.order_by(order)
+        
+        records = self.query_service.search(query)
+        if records:
+            self._display_records_table(records)
+        else:
+            print("❌ No matching records found")
+    
+    @staticmethod
+    def _wildcard_predicate(pattern: str):
+        """Turn a * pattern into an (operator, value) search predicate"""
+        core = pattern.strip('*')
+        if pattern.startswith('*') and pattern.endswith('*') and len(pattern) > 1:
+            return "contains", core
+        if pattern.startswith('*'):
+            return "endswith", core
+        if pattern.endswith('*'):
+            return "startswith", core
+        return "exact", pattern
+    
     def search_record_by_id(self):
         """Search for a specific record by ID"""
         record_id = input("\n🔎 Enter record ID to search: ").strip()
@@ -104,7 +195,7 @@ class CloudflareDNSManager:
             return
         
         print(f"📊 Fetching {record_type} records...")
-        records = self.query_service.list_records_by_type(record_type)
+        records = self.query_service.list_records_by_type(record_type, allow_stale=True)
         
         if not records:
             print(f"❌ No {record_type} records found")
@@ -295,14 +386,24 @@ class CloudflareDNSManager:
             return
         
         # Show record details before deletion
-        record = self.query_service.get_record_by_name(record_name)
+        records = self.query_service.get_records_by_name(record_name)
+        record = records[0] if records else None
+        
+        if len(records) > 1:
+            self._display_records_table(records)
+            record_id = input("Several records share this name. Enter the ID to delete: ").strip()
+            record = next((r for r in records if r.get('id') == record_id), None)
+            if not record:
+                print(f"❌ Record with ID '{record_id}' is not one of them")
+                return
+        
         if record:
             print(f"Record to delete: {record.get('name')} ({record.get('type')}) -> {record.get('content')}")
             confirm = input("Are you sure? (y/N): ").strip().lower()
             
             if confirm in ['y', 'yes']:
                 print(f"❌ Deleting record {record_name}")
-                success = self.delete_service.delete_record_by_name(record_name)
+                success = self.delete_service.delete_subdomain(record['id'])
                 
                 if success:
                     print("✅ Record deleted successfully!")
@@ -318,22 +419,26 @@ class CloudflareDNSManager:
         print("\n📈 DNS Statistics")
         print("="*40)
         
-        records = self.query_service.list_all_records()
-        if not records:
-            print("❌ No records found")
-            return
-        
-        # Count records by type
+        # Count records by type while streaming the zone page by page
         type_counts = {}
         proxy_enabled = 0
-        total_records = len(records)
+        total_records = 0
         
-        for record in records:
-            record_type = record.get('type', 'Unknown')
-            type_counts[record_type] = type_counts.get(record_type, 0) + 1
-            
-            if record.get('proxied'):
-                proxy_enabled += 1
+        try:
+            for record in self.query_service.iter_records(allow_stale=True):
+                total_records += 1
+                record_type = record.type or 'Unknown'
+                type_counts[record_type] = type_counts.get(record_type, 0) + 1
+                
+                if record.proxied:
+                    proxy_enabled += 1
+        except Exception as e:
+            print(f"❌ Failed to fetch records: {str(e)}")
+            return
+        
+        if not total_records:
+            print("❌ No records found")
+            return
         
         print(f"📊 Total Records: {total_records}")
         print(f"🔄 Proxy Enabled: {proxy_enabled}")
@@ -343,8 +448,33 @@ class CloudflareDNSManager:
         for record_type, count in sorted(type_counts.items()):
             print(f"   {record_type}: {count}")
         
+        cache = self.query_service.cache.stats()
+        print(f"\n🗄️  Cache: {cache['hits']} hits, {cache['misses']} misses, {cache['refreshes']} refreshes")
+        self._print_snapshot_age()
+        self._print_api_usage()
         print("="*40)
     
+    def _print_snapshot_age(self):
+        """Tell the user when shown records come from an older listing"""
+        if self.query_service.cache.is_fresh(self.zone_id):
+            return
+        age = self.query_service.cache.snapshot_age(self.zone_id)
+        if age is not None:
+            print(f"🕒 Showing saved snapshot from {age / 60:.0f} min ago; refreshing in the background")
+    
+    def refresh_cache(self):
+        """Bring the record cache up to date with the zone"""
+        print("\n🔁 Refreshing record cache...")
+        result = self.query_service.sync()
+        
+        if result is None:
+            print("❌ Failed to refresh cache")
+        elif result["mode"] == "incremental":
+            print(f"✅ Cache synced: {result['changed']} changed records fetched in {result['requests']} requests "
+                  f"({result['records']} records in zone)")
+        else:
+            print(f"✅ Cache refreshed with {result['records']} records")
+    
     def bulk_operations(self):
         """Perform bulk operations"""
         print("\n🔧 Bulk Operations")
@@ -352,8 +482,9 @@ class CloudflareDNSManager:
         print("2. Enable proxy for all A records")
         print("3. Disable proxy for all A records")
         print("4. Update TTL for all records of specific type")
+        print("5. Import records from a BIND zone file")
         
-        choice = input("Select bulk operation (1-4): ").strip()
+        choice = input("Select bulk operation (1-5): ").strip()
         
         if choice == "1":
             self._export_records()
@@ -363,33 +494,84 @@ class CloudflareDNSManager:
             self._bulk_toggle_proxy("A", False)
         elif choice == "4":
             self._bulk_update_ttl()
+        elif choice == "5":
+            self._import_zone_file()
         else:
             print("❌ Invalid choice")
     
     def _export_records(self):
-        """Export all records to a file"""
-        records = self.query_service.list_all_records()
-        if not records:
+        """Export all records to a file in the chosen format"""
+        print("1. BIND zone file (can be imported again)")
+        print("2. JSON Lines")
+        print("3. CSV")
+        print("4. Readable text report")
+        choice = input("Select export format (1-4, default 1): ").strip() or "1"
+        
+        extensions = {"1": "zone", "2": "jsonl", "3": "csv"}
+        if choice == "4":
+            self._export_text_report()
+            return
+        if choice not in extensions:
+            print("❌ Invalid choice")
+            return
+        
+        compress = input("Compress with gzip? (y/N): ").strip().lower() in ['y', 'yes']
+        filename = f"dns_records_{self._get_timestamp()}.{extensions[choice]}" + (".gz" if compress else "")
+        count = self.export_service.export(filename)
+        
+        if count > 0:
+            print(f"✅ {count} records exported to {filename}")
+        elif count == 0:
+            os.remove(filename)
             print("❌ No records to export")
+        else:
+            print("❌ Failed to export records")
+    
+    def _import_zone_file(self):
+        """Import records from a BIND zone file"""
+        path = input("Enter zone file path: ").strip()
+        if not os.path.isfile(path):
+            print("❌ File not found")
+            return
+        
+        origin = input("Zone name for relative names (leave empty to use $ORIGIN): ").strip() or None
+        print("🔄 Importing zone file...")
+        summary = self.import_service.import_zone_file(path, origin=origin)
+        
+        if summary is None:
+            print("❌ Failed to import zone file")
             return
         
+        print(f"✅ Imported {summary['records']} records ({summary['mode']}): "
+              f"{summary['created']} created, {summary['updated']} updated, "
+              f"{summary['unchanged']} unchanged, {summary['failed']} failed")
+    
+    def _export_text_report(self):
+        """Export all records to a readable text file"""
         filename = f"dns_records_{self._get_timestamp()}.txt"
+        exported = 0
         
         try:
             with open(filename, 'w', encoding='utf-8') as f:
                 f.write("Cloudflare DNS Records Export\n")
                 f.write("="*50 + "\n\n")
                 
-                for record in records:
-                    f.write(f"Name: {record.get('name', 'N/A')}\n")
-                    f.write(f"Type: {record.get('type', 'N/A')}\n")
-                    f.write(f"Content: {record.get('content', 'N/A')}\n")
-                    f.write(f"TTL: {record.get('ttl', 'N/A')}\n")
-                    f.write(f"Proxied: {record.get('proxied', False)}\n")
-                    f.write(f"ID: {record.get('id', 'N/A')}\n")
-                    f.write("-" * 30 + "\n")
+                for record in self.query_service.iter_records():
+                    exported += 1
+                    f.write(f"Name: {record.get('name', 'N/A')}\n"
+                            f"Type: {record.get('type', 'N/A')}\n"
+                            f"Content: {record.get('content', 'N/A')}\n"
+                            f"TTL: {record.get('ttl', 'N/A')}\n"
+                            f"Proxied: {record.get('proxied', False)}\n"
+                            f"ID: {record.get('id', 'N/A')}\n"
+                            + "-" * 30 + "\n")
+            
+            if not exported:
+                os.remove(filename)
+                print("❌ No records to export")
+                return
             
-            print(f"✅ Records exported to {filename}")
+            print(f"✅ {exported} records exported to {filename}")
             
         except Exception as e:
             print(f"❌ Failed to export records: {str(e)}")
@@ -409,14 +591,12 @@ class CloudflareDNSManager:
             print("Operation cancelled")
             return
         
-        success_count = 0
-        for record in records:
-            record_id = record.get('id')
-            if record_id:
-                if self.edit_service.toggle_proxy(record_id, enable):
-                    success_count += 1
-        
-        print(f"✅ Successfully updated {success_count}/{len(records)} records")
+        result = self._run_bulk_update(
+            records,
+            {"proxied": enable},
+            lambda record: self.edit_service.toggle_proxy(record['id'], enable)
+        )
+        self._print_bulk_result(result)
     
     def _bulk_update_ttl(self):
         """Bulk update TTL for records of specific type"""
@@ -441,16 +621,96 @@ class CloudflareDNSManager:
             print("Operation cancelled")
             return
         
-        success_count = 0
-        for record in records:
-            record_id = record.get('id')
-            if record_id:
-                if self.edit_service.update_record_ttl(record_id, ttl):
-                    success_count += 1
-        
-        print(f"✅ Successfully updated {success_count}/{len(records)} records")
+        result = self._run_bulk_update(
+            records,
+            {"ttl": ttl},
+            lambda record: self.edit_service.update_record_ttl(record['id'], ttl)
+        )
+        self._print_bulk_result(result)
+    
+    def _run_bulk_update(self, records: List[Dict[str, Any]], changes: Dict[str, Any], action):
+        """
+        Apply the same change to many records
+        
+        Uses batch PATCH calls when BATCH_WRITES is enabled, otherwise runs
+        the per-record action on the bulk executor's worker pool. Records
+        that already have the requested values are skipped without a request.
+        """
+        self._bulk_metrics_start = request_metrics.snapshot()
+        should_skip = lambda record: self._skip_reason(record, changes)
+        if BATCH_WRITES:
+            with BatchWriter(**self.query_service.shared_options()) as writer:
+                return self.bulk_executor.run_batched(
+                    records,
+                    lambda record: writer.patch(record['id'], changes),
+                    writer,
+                    should_skip=should_skip
+                )
+        
+        return self.bulk_executor.run(records, action, should_skip=should_skip)
+    
+    @staticmethod
+    def _skip_reason(record: Dict[str, Any], changes: Dict[str, Any]) -> Optional[str]:
+        """Skip reason for records that cannot be addressed by ID, proxied, or would not change"""
+        if not record.get('id'):
+            return "missing record ID"
+        if changes.get('proxied') and record.get('proxiable') is False:
+            return "record type cannot be proxied"
+        if not changed_fields(record, changes):
+            return "already up to date"
+        return None
+    
+    def _print_progress(self, done: int, total: int, rate: float, eta: Optional[float]):
+        """Print a single updating progress line for bulk operations"""
+        eta_text = f"{eta:.0f}s" if eta is not None else "--"
+        percent = done / total if total else 1
+        end = "\n" if done >= total else ""
+        print(f"\r⏳ {done}/{total} ({percent:.0%}) | {rate:.1f} records/s | ETA {eta_text}   ", end=end, flush=True)
     
-    def _display_records_table(self, records: List[Dict[str, Any]]):
+    def _print_bulk_result(self, result):
+        """Print the succeeded/failed/skipped summary of a bulk operation"""
+        summary = result.summary()
+        print(f"✅ Succeeded: {summary['succeeded']}/{summary['total']} "
+              f"in {summary['elapsed']:.1f}s ({summary['throughput']:.1f} records/s)")
+        
+        skipped = [(label, reason) for label, reason in result.skipped if reason != "already up to date"]
+        unchanged = len(result.skipped) - len(skipped)
+        if unchanged:
+            print(f"💤 Already up to date: {unchanged} (no request sent)")
+        
+        if skipped:
+            print(f"⏭️  Skipped: {len(skipped)}")
+            for label, reason in skipped[:10]:
+                print(f"   - {label}: {reason}")
+        
+        if result.failed:
+            print(f"❌ Failed: {summary['failed']}")
+            for label, reason in result.failed[:10]:
+                print(f"   - {label}: {reason}")
+        
+        hidden = max(len(skipped) - 10, 0) + max(len(result.failed) - 10, 0)
+        if hidden:
+            print(f"   ... and {hidden} more (see log)")
+        
+        self._print_connection_stats()
+        self._print_api_usage(self._bulk_metrics_start)
+    
+    def _print_connection_stats(self):
+        """Print how often pooled HTTP connections were reused"""
+        stats = self.edit_service.get_connection_stats()
+        print(f"🔌 Connections: {stats['connections']} opened, "
+              f"{stats['reused']}/{stats['requests']} requests reused a connection "
+              f"({stats['reuse_ratio']:.0%})")
+    
+    def _print_api_usage(self, since=None):
+        """Print requests, retries, latency and traffic per API endpoint"""
+        lines = request_metrics.summary(since)
+        if lines:
+            print("📡 API calls:")
+            for line in lines:
+                print(f"   {line}")
+    
+    def _display_records_table(self, records: List[DNSRecord]):
         """Display records in a formatted table"""
         if not records:
             return
@@ -460,19 +720,19 @@ class CloudflareDNSManager:
         print(f"{'Name':<25} {'Type':<8} {'Content':<30} {'TTL':<8} {'Proxy':<8} {'ID':<20}")
         print("-" * 100)
         
-        for record in records:
-            name = record.get('name', 'N/A')[:24]
-            record_type = record.get('type', 'N/A')
-            content = record.get('content', 'N/A')[:29]
-            ttl = str(record.get('ttl', 'N/A'))
-            proxied = "Yes" if record.get('proxied') else "No"
-            record_id = record.get('id', 'N/A')[:19]
+        for record in map(DNSRecord.wrap, records):
+            name = (record.name or 'N/A')[:24]
+            record_type = record.type or 'N/A'
+            content = (record.content or 'N/A')[:29]
+            ttl = str(record.ttl or 'N/A')
+            proxied = "Yes" if record.proxied else "No"
+            record_id = (record.id or 'N/A')[:19]
             
             print(f"{name:<25} {record_type:<8} {content:<30} {ttl:<8} {proxied:<8} {record_id:<20}")
         
         print("-" * 100)
     
-    def _display_single_record(self, record: Dict[str, Any]):
+    def _display_single_record(self, record: DNSRecord):
         """Display detailed information for a single record"""
         print("\n📄 Record Details:")
         print("="*40)
@@ -499,7 +759,7 @@ class CloudflareDNSManager:
         try:
             while True:
                 self.display_menu()
-                choice = input("\n🎯 Enter your choice (0-14): ").strip()
+                choice = input("\n🎯 Enter your choice (0-16): ").strip()
                 
                 if choice == "0":
                     print("👋 Goodbye!")
@@ -532,6 +792,10 @@ class CloudflareDNSManager:
                     self.show_dns_statistics()
                 elif choice == "14":
                     self.bulk_operations()
+                elif choice == "15":
+                    self.refresh_cache()
+                elif choice == "16":
+                    self.advanced_search()
                 else:
                     print("❌ Invalid choice. Please try again.")
                 
@@ -540,17 +804,22 @@ class CloudflareDNSManager:
         except KeyboardInterrupt:
             print("\n\n👋 Application terminated by user")
         except Exception as e:
-            logger.error(f"Application error: {str(e)}")
+            logger.error("Application error: %s", e)
             print(f"❌ An error occurred: {str(e)}")
 
 
-def main():
-    """Application entry point"""
+def main(zone_id=None):
+    """
+    Application entry point
+    
+    Args:
+        zone_id (str): Zone to manage (default: ZONE_ID from the environment)
+    """
     try:
-        manager = CloudflareDNSManager()
+        manager = CloudflareDNSManager(zone_id)
         manager.run()
     except Exception as e:
-        logger.error(f"Failed to start application: {str(e)}")
+        logger.error("Failed to start application: %s", e)
         print(f"❌ Failed to start application: {str(e)}")
         sys.exit(1)
 
@@ -0,0 +1,4 @@
+"""
+Benchmarks
+Performance and memory measurements run against a local API emulator
+"""
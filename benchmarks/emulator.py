@@ -0,0 +1,379 @@
+"""
+Cloudflare API Emulator
+Local HTTP stand-in for the DNS records API, used by the benchmarks
+
+Implements the parts of the v4 API this project calls: the zones list,
+zone details, record listing with pagination, filters and ordering, single-record
+reads and writes, and the batch endpoint. Latency and 429 answers can be
+injected to reproduce a slow or throttling API.
+"""
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+API_PREFIX = "/client/v4"
+
+# Record types cycled through by make_record
+RECORD_TYPES = ("A", "AAAA", "CNAME", "TXT")
+
+
+def _timestamp():
+    """Current time in the API's ISO 8601 format"""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def make_record(zone_id, zone_name, index):
+    """
+    Build a record shaped like the ones the DNS records endpoint returns
+
+    Args:
+        zone_id (str): Zone ID
+        zone_name (str): Zone apex
+        index (int): Record number, used for the name and content
+
+    Returns:
+        dict: Record with every field the API sends
+    """
+    record_type = RECORD_TYPES[index % len(RECORD_TYPES)]
+    if record_type == "A":
+        content = f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}"
+    elif record_type == "AAAA":
+        content = f"2001:db8::{index:x}"
+    elif record_type == "CNAME":
+        content = f"origin-{index % 50}.{zone_name}"
+    else:
+        content = f'"v=spf1 include:_spf.{zone_name} ~all {index}"'
+    return {
+        "id": f"{index:032x}",
+        "zone_id": zone_id,
+        "zone_name": zone_name,
+        "name": f"host-{index}.{zone_name}",
+        "type": record_type,
+        "content": content,
+        "proxiable": record_type != "TXT",
+        "proxied": record_type != "TXT" and index % 3 == 0,
+        "ttl": 1 if index % 3 == 0 else 300,
+        "settings": {},
+        "meta": {"auto_added": False, "managed_by_apps": False, "managed_by_argo_tunnel": False,
+                 "source": "primary"},
+        "comment": None,
+        "tags": [],
+        "created_on": "2024-01-01T05:20:00.123456Z",
+        "modified_on": f"2024-03-{index % 28 + 1:02d}T05:20:00.123456Z",
+        "comment_modified_on": None,
+        "tags_modified_on": None,
+    }
+
+
+class _Zone:
+    """Records of one emulated zone, indexed by ID and name"""
+
+    def __init__(self, zone_id, name):
+        self.id = zone_id
+        self.name = name
+        self.records = {}
+        self.by_name = defaultdict(dict)
+
+    def put(self, record):
+        previous = self.records.get(record['id'])
+        if previous is not None:
+            self.by_name[previous['name']].pop(previous['id'], None)
+        self.records[record['id']] = record
+        self.by_name[record['name']][record['id']] = None
+
+    def remove(self, record_id):
+        record = self.records.pop(record_id, None)
+        if record is not None:
+            self.by_name[record['name']].pop(record_id, None)
+        return record
+
+
+def _matches(record, filters):
+    """Check a record against the list endpoint's filter parameters"""
+    for key, value in filters.items():
+        field, _, operator = key.partition('.')
+        if field == "proxied":
+            if record.get('proxied') != (value == "true"):
+                return False
+            continue
+        if field not in ("name", "type", "content", "comment"):
+            continue
+        actual = record.get(field) or ""
+        if field == "name":
+            actual, value = actual.lower(), value.lower()
+        if operator in ("", "exact") and actual != value:
+            return False
+        if operator == "contains" and value not in actual:
+            return False
+        if operator == "startswith" and not actual.startswith(value):
+            return False
+        if operator == "endswith" and not actual.endswith(value):
+            return False
+    return True
+
+
+class CloudflareEmulator:
+    """
+    In-process HTTP server that answers like the Cloudflare API
+
+    Example:
+        with CloudflareEmulator(latency=0.02) as api:
+            api.add_zone("example.com", records=10000)
+            client.base_url = api.url
+    """
+
+    # Largest page size the DNS records endpoint accepts
+    MAX_PAGE_SIZE = 5000
+
+    def __init__(self, latency=0.0, jitter=0.0, throttle=0.0, retry_after=0.05, seed=0):
+        """
+        Args:
+            latency (float): Seconds added to every answer
+            jitter (float): Extra random latency of up to this many seconds
+            throttle (float): Share of requests answered with 429 (0-1)
+            retry_after (float): Retry-After value sent with injected 429 answers
+            seed (int): Seed for the jitter and throttle choices
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle = throttle
+        self.retry_after = retry_after
+        self.zones = {}
+        self.requests = 0
+        self.throttled = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """API base URL to give the clients"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self):
+        """Start serving on a free local port"""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.emulator = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="cloudflare-emulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def add_zone(self, name, records=0, zone_id=None):
+        """
+        Create a zone filled with generated records
+
+        Args:
+            name (str): Zone apex
+            records (int): Number of records to generate
+            zone_id (str): Zone ID (default: derived from the name)
+
+        Returns:
+            str: Zone ID
+        """
+        zone_id = zone_id or uuid.uuid5(uuid.NAMESPACE_DNS, name).hex
+        zone = _Zone(zone_id, name)
+        for index in range(records):
+            zone.put(make_record(zone_id, name, index))
+        with self._lock:
+            self.zones[zone_id] = zone
+        return zone_id
+
+    def reset_counters(self):
+        """Zero the request and 429 counters"""
+        with self._lock:
+            self.requests = self.throttled = 0
+
+    def handle(self, method, path, query, body):
+        """
+        Answer one API request
+
+        Returns:
+            tuple: (status code, JSON payload, extra headers)
+        """
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+            throttled = self.throttle and self._random.random() < self.throttle
+            if throttled:
+                self.throttled += 1
+        if delay:
+            time.sleep(delay)
+        if throttled:
+            return 429, _error(10000, "Rate limited"), {"Retry-After": str(self.retry_after)}
+
+        if not path.startswith(API_PREFIX):
+            return 404, _error(7003, "No route for that URI"), {}
+        parts = [part for part in path[len(API_PREFIX):].split('/') if part]
+
+        if parts == ["zones"] and method == "GET":
+            return self._list_zones(query)
+        if len(parts) < 2 or parts[0] != "zones" or (len(parts) > 2 and parts[2] != "dns_records"):
+            return 404, _error(7003, "No route for that URI"), {}
+        zone = self.zones.get(parts[1])
+        if zone is None:
+            return 404, _error(1001, "Invalid zone identifier"), {}
+        if len(parts) == 2:
+            if method == "GET":
+                return 200, _success(self._zone_details(zone)), {}
+            return 405, _error(10000, "Method not allowed"), {}
+
+        with self._lock:
+            if len(parts) == 3:
+                if method == "GET":
+                    return self._list_records(zone, query)
+                if method == "POST":
+                    return 200, _success(self._create(zone, body)), {}
+            elif parts[3] == "batch" and method == "POST":
+                return self._batch(zone, body)
+            elif len(parts) == 4:
+                return self._record(zone, method, parts[3], body)
+        return 405, _error(10000, "Method not allowed"), {}
+
+    def _list_zones(self, query):
+        zones = [self._zone_details(zone) for zone in self.zones.values()]
+        return self._page(zones, query, 50)
+
+    @staticmethod
+    def _zone_details(zone):
+        return {"id": zone.id, "name": zone.name, "status": "active"}
+
+    def _list_records(self, zone, query):
+        filters = {key: value for key, value in query.items()
+                   if key not in ("page", "per_page", "order", "direction", "match", "tag_match")}
+        name = filters.pop("name", None) or filters.pop("name.exact", None)
+        if name is not None:
+            candidates = [zone.records[record_id] for record_id in zone.by_name.get(name.lower().rstrip('.'), ())]
+        else:
+            candidates = zone.records.values()
+        records = [record for record in candidates if _matches(record, filters)]
+
+        order = query.get("order")
+        if order:
+            records.sort(key=lambda record: (record.get(order) is None, record.get(order) or 0),
+                         reverse=query.get("direction") == "desc")
+        return self._page(records, query, self.MAX_PAGE_SIZE)
+
+    @staticmethod
+    def _page(items, query, max_page_size):
+        per_page = min(int(query.get("per_page", 100)), max_page_size)
+        page = max(int(query.get("page", 1)), 1)
+        total_pages = max((len(items) + per_page - 1) // per_page, 1)
+        chunk = list(items)[(page - 1) * per_page:page * per_page]
+        payload = _success(chunk)
+        payload["result_info"] = {"page": page, "per_page": per_page, "count": len(chunk),
+                                  "total_count": len(items), "total_pages": total_pages}
+        return 200, payload, {}
+
+    def _create(self, zone, body):
+        record = dict(body, id=uuid.uuid4().hex, zone_id=zone.id, zone_name=zone.name,
+                      created_on=_timestamp(), modified_on=_timestamp())
+        record.setdefault("ttl", 1)
+        record.setdefault("proxied", False)
+        zone.put(record)
+        return record
+
+    def _update(self, zone, record_id, body):
+        # PUT is applied like PATCH: the fields sent replace the stored ones
+        current = zone.records.get(record_id)
+        if current is None:
+            return None
+        record = dict(current, **{key: value for key, value in body.items() if key != 'id'})
+        record["modified_on"] = _timestamp()
+        zone.put(record)
+        return record
+
+    def _record(self, zone, method, record_id, body):
+        if method == "GET":
+            record = zone.records.get(record_id)
+        elif method in ("PUT", "PATCH"):
+            record = self._update(zone, record_id, body or {})
+        elif method == "DELETE":
+            record = zone.remove(record_id)
+            record = {"id": record_id} if record else None
+        else:
+            return 405, _error(10000, "Method not allowed"), {}
+        if record is None:
+            return 404, _error(81044, "Record does not exist."), {}
+        return 200, _success(record), {}
+
+    def _batch(self, zone, body):
+        body = body or {}
+        missing = [item['id'] for operation in ("deletes", "patches", "puts") for item in body.get(operation, ())
+                   if item.get('id') not in zone.records]
+        if missing:
+            # Batches are atomic: one bad item rejects the whole call
+            return 400, _error(81044, f"Record {missing[0]} does not exist."), {}
+        result = {
+            "deletes": [{"id": item['id']} for item in body.get("deletes", ()) if zone.remove(item['id'])],
+            "patches": [self._update(zone, item['id'], item) for item in body.get("patches", ())],
+            "puts": [self._update(zone, item['id'], item) for item in body.get("puts", ())],
+            "posts": [self._create(zone, item) for item in body.get("posts", ())],
+        }
+        return 200, _success(result), {}
+
+
+def _success(result):
+    return {"success": True, "errors": [], "messages": [], "result": result}
+
+
+def _error(code, message):
+    return {"success": False, "errors": [{"code": code, "message": message}], "messages": [], "result": None}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Route HTTP requests to the emulator"""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle hold the body back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _serve(self):
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            body = None
+
+        status, payload, headers = self.server.emulator.handle(self.command, url.path, query, body)
+        data = json.dumps(payload, separators=(',', ':')).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _serve
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Record Memory Benchmark
+Compares the memory held by raw API record dicts and DNSRecord objects
+
+Usage:
+    python benchmarks/record_memory.py --records 100000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.feature.dns_record import DNSRecord
+from benchmarks.emulator import make_record
+
+
+def api_page(count, zone_id="023e105f4ecef8ad9ca31a8372d0c353", zone_name="example.com"):
+    """Build a JSON list page shaped like the Cloudflare DNS records endpoint returns it"""
+    return json.dumps({"result": [make_record(zone_id, zone_name, i) for i in range(count)]})
+
+
+def measure(build, page):
+    """
+    Measure the memory retained by the records one representation builds
+
+    Returns:
+        dict: bytes retained, bytes per record and build time
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    records = build(page)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(records)
+    del records
+    return {"bytes": retained, "bytes_per_record": retained / count, "build_seconds": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare record dict and DNSRecord memory use")
+    parser.add_argument("--records", type=int, default=100000, help="Records to build (default: 100000)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    page = api_page(args.records)
+    results = {
+        "records": args.records,
+        "dict": measure(lambda text: json.loads(text)["result"], page),
+        "DNSRecord": measure(lambda text: [DNSRecord(record) for record in json.loads(text)["result"]], page),
+    }
+    results["saving"] = 1 - results["DNSRecord"]["bytes"] / results["dict"]["bytes"]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.records} records")
+    for name in ("dict", "DNSRecord"):
+        result = results[name]
+        print(f"  {name:<10} {result['bytes'] / 2 ** 20:8.1f} MiB  {result['bytes_per_record']:7.0f} B/record  "
+              f"built in {result['build_seconds']:.2f}s")
+    print(f"  DNSRecord uses {results['saving']:.0%} less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Measures the API client code paths against a local Cloudflare API emulator
+
+Every scenario goes through the real CloudflareAPIClient stack (session
+pool, rate limiter, retries, circuit breaker, batching); only the server
+is local. The client-side rate limiter is opened up so the numbers show
+what the code itself can do; injected 429 answers still exercise the
+Retry-After handling.
+
+Usage:
+    python benchmarks/run.py --sizes 100,1000,10000,100000 --latency 0.02 --output results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.feature import (
+    BatchWriter,
+    BulkExecutor,
+    CircuitBreaker,
+    EditRecord,
+    QueryRecord,
+    RateLimiter,
+    RetryPolicy,
+    ZoneCache,
+)
+from benchmarks.emulator import CloudflareEmulator
+
+SCENARIOS = ("list", "lookup", "single_write", "bulk_proxy", "bulk_ttl")
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))]
+
+
+def summarize(scenario, zone_size, operations, latencies, elapsed, emulator):
+    """
+    Build one result row
+
+    Returns:
+        dict: Scenario, zone size, operations, throughput, latency percentiles and request counts
+    """
+    return {
+        "scenario": scenario,
+        "zone_size": zone_size,
+        "operations": operations,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_per_s": round(operations / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        "requests": emulator.requests,
+        "throttled": emulator.throttled,
+    }
+
+
+def timed(function):
+    """Run a function and return (result, seconds)"""
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+
+class BenchmarkSuite:
+    """Runs the scenarios for one zone size"""
+
+    def __init__(self, emulator, zone_size, sample=200, write_limit=1000, repeat=3, seed=0):
+        """
+        Args:
+            emulator (CloudflareEmulator): Running emulator
+            zone_size (int): Records in the benchmark zone
+            sample (int): Lookups and single writes per scenario
+            write_limit (int): Records updated by the per-record bulk TTL scenario
+            repeat (int): Full listings per list scenario
+            seed (int): Seed for picking records
+        """
+        self.emulator = emulator
+        self.zone_size = zone_size
+        self.sample = sample
+        self.write_limit = write_limit
+        self.repeat = repeat
+        self.random = random.Random(seed)
+        self.zone_id = emulator.add_zone(f"bench-{zone_size}.example.com", records=zone_size)
+        self.records = list(emulator.zones[self.zone_id].records.values())
+        # Shared by every client of this run; opened up so pacing does not hide the code's cost
+        self.client_options = {
+            "zone_id": self.zone_id,
+            "base_url": emulator.url,
+            "cache": ZoneCache(ttl=0),
+            "limiter": RateLimiter(max_requests=10 ** 9, period=1, burst=10 ** 6),
+            "retry": RetryPolicy(),
+            "breaker": CircuitBreaker(),
+        }
+
+    def run(self, scenarios=SCENARIOS):
+        """Run the selected scenarios and return their result rows"""
+        results = []
+        for scenario in scenarios:
+            self.emulator.reset_counters()
+            results.append(getattr(self, f"bench_{scenario}")())
+        return results
+
+    def _pick(self, count):
+        return self.random.sample(self.records, min(count, len(self.records)))
+
+    def bench_list(self):
+        """List the whole zone with concurrent page fetches"""
+        service = QueryRecord(**self.client_options)
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(self.repeat):
+            count, elapsed = timed(lambda: sum(1 for _ in service.iter_records(use_cache=False)))
+            assert count == self.zone_size, f"Listed {count} of {self.zone_size} records"
+            latencies.extend(service.last_listing_stats["page_times"])
+        elapsed = time.perf_counter() - started
+        result = summarize("list", self.zone_size, self.zone_size * self.repeat, latencies, elapsed, self.emulator)
+        result["unit"] = "records (latency per page)"
+        return result
+
+    def bench_lookup(self):
+        """Look records up by name, one request each"""
+        service = QueryRecord(**self.client_options)
+        latencies = []
+        started = time.perf_counter()
+        for record in self._pick(self.sample):
+            found, elapsed = timed(lambda: service.get_records_by_name(record['name']))
+            assert found, f"{record['name']} not found"
+            latencies.append(elapsed)
+        return summarize("lookup", self.zone_size, len(latencies), latencies,
+                         time.perf_counter() - started, self.emulator)
+
+    def bench_single_write(self):
+        """Update the TTL of single records, one request each"""
+        service = EditRecord(**self.client_options)
+        latencies = []
+        started = time.perf_counter()
+        for record in self._pick(self.sample):
+            ok, elapsed = timed(lambda: service.update_record_ttl(record['id'], 600))
+            assert ok, f"Updating {record['id']} failed"
+            latencies.append(elapsed)
+        return summarize("single_write", self.zone_size, len(latencies), latencies,
+                         time.perf_counter() - started, self.emulator)
+
+    def bench_bulk_proxy(self):
+        """Toggle the proxy on every proxiable record through the batch endpoint"""
+        records = [record for record in self.records if record.get('proxiable')]
+        latencies = []
+
+        def patch(writer, record):
+            submitted = time.perf_counter()
+            future = writer.patch(record['id'], {"proxied": not record.get('proxied')})
+            future.add_done_callback(lambda _: latencies.append(time.perf_counter() - submitted))
+            return future
+
+        executor = BulkExecutor()
+        started = time.perf_counter()
+        with BatchWriter(**self.client_options) as writer:
+            result = executor.run_batched(records, lambda record: patch(writer, record), writer)
+        elapsed = time.perf_counter() - started
+        assert not result.failed, f"{len(result.failed)} batched updates failed"
+        row = summarize("bulk_proxy", self.zone_size, len(records), latencies, elapsed, self.emulator)
+        row["unit"] = "records (latency from queueing to batch answer)"
+        return row
+
+    def bench_bulk_ttl(self):
+        """Update the TTL of many records with per-record requests on the worker pool"""
+        service = EditRecord(**self.client_options)
+        records = self.records[:self.write_limit]
+        latencies = []
+
+        def update(record):
+            ok, elapsed = timed(lambda: service.update_record_ttl(record['id'], 120))
+            latencies.append(elapsed)
+            return ok
+
+        executor = BulkExecutor()
+        result, elapsed = timed(lambda: executor.run(records, update))
+        assert not result.failed, f"{len(result.failed)} updates failed"
+        return summarize("bulk_ttl", self.zone_size, len(records), latencies, elapsed, self.emulator)
+
+
+def run_suite(sizes, latency=0.0, jitter=0.0, throttle=0.0, scenarios=SCENARIOS, sample=200, write_limit=1000,
+              repeat=3):
+    """
+    Run every scenario at every zone size against a fresh emulator
+
+    Returns:
+        dict: Run settings and one result row per scenario and size
+    """
+    with CloudflareEmulator(latency=latency, jitter=jitter, throttle=throttle) as emulator:
+        results = []
+        for size in sizes:
+            suite = BenchmarkSuite(emulator, size, sample=sample, write_limit=write_limit, repeat=repeat)
+            results.extend(suite.run(scenarios))
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency_s": latency,
+            "jitter_s": jitter,
+            "throttle": throttle,
+            "sample": sample,
+            "write_limit": write_limit,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def print_table(report):
+    """Print results as an aligned text table"""
+    print(f"{'scenario':<13} {'size':>7} {'ops':>7} {'ops/s':>10} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'requests':>9} {'429s':>5}")
+    for row in report["results"]:
+        print(f"{row['scenario']:<13} {row['zone_size']:>7} {row['operations']:>7} "
+              f"{row['throughput_per_s'] or 0:>10.1f} {row['p50_ms'] or 0:>8.2f} {row['p99_ms'] or 0:>8.2f} "
+              f"{row['requests']:>9} {row['throttled']:>5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the API client against a local Cloudflare emulator")
+    parser.add_argument("--sizes", default="100,1000,10000,100000", help="Comma-separated zone sizes")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every API answer")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency of up to this many seconds")
+    parser.add_argument("--throttle", type=float, default=0.0, help="Share of requests answered with 429 (0-1)")
+    parser.add_argument("--sample", type=int, default=200, help="Lookups and single writes per size")
+    parser.add_argument("--write-limit", type=int, default=1000, help="Records updated by bulk_ttl")
+    parser.add_argument("--repeat", type=int, default=3, help="Full listings per size")
+    parser.add_argument("--output", help="Write the results as JSON to this file ('-' for stdout)")
+    args = parser.parse_args()
+
+    scenarios = [scenario.strip() for scenario in args.scenarios.split(",") if scenario.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    report = run_suite([int(size) for size in args.sizes.split(",")], latency=args.latency, jitter=args.jitter,
+                       throttle=args.throttle, scenarios=scenarios, sample=args.sample,
+                       write_limit=args.write_limit, repeat=args.repeat)
+
+    if args.output == "-":
+        print(json.dumps(report, indent=2))
+        return
+    print_table(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Times how long short invocations take to start, compared with a bare interpreter
+
+Every command runs in a fresh interpreter; the best of several runs is
+kept. With --max-overhead-ms the script exits with status 1 if any
+command takes longer than that over the bare interpreter, so it can
+guard startup time in CI.
+
+Usage:
+    python benchmarks/startup.py --repeat 10 --max-overhead-ms 50
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Label and interpreter arguments of each timed command
+COMMANDS = (
+    ("python", ["-c", "pass"]),
+    ("app.py --version", ["app.py", "--version"]),
+    ("app.py --help", ["app.py", "--help"]),
+    ("import app.feature", ["-c", "import app.feature"]),
+    ("import convenience functions", ["-c", "from app.feature import add_subdomain"]),
+    ("import QueryRecord", ["-c", "from app.feature import QueryRecord"]),
+)
+
+# Modules a command must not import, checked with check_modules()
+HEAVY_MODULES = ("requests", "urllib3", "asyncio", "aiohttp", "sqlite3", "yaml")
+
+
+def time_command(args, repeat=5):
+    """
+    Best wall time of a command in a fresh interpreter
+
+    Returns:
+        float: Seconds taken by the fastest run
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       check=True)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def check_modules(code):
+    """
+    Modules from HEAVY_MODULES that running some code imports
+
+    Returns:
+        list: Names of the heavy modules found in sys.modules afterwards
+    """
+    probe = (f"import sys\n{code}\n"
+             f"print('loaded:' + ','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    loaded = [line for line in output.stdout.splitlines() if line.startswith("loaded:")][-1]
+    return [name for name in loaded[len("loaded:"):].split(",") if name]
+
+
+def measure(repeat=5):
+    """
+    Time every command
+
+    Returns:
+        list: {"command", "ms", "overhead_ms"} per command, overhead relative to a bare interpreter
+    """
+    results = []
+    baseline = None
+    for label, args in COMMANDS:
+        elapsed = time_command(args, repeat) * 1000
+        baseline = elapsed if baseline is None else baseline
+        results.append({"command": label, "ms": round(elapsed, 1), "overhead_ms": round(elapsed - baseline, 1)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure start-up time of short invocations")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command; the fastest is kept")
+    parser.add_argument("--max-overhead-ms", type=float,
+                        help="Fail if a command takes this much longer than a bare interpreter")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = measure(args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for row in results:
+            print(f"{row['command']:<30} {row['ms']:8.1f} ms  (+{row['overhead_ms']:.1f} ms)")
+
+    if args.max_overhead_ms is not None:
+        slow = [row for row in results if row["overhead_ms"] > args.max_overhead_ms]
+        for row in slow:
+            print(f"{row['command']} is {row['overhead_ms']:.1f} ms over the interpreter "
+                  f"(limit {args.max_overhead_ms:.0f} ms)", file=sys.stderr)
+        return 1 if slow else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
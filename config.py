@@ -4,5 +4,76 @@ from dotenv import load_dotenv
 # Load environment variables from the .env file
 load_dotenv()
 
+
+def _env_bool(name, default):
+    """Read a boolean flag from the environment"""
+    return os.getenv(name, default).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
 API_TOKEN = os.getenv('API_TOKEN')
 ZONE_ID = os.getenv('ZONE_ID')
+
+# API endpoint (point it at a local stand-in for testing and benchmarks)
+API_BASE_URL = os.getenv('API_BASE_URL', 'https://api.cloudflare.com/client/v4').rstrip('/')
+
+# HTTP connection pool settings (shared by all API clients)
+HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '4'))
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '16'))
+HTTP_POOL_BLOCK = _env_bool('HTTP_POOL_BLOCK', 'false')
+HTTP_KEEP_ALIVE = _env_bool('HTTP_KEEP_ALIVE', 'true')
+
+# Concurrent page fetches when listing a whole zone (1 = sequential)
+PAGE_FETCH_WORKERS = int(os.getenv('PAGE_FETCH_WORKERS', '4'))
+
+# Maximum concurrent requests for the asyncio client variant
+ASYNC_CONCURRENCY = int(os.getenv('ASYNC_CONCURRENCY', '50'))
+
+# Concurrent record updates for bulk operations
+BULK_WORKERS = int(os.getenv('BULK_WORKERS', '8'))
+
+# Coalesce bulk writes into calls to the /dns_records/batch endpoint
+BATCH_WRITES = _env_bool('BATCH_WRITES', 'true')
+BATCH_MAX_SIZE = int(os.getenv('BATCH_MAX_SIZE', '200'))
+BATCH_MAX_DELAY = float(os.getenv('BATCH_MAX_DELAY', '0.2'))
+
+# Multi-zone: zone name lookups are cached, and zones are queried in parallel
+ZONE_LIST_TTL = float(os.getenv('ZONE_LIST_TTL', '3600'))
+ZONE_FANOUT_WORKERS = int(os.getenv('ZONE_FANOUT_WORKERS', '8'))
+
+# Seconds listed records stay fresh in the in-process zone cache (0 disables it)
+CACHE_TTL = float(os.getenv('CACHE_TTL', '60'))
+
+# SQLite file keeping each zone's last listing between runs (empty disables it)
+SNAPSHOT_DB = os.path.expanduser(os.getenv('SNAPSHOT_DB', os.path.join(
+    '~', '.cache', 'cloudflare-dns-manager', 'snapshots.sqlite3')))
+
+# Incremental sync: changed records are listed newest first; the whole zone is re-listed
+# every SYNC_FULL_INTERVAL seconds to catch deletions
+SYNC_FULL_INTERVAL = float(os.getenv('SYNC_FULL_INTERVAL', '3600'))
+SYNC_PAGE_SIZE = int(os.getenv('SYNC_PAGE_SIZE', '100'))
+
+# Request budget shared by all API clients (Cloudflare allows 1200 per 5 minutes)
+RATE_LIMIT_REQUESTS = int(os.getenv('RATE_LIMIT_REQUESTS', '1200'))
+RATE_LIMIT_PERIOD = float(os.getenv('RATE_LIMIT_PERIOD', '300'))
+RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', '50'))
+RATE_LIMIT_MAX_RETRIES = int(os.getenv('RATE_LIMIT_MAX_RETRIES', '5'))
+
+# Retries for transient failures (connection errors, timeouts, 5xx answers)
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '30'))
+REQUEST_DEADLINE = float(os.getenv('REQUEST_DEADLINE', '120'))
+RETRY_MAX_ATTEMPTS = int(os.getenv('RETRY_MAX_ATTEMPTS', '4'))
+RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', '0.5'))
+RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', '30'))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', '30'))
+
+# Logging: level, "text" or "json" lines, and sampling of repeated messages during bulk runs
+# (the first LOG_SAMPLE_FIRST of each kind are logged, then one in LOG_SAMPLE_EVERY)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').strip().lower()
+LOG_SAMPLE_FIRST = int(os.getenv('LOG_SAMPLE_FIRST', '5'))
+LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', '100'))
+
+# Zone file import/export: larger zones use Cloudflare's server-side endpoints
+ZONE_FILE_SERVER_THRESHOLD = int(os.getenv('ZONE_FILE_SERVER_THRESHOLD', '1000'))
+ZONE_FILE_TIMEOUT = float(os.getenv('ZONE_FILE_TIMEOUT', '300'))